@@ -46,6 +46,8 @@ class Settings(BaseSettings):
     ftp_timeout_seconds: float = 10.0
     ftp_poll_interval_seconds: float = 1.0
     ws_ping_interval_seconds: float = 5.0
+    # Pause between V2 websocket bootstrap frames; 0 sends them back to back.
+    bootstrap_gap_seconds: float = 0.2
     temperature_refresh_interval_seconds: float = 5.0
     temperature_stale_after_seconds: float = 20.0
     goto_command_timeout_seconds: float = 45.0
@@ -158,6 +158,14 @@ def _format_timestamp(timestamp: float | None) -> str:
     return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
 
 
+def _exposure_elapsed(runtime) -> float:
+    """Seconds since the running exposure started, immune to wall-clock steps."""
+    started = runtime.capture_start_monotonic
+    if started is None:
+        return max(time.time() - runtime.start_time, 0.0)
+    return max(time.monotonic() - started, 0.0)
+
+
 def _gain_steps() -> list[int]:
     if state.gain_max == state.gain_min:
         return [state.gain_min]
@@ -184,10 +192,30 @@ _IMAGE_TYPE_NAMES = {
 }
 
 
+# The last frame's Alpaca-typed array, keyed by the source frame object. A new
+# capture replaces ``camera_state.image`` wholesale, so the identity check is
+# enough to tell when the converted copy is stale.
+_resolved_image: tuple[np.ndarray, np.ndarray, int] | None = None
+
+
+def _readout_image_array(image: np.ndarray) -> tuple[np.ndarray, int]:
+    """Return :func:`_resolve_image_array` for ``image``, converting each frame once."""
+    global _resolved_image
+    cached = _resolved_image
+    if cached is not None and cached[0] is image:
+        return cached[1], cached[2]
+    coerced, type_code = _resolve_image_array(image)
+    _resolved_image = (image, coerced, type_code)
+    return coerced, type_code
+
+
 def _resolve_image_array(image: np.ndarray) -> tuple[np.ndarray, int]:
     dtype = image.dtype
     if dtype in _IMAGE_TYPE_MAP:
         return image, _IMAGE_TYPE_MAP[dtype]
+    if image.size and np.issubdtype(dtype, np.unsignedinteger) and dtype.itemsize <= 2:
+        # uint8/uint16 always fit Int32; no need for a full-frame max() scan.
+        return image.astype(np.int32), _IMAGE_TYPE_MAP[np.dtype(np.int32)]
     if np.issubdtype(dtype, np.integer):
         if image.size == 0:
             coerced = image.astype(np.int16, copy=False)
@@ -442,8 +470,7 @@ def get_bayer_offset_y():
 @router.get("/ccdtemperature")
 async def get_ccd_temperature():
     session = await get_session()
-    runtime = session.camera_state
-    temperature = runtime.temperature_c
+    temperature = await session.get_temperature()
     if temperature is not None:
         state.ccd_temperature = float(temperature)
     return alpaca_response(value=state.ccd_temperature)
@@ -469,8 +496,7 @@ def get_cooler_power():
 @router.get("/heatsinktemperature")
 async def get_heatsink_temperature():
     session = await get_session()
-    runtime = session.camera_state
-    temperature = runtime.temperature_c
+    temperature = await session.get_temperature()
     if temperature is not None:
         state.heatsink_temperature = float(temperature)
     return alpaca_response(value=state.heatsink_temperature)
@@ -543,7 +569,7 @@ async def get_last_exposure_duration():
     if runtime.applied_duration is not None:
         return alpaca_response(value=runtime.applied_duration)
     if runtime.start_time is not None:
-        return alpaca_response(value=max(time.time() - runtime.start_time, 0.0))
+        return alpaca_response(value=_exposure_elapsed(runtime))
     return alpaca_response(value=runtime.duration)
 
 
@@ -731,7 +757,7 @@ async def get_percent_completed():
     if runtime.start_time is None or runtime.duration <= 0:
         return alpaca_response(value=0)
     total = runtime.duration * max(1, runtime.requested_frame_count)
-    elapsed = max(0.0, time.time() - runtime.start_time)
+    elapsed = _exposure_elapsed(runtime)
     return alpaca_response(value=max(0, min(99, int(100 * elapsed / total))))
 
 
@@ -741,7 +767,7 @@ async def get_image_bytes():
     image = await session.camera_readout()
     if image is None:
         raise HTTPException(status_code=400, detail="Image not ready")
-    processed_image, type_code = _resolve_image_array(image)
+    processed_image, type_code = _readout_image_array(image)
     bytes_data = processed_image.tobytes()
     height, width = processed_image.shape[:2]
     runtime = session.camera_state
@@ -788,7 +814,7 @@ async def get_image_array():
     image = await session.camera_readout()
     if image is None:
         raise HTTPException(status_code=400, detail="Image not ready")
-    processed_image, type_code = _resolve_image_array(image)
+    processed_image, type_code = _readout_image_array(image)
     payload = alpaca_response(value=processed_image.tolist())
     payload["Type"] = type_code
     payload["Rank"] = processed_image.ndim
@@ -803,7 +829,7 @@ async def get_image_array_variant():
     image = await session.camera_readout()
     if image is None:
         raise HTTPException(status_code=400, detail="Image not ready")
-    processed_image, type_code = _resolve_image_array(image)
+    processed_image, type_code = _readout_image_array(image)
     payload = alpaca_response(value=processed_image.tolist())
     payload["Type"] = type_code
     payload["Rank"] = processed_image.ndim
@@ -27,35 +27,60 @@ class BlePacketError(RuntimeError):
     """Raised when a BLE packet is malformed or reports an error."""
 
 
-def calculate_crc16(data: bytes) -> int:
-    """Compute the Modbus CRC16 used by DWARF BLE frames."""
-    crc = 0xFFFF
-    for value in data:
-        crc ^= value
+def _crc16_table() -> Tuple[int, ...]:
+    table = []
+    for value in range(256):
+        crc = value
         for _ in range(8):
             odd = crc & 0x0001
             crc >>= 1
             if odd:
                 crc ^= 0xA001
-    return crc & 0xFFFF
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC16_TABLE = _crc16_table()
+
+
+def calculate_crc16(data: bytes) -> int:
+    """Compute the Modbus CRC16 used by DWARF BLE frames."""
+    table = _CRC16_TABLE
+    crc = 0xFFFF
+    for value in data:
+        crc = (crc >> 8) ^ table[(crc ^ value) & 0xFF]
+    return crc
+
+
+# Header bytes ahead of the payload: the fixed markers plus placeholders for the
+# command id (index 2) and the big-endian payload length (indices 7-8).
+_HEADER_TEMPLATE = bytes(
+    [
+        FRAME_HEADER,
+        PROTOCOL_ID,
+        0x00,
+        PACKAGE_ID,
+        TOTAL_ID,
+        RESERVED1_ID,
+        RESERVED2_ID,
+        0x00,
+        0x00,
+    ]
+)
 
 
 def _build_frame(cmd: int, payload: bytes) -> bytes:
-    header = bytes(
-        [
-            FRAME_HEADER,
-            PROTOCOL_ID,
-            cmd & 0xFF,
-            PACKAGE_ID,
-            TOTAL_ID,
-            RESERVED1_ID,
-            RESERVED2_ID,
-        ]
-    )
-    length_bytes = len(payload).to_bytes(2, byteorder="big")
-    core = header + length_bytes + payload
-    crc = calculate_crc16(core).to_bytes(2, byteorder="big")
-    return core + crc + bytes([FRAME_END])
+    length = len(payload)
+    frame = bytearray(_HEADER_TEMPLATE)
+    frame[2] = cmd & 0xFF
+    frame[7] = (length >> 8) & 0xFF
+    frame[8] = length & 0xFF
+    frame += payload
+    crc = calculate_crc16(frame)
+    frame.append((crc >> 8) & 0xFF)
+    frame.append(crc & 0xFF)
+    frame.append(FRAME_END)
+    return bytes(frame)
 
 
 def build_req_getconfig(ble_password: str) -> bytes:
@@ -99,6 +124,12 @@ _MESSAGE_TYPES: Dict[int, Type[_message.Message]] = {
     8: ble_pb2.ResCheckFile,
 }
 
+# Command ids are small contiguous integers, so dispatch by tuple index rather
+# than hashing into ``_MESSAGE_TYPES`` for every notification.
+_MESSAGE_TABLE: Tuple[Type[_message.Message] | None, ...] = tuple(
+    _MESSAGE_TYPES.get(index) for index in range(max(_MESSAGE_TYPES) + 1)
+)
+
 
 @dataclass(slots=True)
 class ParsedPacket:
@@ -126,8 +157,7 @@ def parse_notification(data: bytes) -> ParsedPacket:
     if crc_received != crc_expected:
         raise BlePacketError("BLE CRC mismatch")
 
-    message_type = _MESSAGE_TYPES.get(cmd)
-    if message_type is None:
+    if cmd >= len(_MESSAGE_TABLE) or (message_type := _MESSAGE_TABLE[cmd]) is None:
         raise BlePacketError(f"Unknown BLE command {cmd}")
 
     message = message_type()
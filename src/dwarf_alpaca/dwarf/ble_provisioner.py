@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import time
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Optional, cast
+from typing import TYPE_CHECKING, Any, AsyncIterator, ClassVar, Optional, cast
 
 import structlog
 
@@ -23,10 +24,12 @@ from .ble_packets import (
 try:  # pragma: no cover - optional dependency
     from bleak import BleakClient, BleakScanner
     from bleak.backends.device import BLEDevice as _BleakDevice
+    from bleak.exc import BleakError
 except Exception:  # pragma: no cover
     BleakClient = None  # type: ignore
     BleakScanner = None  # type: ignore
     _BleakDevice = None  # type: ignore
+    BleakError = RuntimeError  # type: ignore
 
 if TYPE_CHECKING:  # pragma: no cover - typing aid
     from bleak import BleakClient as BleakClientType
@@ -48,6 +51,12 @@ def _is_ble_device(candidate: Any) -> bool:
     )
 
 
+@dataclass
+class _BleLink:
+    client: BleakClientType
+    queue: asyncio.Queue[ParsedPacket]
+
+
 @dataclass
 class ProvisioningResult:
     success: bool
@@ -60,8 +69,26 @@ class DwarfBleProvisioner:
 
     DEVICE_PREFIX = "DWARF"
 
-    def __init__(self, *, response_timeout: float = 15.0) -> None:
+    # Shared by all instances, keyed by adapter, so that discovery, the Wi-Fi
+    # list and provisioning reuse one scan even when each builds its own provisioner.
+    _scan_cache: ClassVar[dict[str | None, tuple[float, list[BLEDevice]]]] = {}
+
+    def __init__(
+        self,
+        *,
+        response_timeout: float = 15.0,
+        scan_cache_ttl: float = 5.0,
+        device: BLEDevice | str | None = None,
+        adapter: str | None = None,
+    ) -> None:
         self.response_timeout = response_timeout
+        self.device = device
+        self.adapter = adapter
+        self.scan_cache_ttl = scan_cache_ttl
+        self._scan_lock = asyncio.Lock()
+        self._link: _BleLink | None = None
+        self._link_stack: contextlib.AsyncExitStack | None = None
+        self._write_without_response = True
 
     @staticmethod
     async def discover_devices(
@@ -72,6 +99,159 @@ class DwarfBleProvisioner:
         devices = await BleakScanner.discover(adapter=adapter, timeout=timeout)
         return [device for device in devices if device.name and device.name.startswith("DWARF")]
 
+    async def scan_devices(
+        self, *, adapter: str | None = None, refresh: bool = False
+    ) -> list[BLEDevice]:
+        """Discover DWARF devices and remember them for later address lookups."""
+
+        return await self._cached_scan(adapter, refresh=refresh)
+
+    async def _cached_scan(self, adapter: str | None, *, refresh: bool = False) -> list[BLEDevice]:
+        """Return recent scan results, coalescing concurrent scans into one."""
+
+        async with self._scan_lock:
+            cached = self._scan_cache.get(adapter)
+            if cached is not None and not refresh:
+                scanned_at, devices = cached
+                if time.monotonic() - scanned_at < self.scan_cache_ttl:
+                    logger.debug("ble.provision.scan_cache_hit", adapter=adapter)
+                    return devices
+            devices = await self.discover_devices(adapter=adapter)
+            self._scan_cache[adapter] = (time.monotonic(), devices)
+            return devices
+
+    @contextlib.asynccontextmanager
+    async def _connect(
+        self, device: BLEDevice, *, adapter: str | None
+    ) -> AsyncIterator[BleakClientType]:
+        client = BleakClient(device, adapter=adapter)
+        try:
+            await client.connect()
+        except Exception:
+            # A stale advertisement is the usual reason for a failed connect.
+            self._scan_cache.pop(adapter, None)
+            raise
+        try:
+            yield client
+        finally:
+            with contextlib.suppress(Exception):
+                await client.disconnect()
+
+    @contextlib.asynccontextmanager
+    async def _open_link(
+        self, device: BLEDevice, *, adapter: str | None
+    ) -> AsyncIterator[_BleLink]:
+        logger.info("ble.provision.connect", address=getattr(device, "address", None))
+        async with self._connect(device, adapter=adapter) as client:
+            link = _BleLink(client=client, queue=asyncio.Queue())
+            loop = asyncio.get_running_loop()
+
+            def _notification_handler(_: int, data: bytearray) -> None:
+                payload = bytes(data)
+
+                def _put() -> None:
+                    try:
+                        packet = parse_notification(payload)
+                    except BlePacketError as exc:
+                        logger.warning("ble.provision.parse_error", error=str(exc))
+                        return
+                    link.queue.put_nowait(packet)
+
+                loop.call_soon_threadsafe(_put)
+
+            await client.start_notify(DWARF_CHARACTERISTIC_UUID, _notification_handler)
+            try:
+                yield link
+            finally:
+                with contextlib.suppress(Exception):
+                    await client.stop_notify(DWARF_CHARACTERISTIC_UUID)
+
+    async def connect(
+        self, device: BLEDevice | str | None = None, *, adapter: str | None = None
+    ) -> bool:
+        """Open a BLE link that later ``fetch_wifi_list``/``provision`` calls share.
+
+        Returns ``False`` when no DWARF device could be found.
+        """
+
+        if self._link is not None:
+            return True
+        if BleakScanner is None or BleakClient is None:
+            raise ProvisioningError("BLE provisioning not available (bleak library not installed)")
+        device_obj = await self._ensure_device(device, adapter=adapter)
+        if device_obj is None:
+            return False
+        stack = contextlib.AsyncExitStack()
+        self._link = await stack.enter_async_context(self._open_link(device_obj, adapter=adapter))
+        self._link_stack = stack
+        return True
+
+    async def disconnect(self) -> None:
+        stack, self._link_stack = self._link_stack, None
+        self._link = None
+        if stack is not None:
+            await stack.aclose()
+
+    async def __aenter__(self) -> DwarfBleProvisioner:
+        if not await self.connect(self.device, adapter=self.adapter):
+            raise ProvisioningError("DWARF BLE device not found")
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.disconnect()
+
+    @contextlib.asynccontextmanager
+    async def _use_link(
+        self, device: BLEDevice | str | None, *, adapter: str | None
+    ) -> AsyncIterator[_BleLink | None]:
+        if self._link is not None:
+            link = self._link
+            # Drop replies left over from a previous exchange on the shared link.
+            while not link.queue.empty():
+                link.queue.get_nowait()
+            yield link
+            return
+        device_obj = await self._ensure_device(device, adapter=adapter)
+        if device_obj is None:
+            yield None
+            return
+        async with self._open_link(device_obj, adapter=adapter) as link:
+            yield link
+
+    async def _write_cmd(
+        self, client: BleakClientType, payload: bytes, *, require_ack: bool
+    ) -> None:
+        """Write a frame, skipping the link-layer ACK for plain query frames.
+
+        Queries are answered through notifications anyway, so only writes whose
+        acceptance matters (STA configuration) wait for the write response.
+        """
+
+        if (
+            not require_ack
+            and self._write_without_response
+            and self._supports_write_without_response(client)
+        ):
+            try:
+                await client.write_gatt_char(DWARF_CHARACTERISTIC_UUID, payload, response=False)
+                return
+            except BleakError as exc:
+                logger.debug("ble.provision.write_without_response_unsupported", error=str(exc))
+                self._write_without_response = False
+        await client.write_gatt_char(DWARF_CHARACTERISTIC_UUID, payload, response=True)
+
+    @staticmethod
+    def _supports_write_without_response(client: BleakClientType) -> bool:
+        # Some backends silently drop an unacknowledged write to a characteristic
+        # that does not advertise it, so only use one when the property is listed.
+        try:
+            characteristic = client.services.get_characteristic(DWARF_CHARACTERISTIC_UUID)
+        except Exception:
+            return False
+        if characteristic is None:
+            return False
+        return "write-without-response" in characteristic.properties
+
     async def provision(
         self,
         ssid: str,
@@ -85,43 +265,23 @@ class DwarfBleProvisioner:
         if BleakScanner is None or BleakClient is None:
             return ProvisioningResult(False, "bleak library not available")
 
-        device = await self._ensure_device(device, adapter=adapter)
-
-        if device is None:
-            return ProvisioningResult(False, "DWARF BLE device not found")
-
         ble_psd = ble_password or DEFAULT_BLE_PASSWORD
-        deadline = asyncio.get_running_loop().time() + (timeout or 60.0)
 
-        logger.info("ble.provision.connect", address=getattr(device, "address", None))
-        async with BleakClient(device, adapter=adapter) as client:
-            response_queue: asyncio.Queue[ParsedPacket] = asyncio.Queue()
-            loop = asyncio.get_running_loop()
-
-            def _notification_handler(_: int, data: bytearray) -> None:
-                payload = bytes(data)
-
-                def _put() -> None:
-                    try:
-                        packet = parse_notification(payload)
-                    except BlePacketError as exc:
-                        logger.warning("ble.provision.parse_error", error=str(exc))
-                        return
-                    response_queue.put_nowait(packet)
-
-                loop.call_soon_threadsafe(_put)
+        async with self._use_link(device, adapter=adapter) as link:
+            if link is None:
+                return ProvisioningResult(False, "DWARF BLE device not found")
 
+            deadline = asyncio.get_running_loop().time() + (timeout or 60.0)
             try:
-                await client.start_notify(DWARF_CHARACTERISTIC_UUID, _notification_handler)
                 config = await self._write_and_wait_for_config(
-                    client,
-                    response_queue,
+                    link.client,
+                    link.queue,
                     ble_psd=ble_psd,
                     deadline=deadline,
                 )
                 sta_ip = await self._configure_sta(
-                    client,
-                    response_queue,
+                    link.client,
+                    link.queue,
                     current_config=config,
                     ssid=ssid,
                     password=password,
@@ -138,13 +298,10 @@ class DwarfBleProvisioner:
             except Exception as exc:  # pragma: no cover - hardware dependent
                 logger.error("ble.provision.unexpected_error", error=str(exc))
                 return ProvisioningResult(False, f"Provisioning failed: {exc}")
-            finally:
-                with contextlib.suppress(Exception):
-                    await client.stop_notify(DWARF_CHARACTERISTIC_UUID)
 
     async def _discover_device(self, adapter: str | None) -> Optional[BLEDevice]:
         logger.info("ble.provision.scan", adapter=adapter)
-        devices = await self.discover_devices(adapter=adapter)
+        devices = await self._cached_scan(adapter)
         for device in devices:
             logger.info("ble.provision.device_found", name=device.name, address=device.address)
             return device
@@ -156,7 +313,7 @@ class DwarfBleProvisioner:
     ) -> Optional[BLEDevice]:
         if BleakScanner is None:
             return None
-        devices = await self.discover_devices(adapter=adapter)
+        devices = await self._cached_scan(adapter)
         for device in devices:
             if device.address.lower() == address.lower():
                 return device
@@ -183,67 +340,47 @@ class DwarfBleProvisioner:
         if BleakScanner is None or BleakClient is None:
             raise ProvisioningError("BLE provisioning not available (bleak library not installed)")
 
-        device_obj = await self._ensure_device(device, adapter=adapter)
-        if device_obj is None:
-            logger.warning("ble.provision.wifi.device_missing")
-            return []
+        async with self._use_link(device, adapter=adapter) as link:
+            if link is None:
+                logger.warning("ble.provision.wifi.device_missing")
+                return []
 
-        loop = asyncio.get_running_loop()
-        deadline = loop.time() + (timeout or 30.0)
-
-        async with BleakClient(device_obj, adapter=adapter) as client:
-            response_queue: asyncio.Queue[ParsedPacket] = asyncio.Queue()
+            client = link.client
+            response_queue = link.queue
+            deadline = asyncio.get_running_loop().time() + (timeout or 30.0)
 
-            def _notification_handler(_: int, data: bytearray) -> None:
-                payload = bytes(data)
-
-                def _put() -> None:
-                    try:
-                        packet = parse_notification(payload)
-                    except BlePacketError as exc:
-                        logger.warning("ble.provision.wifi.parse_error", error=str(exc))
-                        return
-                    response_queue.put_nowait(packet)
-
-                loop.call_soon_threadsafe(_put)
+            await self._write_cmd(
+                client,
+                build_req_getconfig(ble_password),
+                require_ack=False,
+            )
 
-            await client.start_notify(DWARF_CHARACTERISTIC_UUID, _notification_handler)
-            try:
-                await client.write_gatt_char(
-                    DWARF_CHARACTERISTIC_UUID,
-                    build_req_getconfig(ble_password),
-                    response=True,
+            initial_packet = await self._await_packet(response_queue, {0, 1}, deadline)
+            if initial_packet.cmd == 0:
+                message = initial_packet.payload  # type: ignore[assignment]
+                assert isinstance(message, ble_pb2.ResReceiveDataError)
+                raise ProvisioningError(
+                    f"BLE error retrieving Wi-Fi list: {describe_ble_error(message.code)}"
                 )
 
-                initial_packet = await self._await_packet(response_queue, {0, 1}, deadline)
-                if initial_packet.cmd == 0:
-                    message = initial_packet.payload  # type: ignore[assignment]
+            await self._write_cmd(
+                client,
+                build_req_getwifilist(),
+                require_ack=False,
+            )
+
+            while True:
+                packet = await self._await_packet(response_queue, {0, 6}, deadline)
+                if packet.cmd == 0:
+                    message = packet.payload  # type: ignore[assignment]
                     assert isinstance(message, ble_pb2.ResReceiveDataError)
                     raise ProvisioningError(
                         f"BLE error retrieving Wi-Fi list: {describe_ble_error(message.code)}"
                     )
-
-                await client.write_gatt_char(
-                    DWARF_CHARACTERISTIC_UUID,
-                    build_req_getwifilist(),
-                    response=True,
-                )
-
-                while True:
-                    packet = await self._await_packet(response_queue, {0, 6}, deadline)
-                    if packet.cmd == 0:
-                        message = packet.payload  # type: ignore[assignment]
-                        assert isinstance(message, ble_pb2.ResReceiveDataError)
-                        raise ProvisioningError(
-                            f"BLE error retrieving Wi-Fi list: {describe_ble_error(message.code)}"
-                        )
-                    if packet.cmd == 6:
-                        wifi_response = packet.payload
-                        assert isinstance(wifi_response, ble_pb2.ResWifilist)
-                        return list(wifi_response.ssid)
-            finally:
-                with contextlib.suppress(Exception):
-                    await client.stop_notify(DWARF_CHARACTERISTIC_UUID)
+                if packet.cmd == 6:
+                    wifi_response = packet.payload
+                    assert isinstance(wifi_response, ble_pb2.ResWifilist)
+                    return list(wifi_response.ssid)
 
     async def _write_and_wait_for_config(
         self,
@@ -253,10 +390,10 @@ class DwarfBleProvisioner:
         ble_psd: str,
         deadline: float,
     ) -> Any:
-        await client.write_gatt_char(
-            DWARF_CHARACTERISTIC_UUID,
+        await self._write_cmd(
+            client,
             build_req_getconfig(ble_psd),
-            response=True,
+            require_ack=False,
         )
         packet = await self._await_packet(queue, {0, 1}, deadline)
         if packet.cmd == 0:
@@ -300,10 +437,10 @@ class DwarfBleProvisioner:
 
         auto_start = 1 if config.state != 2 else 0
         logger.info("ble.provision.send_sta", ssid=ssid, auto_start=auto_start)
-        await client.write_gatt_char(
-            DWARF_CHARACTERISTIC_UUID,
+        await self._write_cmd(
+            client,
             build_req_sta(auto_start, ble_psd, ssid, password),
-            response=True,
+            require_ack=True,
         )
 
         sta_ip: Optional[str] = None
@@ -326,10 +463,10 @@ class DwarfBleProvisioner:
                 if sta_ip and sta_ip != "192.168.88.1":
                     break
                 logger.info("ble.provision.query_followup")
-                await client.write_gatt_char(
-                    DWARF_CHARACTERISTIC_UUID,
+                await self._write_cmd(
+                    client,
                     build_req_getconfig(ble_psd),
-                    response=True,
+                    require_ack=False,
                 )
             if packet.cmd == 1:
                 latest_config = packet.payload
@@ -356,9 +493,10 @@ class DwarfBleProvisioner:
         expected_cmds: set[int],
         deadline: float,
     ) -> ParsedPacket:
+        loop = asyncio.get_running_loop()
+        response_timeout = self.response_timeout
         while True:
-            loop = asyncio.get_running_loop()
-            timeout = min(self.response_timeout, deadline - loop.time())
+            timeout = min(response_timeout, deadline - loop.time())
             if timeout <= 0:
                 raise asyncio.TimeoutError
             packet = await asyncio.wait_for(queue.get(), timeout=timeout)
@@ -2,20 +2,59 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-import io
+import functools
+import random
+import re
+import socket
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from ftplib import FTP, all_errors, error_perm
-from typing import Iterable
+from typing import Callable, Iterable, TypeVar
 
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+_T = TypeVar("_T")
+
 
 PHOTO_EXTENSIONS = (".jpg", ".jpeg", ".png", ".fits", ".fit")
 
+# Case-insensitive alternation of PHOTO_EXTENSIONS for the compiled name matchers.
+_PHOTO_EXTENSION_PATTERN = "(?i:{})".format("|".join(re.escape(ext) for ext in PHOTO_EXTENSIONS))
+
+# MDTM only has one-second resolution, so a cached listing is trusted only when
+# it was taken long enough after its directory stamp was first seen that no
+# further change could hide behind the same stamp.
+_LISTING_SETTLE_SECONDS = 1.5
+
+_DOWNLOAD_BLOCK_SIZE = 64 * 1024
+_DATA_RCVBUF_BYTES = 1 << 20
+
+# wait_for_new_photo starts polling quickly and backs off towards poll_interval.
+_POLL_INITIAL_DELAY = 0.1
+_POLL_BACKOFF_FACTOR = 1.7
+
+
+class _DataTunedFTP(FTP):
+    """``FTP`` whose data connections disable Nagle and request a larger receive buffer."""
+
+    def ntransfercmd(self, cmd, rest=None):  # type: ignore[override]
+        conn, size = super().ntransfercmd(cmd, rest)
+        with contextlib.suppress(OSError):
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _DATA_RCVBUF_BYTES)
+        return conn, size
+
+
+@functools.lru_cache(maxsize=32)
+def _photo_name_pattern(prefix: str) -> re.Pattern[str]:
+    """Match names starting with ``prefix`` (case-sensitive) and a photo extension."""
+
+    return re.compile(rf"{re.escape(prefix)}.*{_PHOTO_EXTENSION_PATTERN}\Z", re.DOTALL)
+
 
 @dataclass(slots=True)
 class FtpPhotoEntry:
@@ -35,6 +74,18 @@ class FtpPhotoCapture:
     content: bytes
 
 
+@dataclass(slots=True)
+class _CachedListing:
+    stamp: str
+    first_seen: float
+    listed_at: float
+    entries: list[FtpPhotoEntry]
+
+
+class _DownloadCancelled(Exception):
+    """Raised inside a download thread whose awaiting caller has gone away."""
+
+
 @dataclass(slots=True)
 class DwarfFtpClient:
     """Lightweight async wrapper around DWARF's anonymous FTP service."""
@@ -46,6 +97,21 @@ class DwarfFtpClient:
     username: str = "Anonymous"
     password: str = ""
     poll_interval: float = 1.0
+    max_connections: int = 4
+    _idle: list[tuple[FTP, float]] = field(default_factory=list, init=False, repr=False)
+    _pool_endpoint: tuple[str, int] | None = field(default=None, init=False, repr=False)
+    _pool_generation: int = field(default=0, init=False, repr=False)
+    _pool_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _pool_slots: threading.BoundedSemaphore = field(init=False, repr=False)
+    _mlsd_supported: bool | None = field(default=None, init=False, repr=False)
+    _dir_stamp_supported: bool | None = field(default=None, init=False, repr=False)
+    _mdtm_pipelining: bool | None = field(default=None, init=False, repr=False)
+    _listing_cache: dict[tuple[str, str], _CachedListing] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self._pool_slots = threading.BoundedSemaphore(max(1, self.max_connections))
 
     async def get_latest_photo_entry(
         self,
@@ -55,11 +121,16 @@ class DwarfFtpClient:
     ) -> FtpPhotoEntry | None:
         """Return the most recent capture entry for the given camera, if any."""
 
-        return await asyncio.to_thread(
-            self._get_latest_photo_entry_sync,
-            camera.upper(),
-            capture_kind,
-        )
+        if capture_kind == "astro":
+            entries = await self._collect_astro_entries()
+        else:
+            entries = await self._collect_photo_entries(camera.upper())
+        return max(entries, key=lambda item: (item.timestamp, item.path), default=None)
+
+    async def close(self) -> None:
+        """Close idle pooled control connections."""
+
+        await asyncio.to_thread(self._close_connections)
 
     async def wait_for_new_photo(
         self,
@@ -72,10 +143,12 @@ class DwarfFtpClient:
     ) -> FtpPhotoCapture | None:
         """Poll the FTP service until a new photo appears relative to the baseline."""
 
-        deadline = time.time() + max(timeout, 0.1)
+        deadline = time.monotonic() + max(timeout, 0.1)
         camera_upper = camera.upper()
+        initial_delay = min(_POLL_INITIAL_DELAY, self.poll_interval)
+        delay = initial_delay
         attempt = 0
-        while time.time() < deadline:
+        while time.monotonic() < deadline:
             attempt += 1
             try:
                 entry = await self.get_latest_photo_entry(
@@ -90,13 +163,15 @@ class DwarfFtpClient:
                     attempt=attempt,
                 )
                 entry = None
+                delay = initial_delay
+            # Entries older than not_before never qualify, so they are not fetched.
             if (
                 entry
                 and self._is_new_entry(entry, baseline)
                 and (not_before is None or entry.timestamp >= not_before)
             ):
                 try:
-                    content = await asyncio.to_thread(self._download_file_sync, entry.path)
+                    content = await self._download_file(entry.path)
                 except all_errors as exc:
                     logger.warning(
                         "dwarf.ftp.download_failed",
@@ -104,132 +179,311 @@ class DwarfFtpClient:
                         path=entry.path,
                         error=str(exc),
                     )
+                    delay = initial_delay
                 else:
                     return FtpPhotoCapture(entry=entry, content=content)
-            await asyncio.sleep(self.poll_interval)
+            await asyncio.sleep(delay + random.uniform(0.0, delay * 0.25))
+            delay = min(delay * _POLL_BACKOFF_FACTOR, self.poll_interval)
         return None
 
-    def _get_latest_photo_entry_sync(
-        self,
-        camera: str,
-        capture_kind: str,
-    ) -> FtpPhotoEntry | None:
-        def operation(ftp: FTP) -> FtpPhotoEntry | None:
-            if capture_kind == "astro":
-                entries = self._collect_astro_entries(ftp)
-            else:
-                entries = self._collect_photo_entries(ftp, camera)
-            if not entries:
-                return None
-            entries.sort(key=lambda item: (item.timestamp, item.path))
-            return entries[-1]
+    async def _download_file(self, path: str) -> bytes:
+        cancelled = threading.Event()
+        try:
+            return await asyncio.to_thread(self._download_file_sync, path, cancelled)
+        finally:
+            # Cancelling the await does not stop the worker thread; the flag makes it
+            # abort between blocks and release its pooled connection.
+            cancelled.set()
 
-        return self._with_connection(operation)
+    def _with_connection(self, operation: Callable[[FTP], _T]) -> _T:
+        """Run ``operation`` on a pooled control connection, discarding it on failure."""
 
-    def _with_connection(self, operation):
-        ftp = FTP()
+        with self._pool_slots:
+            ftp, generation = self._checkout_connection()
+            try:
+                result = operation(ftp)
+            except error_perm:
+                self._checkin_connection(ftp, generation)
+                raise
+            except BaseException:
+                self._discard_connection(ftp, graceful=False)
+                raise
+            self._checkin_connection(ftp, generation)
+            return result
+
+    def _checkout_connection(self) -> tuple[FTP, int]:
+        stale: list[tuple[FTP, float]] = []
+        candidate: tuple[FTP, float] | None = None
+        with self._pool_lock:
+            endpoint = (self.host, self.port)
+            if self._pool_endpoint != endpoint:
+                stale, self._idle = self._idle, []
+                self._pool_endpoint = endpoint
+                self._pool_generation += 1
+            elif self._idle:
+                candidate = self._idle.pop()
+            generation = self._pool_generation
+        for ftp, _ in stale:
+            self._discard_connection(ftp)
+
+        if candidate is not None:
+            ftp, last_used = candidate
+            if time.monotonic() - last_used <= self.poll_interval:
+                return ftp, generation
+            # Probe a connection that sat idle; the server may have dropped it.
+            try:
+                ftp.voidcmd("NOOP")
+            except all_errors:
+                self._discard_connection(ftp, graceful=False)
+            else:
+                return ftp, generation
+
+        ftp = _DataTunedFTP()
         ftp.connect(self.host, self.port, timeout=self.timeout)
-        ftp.login(self.username, self.password)
-        ftp.set_pasv(self.passive)
         try:
-            return operation(ftp)
-        finally:
+            ftp.login(self.username, self.password)
+            ftp.set_pasv(self.passive)
+        except all_errors:
+            self._discard_connection(ftp, graceful=False)
+            raise
+        return ftp, generation
+
+    def _checkin_connection(self, ftp: FTP, generation: int) -> None:
+        with self._pool_lock:
+            if generation == self._pool_generation:
+                self._idle.append((ftp, time.monotonic()))
+                return
+        self._discard_connection(ftp)
+
+    def _close_connections(self) -> None:
+        with self._pool_lock:
+            idle, self._idle = self._idle, []
+            self._pool_generation += 1
+        for ftp, _ in idle:
+            self._discard_connection(ftp)
+
+    @staticmethod
+    def _discard_connection(ftp: FTP, *, graceful: bool = True) -> None:
+        if graceful:
             with contextlib.suppress(Exception):
                 ftp.quit()
+        with contextlib.suppress(Exception):
+            ftp.close()
 
-    def _collect_photo_entries(self, ftp: FTP, camera: str) -> list[FtpPhotoEntry]:
+    async def _collect_photo_entries(self, camera: str) -> list[FtpPhotoEntry]:
         camera_upper = camera.upper()
+
+        def list_candidate(directory: str, pattern: re.Pattern[str]) -> list[FtpPhotoEntry]:
+            accept = pattern.match
+            return self._with_connection(
+                lambda ftp: self._collect_directory(
+                    ftp, directory, accept, cache_key=pattern.pattern
+                )
+            )
+
+        listings = await asyncio.gather(
+            *(
+                asyncio.to_thread(list_candidate, directory, pattern)
+                for directory, pattern in self._photo_candidates(camera_upper)
+            )
+        )
+        return [entry for listing in listings for entry in listing]
+
+    async def _collect_astro_entries(self) -> list[FtpPhotoEntry]:
+        roots = ("/Astronomy", "/DWARF_mini/Astronomy", "/DWARF_II/Astronomy")
+        subdir_listings = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    self._with_connection, lambda ftp, root=root: self._list_raw_dirs(ftp, root)
+                )
+                for root in roots
+            )
+        )
+        directories = [directory for listing in subdir_listings for directory in listing]
+        # One worker thread per pooled connection, each walking its share of the
+        # directories, so a large album cannot fill the default executor with
+        # threads that only block on the pool.
+        workers = max(1, min(self.max_connections, len(directories)))
+        listings = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._collect_fits_directories, directories[index::workers])
+                for index in range(workers)
+            ),
+            return_exceptions=True,
+        )
         entries: list[FtpPhotoEntry] = []
-        for directory, prefix in self._photo_candidates(camera_upper):
-            try:
-                previous = ftp.pwd()
-            except error_perm:
-                previous = "/"
-            try:
-                ftp.cwd(directory)
-            except error_perm:
+        for listing in listings:
+            if isinstance(listing, BaseException):
+                logger.warning("dwarf.ftp.astro_listing_failed", error=str(listing))
                 continue
+            entries.extend(listing)
+        return entries
+
+    def _collect_fits_directories(self, directories: list[str]) -> list[FtpPhotoEntry]:
+        entries: list[FtpPhotoEntry] = []
+        for directory in directories:
             try:
-                filenames = ftp.nlst()
-            except error_perm:
-                filenames = []
-            for name in filenames:
-                if not name.startswith(prefix):
-                    continue
-                if not self._matches_extension(name):
-                    continue
-                timestamp = self._fetch_timestamp(ftp, name)
-                path = f"{directory.rstrip('/')}/{name}"
-                entries.append(
-                    FtpPhotoEntry(directory=directory, name=name, timestamp=timestamp, path=path)
+                entries.extend(
+                    self._with_connection(
+                        lambda ftp, directory=directory: self._collect_directory(
+                            ftp, directory, self._is_fits_name, cache_key="fits"
+                        )
+                    )
+                )
+            except all_errors as exc:
+                # One unreadable session directory must not hide the others.
+                logger.warning(
+                    "dwarf.ftp.astro_directory_failed", directory=directory, error=str(exc)
                 )
-            try:
-                ftp.cwd(previous)
-            except error_perm:
-                ftp.cwd("/")
         return entries
 
-    def _collect_astro_entries(self, ftp: FTP) -> list[FtpPhotoEntry]:
-        roots = ("/Astronomy", "/DWARF_mini/Astronomy", "/DWARF_II/Astronomy")
-        entries: list[FtpPhotoEntry] = []
+    @staticmethod
+    def _list_raw_dirs(ftp: FTP, root: str) -> list[str]:
         try:
-            start_dir = ftp.pwd()
+            subdirs = ftp.nlst(root)
         except error_perm:
-            start_dir = "/"
-        for root in roots:
-            try:
-                ftp.cwd(root)
-            except error_perm:
+            return []
+        base = root.rstrip("/")
+        return [
+            f"{base}/{name}"
+            for name in (subdir.rpartition("/")[2] for subdir in subdirs)
+            if name.startswith("DWARF_RAW")
+        ]
+
+    def _collect_directory(
+        self,
+        ftp: FTP,
+        directory: str,
+        accept: Callable[[str], bool],
+        *,
+        cache_key: str,
+    ) -> list[FtpPhotoEntry]:
+        stamp = self._directory_stamp(ftp, directory)
+        key = (directory, cache_key)
+        now = time.monotonic()
+        cached = self._listing_cache.get(key)
+        first_seen = now
+        if stamp is not None and cached is not None and cached.stamp == stamp:
+            if cached.listed_at - cached.first_seen >= _LISTING_SETTLE_SECONDS:
+                return list(cached.entries)
+            first_seen = cached.first_seen
+
+        try:
+            entries: list[FtpPhotoEntry] | None = None
+            if self._mlsd_supported is not False:
+                entries = self._collect_via_mlsd(ftp, directory, accept)
+            if entries is None:
+                entries = self._collect_via_nlst(ftp, directory, accept)
+        except error_perm:
+            self._listing_cache.clear()
+            raise
+
+        if stamp is None:
+            self._listing_cache.pop(key, None)
+            if entries and self._dir_stamp_supported is None:
+                self._dir_stamp_supported = False
+        else:
+            self._listing_cache[key] = _CachedListing(
+                stamp=stamp, first_seen=first_seen, listed_at=now, entries=list(entries)
+            )
+        return entries
+
+    def _directory_stamp(self, ftp: FTP, directory: str) -> str | None:
+        """Return the directory's MDTM reply, or ``None`` when it cannot be probed."""
+
+        if self._dir_stamp_supported is False:
+            return None
+        try:
+            response = ftp.sendcmd(f"MDTM {directory}")
+        except error_perm:
+            return None
+        self._dir_stamp_supported = True
+        return response.strip()
+
+    def _collect_via_mlsd(
+        self, ftp: FTP, directory: str, accept: Callable[[str], bool]
+    ) -> list[FtpPhotoEntry] | None:
+        """List ``directory`` with one MLSD command; ``None`` if the server lacks MLSD."""
+
+        try:
+            listing = list(ftp.mlsd(directory))
+        except error_perm as exc:
+            if str(exc).startswith("550"):
+                return []
+            logger.debug("dwarf.ftp.mlsd_unsupported", error=str(exc))
+            self._mlsd_supported = False
+            return None
+        self._mlsd_supported = True
+        entries: list[FtpPhotoEntry] = []
+        base = directory.rstrip("/")
+        for name, facts in listing:
+            if facts.get("type", "file") != "file" or not accept(name):
                 continue
-            try:
-                subdirs = ftp.nlst()
-            except error_perm:
-                subdirs = []
-            for subdir in subdirs:
-                if not subdir.startswith("DWARF_RAW"):
-                    continue
-                full_dir = f"{root.rstrip('/')}/{subdir}"
-                try:
-                    ftp.cwd(full_dir)
-                except error_perm:
-                    continue
-                try:
-                    filenames = ftp.nlst()
-                except error_perm:
-                    filenames = []
-                for name in filenames:
-                    lower = name.lower()
-                    if not lower.endswith((".fits", ".fit")):
-                        continue
-                    timestamp = self._fetch_timestamp(ftp, name)
-                    path = f"{full_dir.rstrip('/')}/{name}"
-                    entries.append(
-                        FtpPhotoEntry(directory=full_dir, name=name, timestamp=timestamp, path=path)
-                    )
-                try:
-                    ftp.cwd(root)
-                except error_perm:
-                    ftp.cwd("/")
-            try:
-                ftp.cwd(start_dir)
-            except error_perm:
-                ftp.cwd("/")
+            path = f"{base}/{name}"
+            modify = facts.get("modify")
+            if modify:
+                timestamp = self._parse_mdtm(modify[:14])
+            else:
+                timestamp = self._fetch_timestamp(ftp, path)
+            entries.append(
+                FtpPhotoEntry(directory=directory, name=name, timestamp=timestamp, path=path)
+            )
         return entries
 
-    def _photo_candidates(self, camera: str) -> Iterable[tuple[str, str]]:
+    def _collect_via_nlst(
+        self, ftp: FTP, directory: str, accept: Callable[[str], bool]
+    ) -> list[FtpPhotoEntry]:
+        try:
+            filenames = ftp.nlst(directory)
+        except error_perm:
+            return []
+        base = directory.rstrip("/")
+        # Servers may answer NLST <dir> with bare names or with full paths.
+        names = [name for name in (f.rpartition("/")[2] for f in filenames) if accept(name)]
+        paths = [f"{base}/{name}" for name in names]
+        timestamps = self._fetch_timestamps(ftp, paths)
+        return [
+            FtpPhotoEntry(directory=directory, name=name, timestamp=timestamps[path], path=path)
+            for name, path in zip(names, paths)
+        ]
+
+    def _photo_candidates(self, camera: str) -> Iterable[tuple[str, re.Pattern[str]]]:
         return (
-            ("/DWARF_mini/Normal_Photos", f"DWARF_mini_{camera}"),
-            ("/Normal_Photos", f"DWARF3_{camera}"),
-            ("/DWARF_II/Normal_Photos", f"DWARF_{camera}"),
+            ("/DWARF_mini/Normal_Photos", _photo_name_pattern(f"DWARF_mini_{camera}")),
+            ("/Normal_Photos", _photo_name_pattern(f"DWARF3_{camera}")),
+            ("/DWARF_II/Normal_Photos", _photo_name_pattern(f"DWARF_{camera}")),
         )
 
-    def _matches_extension(self, name: str) -> bool:
-        lower = name.lower()
-        return lower.endswith(PHOTO_EXTENSIONS)
+    @staticmethod
+    def _is_fits_name(name: str) -> bool:
+        return name.lower().endswith((".fits", ".fit"))
+
+    def _fetch_timestamps(self, ftp: FTP, paths: list[str]) -> dict[str, float]:
+        if len(paths) > 1 and self._mdtm_pipelining is not False:
+            return self._fetch_timestamps_pipelined(ftp, paths)
+        return {path: self._fetch_timestamp(ftp, path) for path in paths}
+
+    def _fetch_timestamps_pipelined(self, ftp: FTP, paths: list[str]) -> dict[str, float]:
+        """Send every MDTM before reading the replies, which arrive in order."""
+
+        try:
+            for path in paths:
+                ftp.putline(f"MDTM {path}")
+            replies = [ftp.getmultiline() for _ in paths]
+        except all_errors:
+            # The reply stream is out of step now, so the connection is dropped
+            # by the caller; later listings go back to one MDTM at a time.
+            self._mdtm_pipelining = False
+            raise
+        self._mdtm_pipelining = True
+        return {
+            path: self._parse_mdtm(reply) if reply.startswith("213") else time.time()
+            for path, reply in zip(paths, replies)
+        }
 
-    def _fetch_timestamp(self, ftp: FTP, name: str) -> float:
+    def _fetch_timestamp(self, ftp: FTP, path: str) -> float:
         try:
-            response = ftp.sendcmd(f"MDTM {name}")
+            response = ftp.sendcmd(f"MDTM {path}")
         except error_perm:
             return time.time()
         return self._parse_mdtm(response)
@@ -245,11 +499,19 @@ class DwarfFtpClient:
             return time.time()
         return dt.replace(tzinfo=timezone.utc).timestamp()
 
-    def _download_file_sync(self, path: str) -> bytes:
+    def _download_file_sync(self, path: str, cancelled: threading.Event | None = None) -> bytes:
         def operation(ftp: FTP) -> bytes:
-            buffer = io.BytesIO()
-            ftp.retrbinary(f"RETR {path}", buffer.write)
-            return buffer.getvalue()
+            buffer = bytearray()
+
+            def append(block: bytes) -> None:
+                if cancelled is not None and cancelled.is_set():
+                    # Leaving retrbinary closes the data connection; the control
+                    # connection is out of step, so _with_connection drops it.
+                    raise _DownloadCancelled(path)
+                buffer.extend(block)
+
+            ftp.retrbinary(f"RETR {path}", append, blocksize=_DOWNLOAD_BLOCK_SIZE)
+            return bytes(buffer)
 
         return self._with_connection(operation)
 
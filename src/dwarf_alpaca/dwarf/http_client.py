@@ -1,14 +1,57 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import random
 from dataclasses import dataclass
 from typing import Any, Literal, Optional
 
 import httpx
 import structlog
 
+try:  # pragma: no cover - optional dependency
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as _json_loads
+
 logger = structlog.get_logger(__name__)
 
+# Status polls, album refreshes and media fetches share each client's pool;
+# keep idle sockets around long enough to span typical poll intervals.
+_POOL_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+
+
+# Keys under which firmware builds nest the album media list, in lookup order.
+_ALBUM_LIST_KEYS = ("mediaInfos", "list", "items", "records", "mediaList")
+
+
+# Retries back off exponentially from _RETRY_BASE_DELAY with up to 25% jitter so
+# concurrent callers do not retry in lockstep.
+_RETRY_BASE_DELAY = 0.1
+_RETRY_MAX_DELAY = 4.0
+
+
+def _retry_delay(attempt: int, exc: Exception) -> float:
+    """Seconds to wait before retry ``attempt + 1``, honouring ``Retry-After``.
+
+    ``Retry-After`` is capped at ``_RETRY_MAX_DELAY`` so a misbehaving device
+    cannot stall a request indefinitely.
+    """
+
+    if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code in (429, 503):
+        retry_after = exc.response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return min(max(0.0, float(retry_after)), _RETRY_MAX_DELAY)
+            except ValueError:
+                pass
+    delay = min(_RETRY_BASE_DELAY * 2**attempt, _RETRY_MAX_DELAY)
+    return delay + random.uniform(0.0, delay * 0.25)
+
 
 @dataclass(slots=True)
 class DwarfHttpClient:
@@ -37,20 +80,24 @@ class DwarfHttpClient:
     async def __aexit__(self, exc_type, exc, tb) -> None:
         await self.aclose()
 
+    def _build_client(self, port: int) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=f"{self.scheme}://{self.host}:{port}",
+            timeout=self.timeout,
+            limits=_POOL_LIMITS,
+        )
+
     async def _ensure_client(self) -> None:
         if self._client is None:
-            base_url = f"{self.scheme}://{self.host}:{self.api_port}"
-            self._client = httpx.AsyncClient(base_url=base_url, timeout=self.timeout)
+            self._client = self._build_client(self.api_port)
 
     async def _ensure_jpeg_client(self) -> None:
         if self._jpeg_client is None:
-            base_url = f"{self.scheme}://{self.host}:{self.jpeg_port}"
-            self._jpeg_client = httpx.AsyncClient(base_url=base_url, timeout=self.timeout)
+            self._jpeg_client = self._build_client(self.jpeg_port)
 
     async def _ensure_file_client(self) -> None:
         if self._file_client is None:
-            base_url = f"{self.scheme}://{self.host}:{self.file_port}"
-            self._file_client = httpx.AsyncClient(base_url=base_url, timeout=self.timeout)
+            self._file_client = self._build_client(self.file_port)
 
     async def aclose(self) -> None:
         if self._client is not None:
@@ -90,14 +137,15 @@ class DwarfHttpClient:
                     attempt=attempt,
                     error=str(exc),
                 )
-                await asyncio.sleep(0.5 * attempt)
+                if attempt < self.retries:
+                    await asyncio.sleep(_retry_delay(attempt, exc))
 
         assert last_exc is not None
         raise last_exc
 
     async def get_json(self, path: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
         response = await self._request("GET", path, params=params)
-        return response.json()
+        return _json_loads(response.content)
 
     async def post_json(
         self,
@@ -106,7 +154,7 @@ class DwarfHttpClient:
         params: Optional[dict[str, Any]] = None,
     ) -> dict[str, Any]:
         response = await self._request("POST", path, json=payload, params=params)
-        return response.json()
+        return _json_loads(response.content)
 
     async def fetch_jpeg(self, path: str) -> bytes:
         await self._ensure_jpeg_client()
@@ -115,7 +163,9 @@ class DwarfHttpClient:
         response.raise_for_status()
         return response.content
 
-    def _normalize_media_path(self, file_path: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _normalize_media_path(file_path: str) -> str:
         if not file_path:
             raise ValueError("file_path must be provided")
         normalized = file_path.strip()
@@ -158,30 +208,26 @@ class DwarfHttpClient:
         entries: list[dict[str, Any]] = []
         skipped = 0
 
+        raw: list[Any] | None = None
         if isinstance(data, list):
-            for item in data:
-                if isinstance(item, dict):
-                    entries.append(item)
-                else:
-                    skipped += 1
+            raw = data
         elif isinstance(data, dict):
-            for key in ("mediaInfos", "list", "items", "records", "mediaList"):
-                value = data.get(key)
-                if isinstance(value, list):
-                    for item in value:
-                        if isinstance(item, dict):
-                            entries.append(item)
-                        else:
-                            skipped += 1
-                    break
-            else:
-                if all(isinstance(v, dict) for v in data.values()):
-                    entries.extend(v for v in data.values() if isinstance(v, dict))
+            raw = next(
+                (value for key in _ALBUM_LIST_KEYS if isinstance(value := data.get(key), list)),
+                None,
+            )
+            if raw is None:
+                values = list(data.values())
+                if all(isinstance(v, dict) for v in values):
+                    entries = values
                 else:
                     logger.debug(
                         "dwarf.http.album_list_dict_unparsed",
                         keys=list(data.keys()),
                     )
+        if raw is not None:
+            entries = [item for item in raw if isinstance(item, dict)]
+            skipped = len(raw) - len(entries)
 
         if entries:
             if skipped:
@@ -254,7 +300,7 @@ class DwarfHttpClient:
     async def get_default_params_config(self) -> dict[str, Any]:
         """Fetch the DWARF parameters configuration payload."""
         response = await self._request("GET", "/getDefaultParamsConfig")
-        return response.json()
+        return _json_loads(response.content)
 
     async def get_param_and_setting(self, mode_id: int) -> dict[str, Any]:
         """Fetch the live parameter catalogue for a shooting mode.
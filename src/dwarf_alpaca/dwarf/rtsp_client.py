@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import time
 
 import av
 import numpy as np
@@ -8,6 +9,12 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Packed pixel formats whose single plane can be copied straight into a reused buffer.
+_PACKED_CHANNELS = {"bgr24": 3, "rgb24": 3, "gray": 1}
+
+# An unread frame older than this means consumers have stalled and P-frames are skipped.
+_BACKLOG_SECONDS = 0.5
+
 
 class DwarfRtspClient:
     """RTSP frame reader for DWARF live view streams."""
@@ -17,21 +24,28 @@ class DwarfRtspClient:
         url: str,
         *,
         buffer_size: int = 10,
-        preferred_format: str = "bgr24",
+        preferred_format: str = "yuv420p",
     ) -> None:
         self.url = url
         self.buffer_size = buffer_size
         self.preferred_format = preferred_format
 
-        self._queue: asyncio.Queue[np.ndarray] | None = None
+        self._latest: np.ndarray | None = None
+        self._sequence = 0
+        self._served_sequence = 0
+        self._frame_cond: asyncio.Condition | None = None
         self._task: asyncio.Task[None] | None = None
         self._stop_event: asyncio.Event | None = None
+        self._buffers: list[np.ndarray] = []
+        self._buffer_index = 0
 
     async def start(self) -> None:
         if self._task and not self._task.done():
             return
 
-        self._queue = asyncio.Queue(maxsize=self.buffer_size)
+        self._latest = None
+        self._sequence = self._served_sequence = 0
+        self._frame_cond = asyncio.Condition()
         self._stop_event = asyncio.Event()
         self._task = asyncio.create_task(self._reader())
         logger.info("rtsp.started", url=self.url)
@@ -46,18 +60,34 @@ class DwarfRtspClient:
             except asyncio.CancelledError:
                 pass
         self._task = None
-        self._queue = None
+        self._frame_cond = None
+        self._latest = None
         logger.info("rtsp.stopped", url=self.url)
 
-    async def read_frame(self) -> np.ndarray:
-        if self._queue is None:
+    async def read_frame(self, timeout: float | None = None) -> np.ndarray:
+        """Return the newest decoded frame as a read-only array.
+
+        A frame nobody has read yet is returned immediately; otherwise this waits
+        for the next one. Concurrent callers woken by the same frame all receive
+        that frame, so several consumers can share one decode.
+        """
+
+        cond = self._frame_cond
+        if cond is None:
             raise RuntimeError("RTSP client not started")
-        return await self._queue.get()
+        async with cond:
+            if self._sequence == self._served_sequence:
+                seen = self._sequence
+                await asyncio.wait_for(cond.wait_for(lambda: self._sequence != seen), timeout)
+            self._served_sequence = self._sequence
+            img = self._latest
+        assert img is not None
+        return img
 
     async def _reader(self) -> None:
         assert self._stop_event is not None
-        queue = self._queue
-        assert queue is not None
+        cond = self._frame_cond
+        assert cond is not None
 
         try:
             container = await asyncio.to_thread(av.open, self.url, format="rtsp")
@@ -68,19 +98,103 @@ class DwarfRtspClient:
         try:
             stream = container.streams.video[0]
             stream.thread_type = "AUTO"
-            for frame in container.decode(stream):
+            skipping = False
+            published_at = time.monotonic()
+            for packet in container.demux(stream):
                 if self._stop_event.is_set():
                     break
-                img = frame.to_ndarray(format=self.preferred_format)
-                while True:
-                    try:
-                        queue.put_nowait(img)
-                        break
-                    except asyncio.QueueFull:
-                        try:
-                            queue.get_nowait()
-                        except asyncio.QueueEmpty:
-                            break
+                if packet.is_keyframe:
+                    skipping = False
+                elif packet.size and (
+                    skipping
+                    or (
+                        self._sequence != self._served_sequence
+                        and time.monotonic() - published_at > _BACKLOG_SECONDS
+                    )
+                ):
+                    # Nobody has picked up the last frame for a while: stop decoding
+                    # until the next key frame, which the decoder can start from cleanly.
+                    skipping = True
+                    continue
+                for frame in packet.decode():
+                    # Live view only ever serves the newest frame; older ones are dropped.
+                    img = self._convert_frame(frame).view()
+                    img.flags.writeable = False
+                    async with cond:
+                        self._latest = img
+                        self._sequence += 1
+                        cond.notify_all()
+                    published_at = time.monotonic()
                 await asyncio.sleep(0)
         finally:
             container.close()
+
+    def _convert_frame(self, frame: av.VideoFrame) -> np.ndarray:
+        """Convert ``frame`` into the next slot of a ring of reused buffers.
+
+        Frames handed out by :meth:`read_frame` are only valid until the reader has
+        cycled through the ring; consumers that keep a frame around must copy it.
+        """
+
+        fmt = self.preferred_format
+        if fmt == "yuv420p":
+            converted = frame if frame.format.name == fmt else frame.reformat(format=fmt)
+            height, width = converted.height, converted.width
+            if height % 2 or width % 2:
+                return converted.to_ndarray()
+            target = self._next_buffer((height * 3 // 2, width))
+            flat = target.reshape(-1)
+            luma = height * width
+            chroma = luma // 4
+            _copy_plane(converted.planes[0], flat[:luma], height, width)
+            _copy_plane(converted.planes[1], flat[luma : luma + chroma], height // 2, width // 2)
+            _copy_plane(converted.planes[2], flat[luma + chroma :], height // 2, width // 2)
+            return target
+
+        channels = _PACKED_CHANNELS.get(fmt)
+        if channels is None:
+            return frame.to_ndarray(format=fmt)
+
+        converted = frame.reformat(format=fmt)
+        height, width = converted.height, converted.width
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        target = self._next_buffer(shape)
+        _copy_plane(converted.planes[0], target.reshape(-1), height, width * channels)
+        return target
+
+    def _next_buffer(self, shape: tuple[int, ...]) -> np.ndarray:
+        if not self._buffers or self._buffers[0].shape != shape:
+            # The published frame, the one a consumer is holding and the one being
+            # written must live in distinct buffers.
+            slots = max(self.buffer_size, 3)
+            self._buffers = [np.empty(shape, dtype=np.uint8) for _ in range(slots)]
+            self._buffer_index = 0
+
+        target = self._buffers[self._buffer_index]
+        self._buffer_index = (self._buffer_index + 1) % len(self._buffers)
+        return target
+
+
+def _copy_plane(
+    plane: av.video.plane.VideoPlane, dst: np.ndarray, rows: int, row_bytes: int
+) -> None:
+    """Copy ``rows`` x ``row_bytes`` from a (possibly padded) plane into ``dst``."""
+
+    source = np.frombuffer(plane, dtype=np.uint8, count=rows * plane.line_size)
+    source = source.reshape(rows, plane.line_size)[:, :row_bytes]
+    np.copyto(dst.reshape(rows, row_bytes), source)
+
+
+def to_bgr(image: np.ndarray) -> np.ndarray:
+    """Convert an I420 frame from :meth:`DwarfRtspClient.read_frame` to BGR.
+
+    Live view frames are kept in the decoder's native YUV420P layout (a
+    ``(height * 3 / 2, width)`` array); only consumers that need colour pixels
+    should pay for the conversion.
+    """
+
+    import cv2  # type: ignore
+
+    if image.ndim == 3:
+        return image
+    return cv2.cvtColor(image, cv2.COLOR_YUV2BGR_I420)
@@ -3,15 +3,20 @@ from __future__ import annotations
 import asyncio
 import base64
 import contextlib
+import functools
+import logging
 import math
 import re
 import struct
+import threading
 import time
 import uuid
+from array import array
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, IntEnum
-from typing import Any, Dict, Iterator, Optional, Tuple, Type
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Tuple, Type
 
 try:
     from zoneinfo import ZoneInfo
@@ -81,6 +86,7 @@ from ..proto.dwarf_messages import (
     V3ResNotifyObservationState,
     V3ResNotifyTemperature2,
     V3ResShootingModeSwitch,
+    WsPacket,
 )
 from ..proto.focus_pb2 import ReqAstroAutoFocus
 from ..proto.notify_pb2 import (
@@ -97,9 +103,70 @@ from ..proto.v3_notify_pb2 import V3ResNotifyAutoFocusState
 from . import exposure
 from .ftp_client import DwarfFtpClient, FtpPhotoEntry
 from .http_client import DwarfHttpClient
-from .ws_client import DwarfCommandError, DwarfWsClient, send_and_check
+from .ws_client import DwarfCommandError, DwarfWsClient
 
 logger = structlog.get_logger(__name__)
+# structlog is routed through stdlib logging, whose isEnabledFor() is cached per level
+# and invalidated on reconfiguration; joystick paths check it before building payloads.
+_stdlib_logger = logging.getLogger(__name__)
+
+# Protobuf enum attribute access goes through EnumTypeWrapper.__getattr__; bind the
+# module and command ids used below once instead of resolving them on every send.
+_MODULE_ASTRO = protocol_pb2.ModuleId.MODULE_ASTRO
+_MODULE_CAMERA_TELE = protocol_pb2.ModuleId.MODULE_CAMERA_TELE
+_MODULE_CAMERA_WIDE = protocol_pb2.ModuleId.MODULE_CAMERA_WIDE
+_MODULE_FOCUS = protocol_pb2.ModuleId.MODULE_FOCUS
+_MODULE_MOTOR = protocol_pb2.ModuleId.MODULE_MOTOR
+_MODULE_NOTIFY = protocol_pb2.ModuleId.MODULE_NOTIFY
+_MODULE_SYSTEM = protocol_pb2.ModuleId.MODULE_SYSTEM
+_CMD_ASTRO_CHECK_GOT_DARK = protocol_pb2.DwarfCMD.CMD_ASTRO_CHECK_GOT_DARK
+_CMD_ASTRO_CONTINUE_SHOOTING = protocol_pb2.DwarfCMD.CMD_ASTRO_CONTINUE_SHOOTING
+_CMD_ASTRO_GO_LIVE = protocol_pb2.DwarfCMD.CMD_ASTRO_GO_LIVE
+_CMD_ASTRO_START_CALIBRATION = protocol_pb2.DwarfCMD.CMD_ASTRO_START_CALIBRATION
+_CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING = (
+    protocol_pb2.DwarfCMD.CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING
+)
+_CMD_ASTRO_START_GOTO_DSO = protocol_pb2.DwarfCMD.CMD_ASTRO_START_GOTO_DSO
+_CMD_ASTRO_START_ONE_CLICK_GOTO_DSO = protocol_pb2.DwarfCMD.CMD_ASTRO_START_ONE_CLICK_GOTO_DSO
+_CMD_ASTRO_STOP_CAPTURE_RAW_LIVE_STACKING = (
+    protocol_pb2.DwarfCMD.CMD_ASTRO_STOP_CAPTURE_RAW_LIVE_STACKING
+)
+_CMD_ASTRO_STOP_GOTO = protocol_pb2.DwarfCMD.CMD_ASTRO_STOP_GOTO
+_CMD_ASTRO_STOP_ONE_CLICK_GOTO = protocol_pb2.DwarfCMD.CMD_ASTRO_STOP_ONE_CLICK_GOTO
+_CMD_CAMERA_TELE_CLOSE_CAMERA = protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_CLOSE_CAMERA
+_CMD_CAMERA_TELE_GET_ALL_FEATURE_PARAMS = (
+    protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_GET_ALL_FEATURE_PARAMS
+)
+_CMD_CAMERA_TELE_GET_SYSTEM_WORKING_STATE = (
+    protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_GET_SYSTEM_WORKING_STATE
+)
+_CMD_CAMERA_TELE_OPEN_CAMERA = protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_OPEN_CAMERA
+_CMD_CAMERA_TELE_PHOTOGRAPH = protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_PHOTOGRAPH
+_CMD_CAMERA_TELE_PHOTO_RAW = protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_PHOTO_RAW
+_CMD_CAMERA_TELE_SET_EXP = protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_SET_EXP
+_CMD_CAMERA_TELE_SET_EXP_MODE = protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_SET_EXP_MODE
+_CMD_CAMERA_TELE_SET_FEATURE_PARAM = protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_SET_FEATURE_PARAM
+_CMD_CAMERA_TELE_SET_GAIN = protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_SET_GAIN
+_CMD_CAMERA_TELE_SET_GAIN_MODE = protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_SET_GAIN_MODE
+_CMD_CAMERA_TELE_SET_IRCUT = protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_SET_IRCUT
+_CMD_CAMERA_WIDE_OPEN_CAMERA = protocol_pb2.DwarfCMD.CMD_CAMERA_WIDE_OPEN_CAMERA
+_CMD_FOCUS_MANUAL_SINGLE_STEP_FOCUS = protocol_pb2.DwarfCMD.CMD_FOCUS_MANUAL_SINGLE_STEP_FOCUS
+_CMD_FOCUS_START_ASTRO_AUTO_FOCUS = protocol_pb2.DwarfCMD.CMD_FOCUS_START_ASTRO_AUTO_FOCUS
+_CMD_FOCUS_START_MANUAL_CONTINU_FOCUS = protocol_pb2.DwarfCMD.CMD_FOCUS_START_MANUAL_CONTINU_FOCUS
+_CMD_FOCUS_STOP_MANUAL_CONTINU_FOCUS = protocol_pb2.DwarfCMD.CMD_FOCUS_STOP_MANUAL_CONTINU_FOCUS
+_CMD_NOTIFY_CALIBRATION_RESULT = protocol_pb2.DwarfCMD.CMD_NOTIFY_CALIBRATION_RESULT
+_CMD_NOTIFY_SET_FEATURE_PARAM = protocol_pb2.DwarfCMD.CMD_NOTIFY_SET_FEATURE_PARAM
+_CMD_NOTIFY_TELE_SET_PARAM = protocol_pb2.DwarfCMD.CMD_NOTIFY_TELE_SET_PARAM
+_CMD_NOTIFY_WS_HOST_SLAVE_MODE = protocol_pb2.DwarfCMD.CMD_NOTIFY_WS_HOST_SLAVE_MODE
+_CMD_STEP_MOTOR_SERVICE_JOYSTICK = protocol_pb2.DwarfCMD.CMD_STEP_MOTOR_SERVICE_JOYSTICK
+_CMD_STEP_MOTOR_SERVICE_JOYSTICK_STOP = protocol_pb2.DwarfCMD.CMD_STEP_MOTOR_SERVICE_JOYSTICK_STOP
+_CMD_SYSTEM_SET_MASTERLOCK = protocol_pb2.DwarfCMD.CMD_SYSTEM_SET_MASTERLOCK
+_CMD_SYSTEM_SET_TIME = protocol_pb2.DwarfCMD.CMD_SYSTEM_SET_TIME
+_CMD_SYSTEM_SET_TIME_ZONE = protocol_pb2.DwarfCMD.CMD_SYSTEM_SET_TIME_ZONE
+_CMD_V3_ASTRO_GET_PARAMS = protocol_pb2.DwarfCMD.CMD_V3_ASTRO_GET_PARAMS
+_CMD_V3_NOTIFY_AUTOFOCUS_STATE = protocol_pb2.DwarfCMD.CMD_V3_NOTIFY_AUTOFOCUS_STATE
+_CMD_V3_NOTIFY_AUTOFOCUS_STATE_ALT = protocol_pb2.DwarfCMD.CMD_V3_NOTIFY_AUTOFOCUS_STATE_ALT
+_CMD_V3_NOTIFY_CAMERA_PARAM_STATE = protocol_pb2.DwarfCMD.CMD_V3_NOTIFY_CAMERA_PARAM_STATE
 
 
 def _read_varint(raw: bytes, start: int) -> tuple[int, int]:
@@ -254,9 +321,41 @@ _MINI_CANONICAL_FILTER_LABELS = tuple(FALLBACK_FILTER_LABELS_MINI)
 
 _MAX_JOYSTICK_SPEED = 30.0
 _MIN_JOYSTICK_SPEED = 0.1
+_RAD_TO_DEG = 180.0 / math.pi
+
+
+def _joystick_vector(rate_x: float, rate_y: float) -> tuple[float, float, float] | None:
+    """Return ``(angle_degrees, vector_length, speed)`` for axis rates, or ``None`` at rest."""
+
+    magnitude = math.hypot(rate_x, rate_y)
+    if magnitude < 1e-6:
+        return None
+    # speed is floored at _MIN_JOYSTICK_SPEED, so the division is always safe.
+    speed = max(min(magnitude, _MAX_JOYSTICK_SPEED), _MIN_JOYSTICK_SPEED)
+    # atan2 lies in (-180, 180] degrees; the modulo folds negatives without a branch.
+    angle = math.atan2(rate_y, rate_x) * _RAD_TO_DEG % 360.0
+    return angle, min(1.0, magnitude / speed), speed
+
 
 _GOTO_KIND_DSO = "dso"
 
+_FITS_STRUCTURAL_KEYWORDS = frozenset({"BITPIX", "NAXIS", "NAXIS1", "NAXIS2", "BSCALE", "BZERO"})
+# The same keywords as blank-padded 8-byte card fields, for the vectorized header scan.
+_FITS_STRUCTURAL_KEYWORD_FIELDS = np.array(
+    sorted(keyword.ljust(8).encode("ascii") for keyword in _FITS_STRUCTURAL_KEYWORDS),
+    dtype="S8",
+)
+# Characters that mark a numeric header value as floating point.
+_FITS_FLOAT_CHARS = frozenset(".Ee")
+
+_ALBUM_POLL_INITIAL_SECONDS = 0.25
+_ALBUM_POLL_MAX_SECONDS = 2.0
+# Simulated focuser speed, and how many steps it advances per event-loop wake-up.
+_SIM_FOCUS_STEP_SECONDS = 0.005
+_SIM_FOCUS_STEPS_PER_TICK = 10
+# How long a successful dark-library check is reused across captures.
+_DARK_CHECK_OK_TTL_SECONDS = 30.0
+
 _MODULE_CAMERA_PARAMS = 15
 _MODULE_DEVICE_CONFIG = 14
 _CMD_V3_CAMERA_PARAMS_SET_PARAM = 16700
@@ -296,6 +395,56 @@ _ASTRO_NON_FATAL_START_WARNING_CODES = frozenset(
     }
 )
 
+# Master-lock, bootstrap and working-state requests may be answered by the host/slave
+# notification on either module; shared read-only so no call rebuilds the map.
+_HOST_SLAVE_EXPECTED: Mapping[Tuple[int, int], Type[Message]] = MappingProxyType(
+    {
+        (
+            _MODULE_SYSTEM,
+            _CMD_NOTIFY_WS_HOST_SLAVE_MODE,
+        ): ResNotifyHostSlaveMode,
+        (
+            _MODULE_NOTIFY,
+            _CMD_NOTIFY_WS_HOST_SLAVE_MODE,
+        ): ResNotifyHostSlaveMode,
+    }
+)
+
+_TELE_PARAM_EXPECTED: Mapping[Tuple[int, int], Type[Message]] = MappingProxyType(
+    {(_MODULE_NOTIFY, _CMD_NOTIFY_TELE_SET_PARAM): ResNotifyParam}
+)
+
+# V2 bootstrap requests are static, so their bodies are serialized once at import:
+# (module_id, command_id, request type name, serialized request).
+_BOOTSTRAP_FRAMES: tuple[tuple[int, int, str, bytes], ...] = tuple(
+    (module_id, command_id, type(message).__name__, message.SerializeToString())
+    for module_id, command_id, message in (
+        (
+            _MODULE_CAMERA_TELE,
+            _CMD_CAMERA_TELE_GET_SYSTEM_WORKING_STATE,
+            ReqGetSystemWorkingState(),
+        ),
+        (
+            _MODULE_CAMERA_TELE,
+            _CMD_CAMERA_TELE_OPEN_CAMERA,
+            ReqOpenCamera(binning=False, rtsp_encode_type=0),
+        ),
+        (
+            _MODULE_CAMERA_WIDE,
+            _CMD_CAMERA_WIDE_OPEN_CAMERA,
+            ReqOpenCamera(binning=False, rtsp_encode_type=0),
+        ),
+    )
+)
+
+# Capture-path requests whose bodies never change, serialized once at import.
+_GO_LIVE_REQUEST = astro_pb2.ReqGoLive().SerializeToString()
+_CHECK_DARK_REQUEST = astro_pb2.ReqCheckDarkFrame().SerializeToString()
+_PHOTO_RAW_REQUEST = ReqPhotoRaw().SerializeToString()
+_PHOTO_FALLBACK_REQUEST = ReqPhoto(x=0, y=0, ratio=0.0).SerializeToString()
+_EXP_MODE_MANUAL_REQUEST = ReqSetExpMode(mode=protocol_pb2.PhotoMode.Manual).SerializeToString()
+_GAIN_MODE_MANUAL_REQUEST = ReqSetGainMode(mode=1).SerializeToString()
+
 
 def _resolve_ws_protocol_profile(settings: Settings) -> tuple[int, int]:
     """Return websocket defaults from the centralized capability profile."""
@@ -357,11 +506,19 @@ class V3AstroPreset:
     pipe_parts: tuple[str, ...]
 
 
+_FILTER_PLACEHOLDER_LABELS = tuple(f"Filter {index}" for index in range(16))
+
+
+@functools.lru_cache(maxsize=64)
 def _canonical_filter_label(raw_label: str, index: int) -> str:
+    # str.split()/join beats a compiled \s+ regex for labels this short; the cache
+    # covers the handful of labels each filter-option rebuild sees repeatedly.
     cleaned = " ".join((raw_label or "").split())
-    if not cleaned:
-        return f"Filter {index}"
-    return cleaned
+    if cleaned:
+        return cleaned
+    if 0 <= index < len(_FILTER_PLACEHOLDER_LABELS):
+        return _FILTER_PLACEHOLDER_LABELS[index]
+    return f"Filter {index}"
 
 
 def _message_to_log(message: Message) -> Dict[str, Any]:
@@ -372,7 +529,26 @@ def _message_to_log(message: Message) -> Dict[str, Any]:
     return payload
 
 
-@dataclass
+class _LazyMsg:
+    """Log value that converts a protobuf message only when a renderer asks for it.
+
+    ``JSONRenderer`` calls ``__structlog__`` and console renderers call ``repr``;
+    events dropped by level filtering never pay for ``MessageToDict``.
+    """
+
+    __slots__ = ("_message",)
+
+    def __init__(self, message: Message) -> None:
+        self._message = message
+
+    def __structlog__(self) -> Dict[str, Any]:
+        return _message_to_log(self._message)
+
+    def __repr__(self) -> str:
+        return repr(_message_to_log(self._message))
+
+
+@dataclass(slots=True)
 class CameraState:
     connected: bool = False
     start_time: float | None = None
@@ -409,6 +585,7 @@ class CameraState:
     requested_gain: int | None = None
     applied_gain_index: int | None = None
     applied_gain_value: int | None = None
+    gain_mode_manual: bool = False
     applied_duration: float | None = None
     applied_filter_name: str | None = None
     applied_bin: tuple[int, int] | None = None
@@ -429,7 +606,7 @@ class CameraState:
     retrieved_file_path: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FocuserState:
     connected: bool = False
     position: int = 0
@@ -437,7 +614,7 @@ class FocuserState:
     last_update: float | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FilterOption:
     parameter: dict[str, Any] | None
     mode_index: int
@@ -445,6 +622,126 @@ class FilterOption:
     label: str
     continue_value: float | None = None
     controllable: bool = True
+    is_ir_cut: bool = False
+
+
+def _is_ir_cut_parameter(parameter: dict[str, Any]) -> bool:
+    raw_id = parameter.get("id")
+    try:
+        param_id = int(raw_id) if raw_id is not None else None
+    except (TypeError, ValueError):
+        param_id = None
+    return param_id == 8 or "ir cut" in str(parameter.get("name", "")).strip().lower()
+
+
+@functools.cache
+def _load_cv2() -> Any:
+    """Import OpenCV once, on the first decoded capture.
+
+    The import is deferred because it is slow and simulation-only sessions
+    never need it; caching it keeps the per-frame decode free of import
+    machinery.
+    """
+
+    import cv2  # type: ignore
+
+    return cv2
+
+
+@dataclass(slots=True)
+class _FitsScratch:
+    """Float working buffer reused by every scaled FITS decode of one session.
+
+    Decodes run in worker threads, so the buffer is only handed out under ``lock``.
+    Returned frames are always fresh arrays; only the intermediate is recycled.
+    """
+
+    buffer: np.ndarray | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def take(self, shape: tuple[int, int], dtype: type[np.floating[Any]]) -> np.ndarray:
+        nbytes = shape[0] * shape[1] * np.dtype(dtype).itemsize
+        if self.buffer is None or self.buffer.size < nbytes:
+            self.buffer = np.empty(nbytes, dtype=np.uint8)
+        return self.buffer[:nbytes].view(dtype).reshape(shape)
+
+
+class _FeatureOption(NamedTuple):
+    """One selectable value of a feature param, with its label lowered once."""
+
+    mode_index: int | None
+    index: int
+    label: str
+    label_lower: str
+    continue_value: float | None
+
+
+def _normalized_name(entry: dict[str, Any]) -> str:
+    return str(entry.get("name", "")).strip().lower()
+
+
+@dataclass(frozen=True, slots=True)
+class _FeatureParamIndex:
+    """Pre-normalized view of the params config and websocket feature params.
+
+    Built once per pair of source objects; both are replaced wholesale rather
+    than mutated, so an identity check is enough to detect staleness.
+    """
+
+    params_config: dict[str, Any] | None
+    ws_feature_params: list[dict[str, Any]] | None
+    entries: tuple[dict[str, Any], ...]
+    features: tuple[tuple[str, dict[str, Any]], ...]
+    features_by_name: dict[str, dict[str, Any]]
+    support_params: tuple[tuple[str, str, dict[str, Any]], ...]
+    support_by_camera: dict[str, tuple[tuple[str, str, dict[str, Any]], ...]]
+    feature_options: dict[int, tuple[dict[str, Any], tuple[_FeatureOption, ...]]] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def build(
+        cls,
+        params_config: dict[str, Any] | None,
+        ws_feature_params: list[dict[str, Any]] | None,
+    ) -> "_FeatureParamIndex":
+        data = params_config.get("data") if params_config else None
+        if not isinstance(data, dict):
+            data = {}
+        config_features = data.get("featureParams")
+        if not isinstance(config_features, list):
+            config_features = []
+        features = tuple(
+            (_normalized_name(entry), entry)
+            for entry in (*config_features, *(ws_feature_params or ()))
+            if isinstance(entry, dict)
+        )
+        features_by_name: dict[str, dict[str, Any]] = {}
+        for name, entry in features:
+            features_by_name.setdefault(name, entry)
+
+        support_by_camera: dict[str, list[tuple[str, str, dict[str, Any]]]] = {}
+        cameras = data.get("cameras")
+        for camera in cameras if isinstance(cameras, list) else ():
+            if not isinstance(camera, dict):
+                continue
+            params = camera.get("supportParams")
+            if not isinstance(params, list):
+                continue
+            camera_name = str(camera.get("name", "")).strip()
+            bucket = support_by_camera.setdefault(camera_name.lower(), [])
+            for param in params:
+                if isinstance(param, dict):
+                    bucket.append((camera_name, _normalized_name(param), param))
+        return cls(
+            params_config,
+            ws_feature_params,
+            tuple(entry for _, entry in features),
+            features,
+            features_by_name,
+            tuple(row for bucket in support_by_camera.values() for row in bucket),
+            {key: tuple(bucket) for key, bucket in support_by_camera.items()},
+        )
 
 
 class DwarfSession:
@@ -484,11 +781,13 @@ class DwarfSession:
         self._refs: dict[str, int] = {"telescope": 0, "camera": 0, "focuser": 0, "filterwheel": 0}
         self._master_lock_acquired = False
         self._master_lock_lock = asyncio.Lock()
+        self._master_lock_future = None  # type: asyncio.Future[None] | None
         self._lock = asyncio.Lock()
-        self._ws_command_lock: asyncio.Lock | None = None
-        self._ws_command_lock_loop: asyncio.AbstractEventLoop | None = None
         self._filter_change_lock: asyncio.Lock | None = None
         self._filter_change_lock_loop: asyncio.AbstractEventLoop | None = None
+        # Serializes the check-then-send gain and astro parameter passes.
+        self._camera_config_lock: asyncio.Lock | None = None
+        self._camera_config_lock_loop: asyncio.AbstractEventLoop | None = None
         self._capture_start_evidence_event = asyncio.Event()
         self._capture_frame_complete_event = asyncio.Event()
         self._capture_start_response_task: asyncio.Task[None] | None = None
@@ -499,11 +798,60 @@ class DwarfSession:
         self._exposure_resolver: Optional[exposure.ExposureResolver] = None
         self._params_config: Optional[dict[str, Any]] = None
         self._filter_options: list[FilterOption] | None = None
+        self._filter_options_config: dict[str, Any] | None = None
+        self._filter_label_positions: tuple[list[FilterOption], dict[str, int]] | None = None
+        self._fits_scratch = _FitsScratch()
+        # (filter_index, filter_name) last confirmed by _ensure_selected_filter.
+        self._last_applied_filter_signature: tuple[int, str] | None = None
+        # Astro feature params confirmed on the current connection, keyed by lowered
+        # feature name -> (mode_index, index, continue_value).
+        self._applied_feature_state: dict[str, tuple[int, int, float]] = {}
         self._last_dark_check_code: int | None = None
-        self._axis_direction_polarity = {0: 1, 1: 1}
-        self._manual_axis_rates = {0: 0.0, 1: 0.0}
+        # Monotonic time until which a confirmed dark library is trusted without
+        # re-querying; cleared whenever a capture fails to start.
+        self._dark_check_ok_until = 0.0
+        # Indexed by Alpaca axis (0 = primary, 1 = secondary) on the joystick hot path.
+        self._axis_direction_polarity = array("i", (1, 1))
+        self._manual_axis_rates = array("d", (0.0, 0.0))
         self._joystick_active = False
-        self._temperature_task = None  # type: asyncio.Task[None] | None
+        self._temp_refresh_task: asyncio.Task[None] | None = None
+        self._temp_refresh_requested_at: float | None = None
+        # Reused by the high-rate notification handlers; ParseFromString clears first.
+        self._focus_msg = ResNotifyFocus()
+        self._temp_msg = ResNotifyTemperature()
+        # Joystick frames are serialized synchronously in send_request before any await,
+        # so one instance per message type can be refilled for every update.
+        self._joystick_req = ReqMotorServiceJoystick()
+        self._joystick_stop_req = ReqMotorServiceJoystickStop()
+        # Same for the single-field exposure and gain index requests.
+        self._set_exp_req = ReqSetExp()
+        self._set_gain_req = ReqSetGain()
+        cmd = protocol_pb2.DwarfCMD
+        self._notify_dispatch: dict[int, Callable[[WsPacket], None]] = {
+            cmd.CMD_NOTIFY_FOCUS: self._handle_focus_notification,
+            cmd.CMD_NOTIFY_TEMPERATURE: self._handle_temperature_notification,
+            cmd.CMD_NOTIFY_STATE_ASTRO_CALIBRATION: self._handle_calibration_state_notification,
+            cmd.CMD_NOTIFY_STATE_ASTRO_GOTO: self._handle_goto_state_notification,
+            cmd.CMD_NOTIFY_STATE_ASTRO_ONE_CLICK_GOTO: (
+                self._handle_one_click_goto_state_notification
+            ),
+            cmd.CMD_NOTIFY_CALIBRATION_RESULT: self._handle_calibration_result_notification,
+            cmd.CMD_NOTIFY_STATE_ASTRO_TRACKING: self._handle_tracking_state_notification,
+            cmd.CMD_NOTIFY_SET_FEATURE_PARAM: self._handle_feature_param_notification,
+            cmd.CMD_NOTIFY_PROGRASS_CAPTURE_RAW_LIVE_STACKING: (
+                self._handle_astro_capture_progress_notification
+            ),
+            _CMD_NOTIFY_V3_EXPOSURE_PROGRESS: self._handle_v3_exposure_progress_notification,
+            _CMD_NOTIFY_V3_DEVICE_STATE: self._handle_v3_device_state_notification,
+            _CMD_NOTIFY_V3_CAMERA_PARAM_STATE: self._handle_v3_camera_param_state_notification,
+            _CMD_NOTIFY_V3_MODE_CHANGE: self._handle_v3_mode_change_notification,
+            cmd.CMD_V3_NOTIFY_AUTOFOCUS_STATE: self._handle_v3_autofocus_state_notification,
+            cmd.CMD_V3_NOTIFY_AUTOFOCUS_STATE_ALT: self._handle_v3_autofocus_state_notification,
+            _CMD_NOTIFY_V3_TEMPERATURE2: self._handle_v3_temperature2_notification,
+            _CMD_NOTIFY_V3_OBSERVATION_STATE: self._handle_v3_observation_state_notification,
+            cmd.CMD_NOTIFY_ELE: self._handle_battery_notification,
+        }
+        self._ws_keepalive_task = None  # type: asyncio.Task[None] | None
         self._last_goto_time: float | None = None
         self._last_goto_target: tuple[float, float] | None = None
         self._last_goto_kind: str | None = None
@@ -527,6 +875,7 @@ class DwarfSession:
         self._gain_manual_mode_supported: bool | None = None
         self._gain_last_skipped_value: int | None = None
         self._ws_feature_params: list[dict[str, Any]] | None = None
+        self._feature_param_index: _FeatureParamIndex | None = None
         self._ws_v3_filter_param_id: int | None = None
         self._ws_v3_filter_param_flag: int = 0
         self._ws_v3_filter_value: int | None = None
@@ -755,6 +1104,7 @@ class DwarfSession:
                         label=label,
                         continue_value=chosen.continue_value,
                         controllable=chosen.controllable,
+                        is_ir_cut=chosen.is_ir_cut,
                     )
                 )
                 continue
@@ -778,19 +1128,6 @@ class DwarfSession:
             )
         return ordered
 
-    def _get_ws_command_lock(self) -> asyncio.Lock:
-        loop = asyncio.get_running_loop()
-        lock = self._ws_command_lock
-        if lock is None or self._ws_command_lock_loop is not loop:
-            lock = asyncio.Lock()
-            self._ws_command_lock = lock
-            self._ws_command_lock_loop = loop
-        return lock
-
-    def _reset_ws_command_lock(self) -> None:
-        self._ws_command_lock = None
-        self._ws_command_lock_loop = None
-
     def _get_filter_change_lock(self) -> asyncio.Lock:
         loop = asyncio.get_running_loop()
         lock = self._filter_change_lock
@@ -800,6 +1137,15 @@ class DwarfSession:
             self._filter_change_lock_loop = loop
         return lock
 
+    def _get_camera_config_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._camera_config_lock
+        if lock is None or self._camera_config_lock_loop is not loop:
+            lock = asyncio.Lock()
+            self._camera_config_lock = lock
+            self._camera_config_lock_loop = loop
+        return lock
+
     async def _handle_ws_timeout(self, module_id: int, command_id: int, error: Exception) -> None:
         await self._handle_ws_timeout_with_options(
             module_id,
@@ -828,12 +1174,30 @@ class DwarfSession:
         )
         self._ws_client.cancel_pending(module_id, command_id, error)
         if close_ws:
-            self._reset_ws_command_lock()
+            if self._ws_client.has_pending_requests:
+                # Closing would fail every other pipelined command along with this
+                # one; only the timed-out request is abandoned.
+                logger.debug(
+                    "dwarf.ws.command.timeout_socket_kept",
+                    module_id=module_id,
+                    command_id=command_id,
+                )
+                return
             with contextlib.suppress(Exception):
                 await self._ws_client.close()
 
+    @property
+    def _ws_ready(self) -> bool:
+        """True when ``_ensure_ws`` would return without doing any work.
+
+        Hot paths test this before awaiting ``_ensure_ws`` so the steady state
+        costs an attribute check rather than a coroutine round-trip.
+        """
+        return self.simulation or (self._ws_client.connected and self._master_lock_acquired)
+
     async def _ensure_ws(self) -> None:
-        if self.simulation:
+        if self._ws_ready:
+            # Steady state: the keep-alive task has already done the handshake.
             return
         was_connected = self._ws_client.connected
         try:
@@ -845,11 +1209,66 @@ class DwarfSession:
             self._master_lock_acquired = False
             self._ws_bootstrapped = False
             self._time_synced = self.simulation
+            # A fresh connection may follow another client changing camera modes.
+            self.camera_state.gain_mode_manual = False
+            self._applied_feature_state.clear()
+            self._dark_check_ok_until = 0.0
+            # A reading requested on the old socket will never arrive.
+            self._temp_refresh_requested_at = None
             if self._last_calibration_ip != self.settings.dwarf_ap_ip:
                 self._last_calibration_time = None
                 self._last_calibration_ip = None
         await self._ensure_master_lock()
-        self._ensure_temperature_monitor_task()
+        self._ensure_ws_keepalive_task()
+
+    def _ensure_ws_keepalive_task(self) -> None:
+        task = self._ws_keepalive_task
+        if task and task.done():
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                task.result()
+            self._ws_keepalive_task = None
+
+        if self.simulation or not callable(getattr(self._ws_client, "wait_disconnected", None)):
+            return
+        if self._ws_keepalive_task is None:
+            self._ws_keepalive_task = asyncio.create_task(self._maintain_warm_ws())
+
+    async def _stop_ws_keepalive_task(self) -> None:
+        task = self._ws_keepalive_task
+        self._ws_keepalive_task = None
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+
+    async def _maintain_warm_ws(self) -> None:
+        """Re-establish the websocket (and master lock) as soon as it drops.
+
+        Keeps the TCP/WebSocket handshake and bootstrap off the path of the next
+        device command while any device holds the session.
+        """
+
+        delay = 1.0
+        try:
+            while True:
+                await self._ws_client.wait_disconnected()
+                try:
+                    await self._ensure_ws()
+                except Exception as exc:  # pragma: no cover - hardware dependent
+                    logger.debug(
+                        "dwarf.ws.keepalive_reconnect_failed",
+                        error=str(exc),
+                        retry_in=delay,
+                    )
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2.0, 30.0)
+                else:
+                    delay = 1.0
+                    if not self._ws_client.connected:
+                        await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            logger.debug("dwarf.ws.keepalive.cancelled")
+            raise
 
     async def _bootstrap_ws(self) -> None:
         if self.simulation or self._ws_bootstrapped or not self._ws_client.connected:
@@ -860,63 +1279,20 @@ class DwarfSession:
             self._ws_bootstrapped = True
             return
 
-        commands = (
-            (
-                protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-                protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_GET_SYSTEM_WORKING_STATE,
-                ReqGetSystemWorkingState,
-            ),
-            (
-                protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-                protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_OPEN_CAMERA,
-                ReqOpenCamera,
-            ),
-            (
-                protocol_pb2.ModuleId.MODULE_CAMERA_WIDE,
-                protocol_pb2.DwarfCMD.CMD_CAMERA_WIDE_OPEN_CAMERA,
-                ReqOpenCamera,
-            ),
-        )
-
-        expected = {
-            (
-                protocol_pb2.ModuleId.MODULE_SYSTEM,
-                protocol_pb2.DwarfCMD.CMD_NOTIFY_WS_HOST_SLAVE_MODE,
-            ): ResNotifyHostSlaveMode,
-            (
-                protocol_pb2.ModuleId.MODULE_NOTIFY,
-                protocol_pb2.DwarfCMD.CMD_NOTIFY_WS_HOST_SLAVE_MODE,
-            ): ResNotifyHostSlaveMode,
-        }
-
-        for module_id, command, message_cls in commands:
-            message = message_cls()
-            if isinstance(message, ReqOpenCamera):
-                message.binning = False
-                message.rtsp_encode_type = 0
+        expected = _HOST_SLAVE_EXPECTED
+        # Firmware may answer any bootstrap frame with the host/slave notification,
+        # so every frame claims it; that shared response key keeps them sequential.
+        gap = self.settings.bootstrap_gap_seconds
+        for module_id, command, request_type, payload in _BOOTSTRAP_FRAMES:
             try:
-                response = await self._send_command(
+                response = await self._send_raw_command(
                     module_id,
                     command,
-                    message,
+                    payload,
+                    request_type=request_type,
                     timeout=10.0,
                     expected_responses=expected,
                 )
-                if isinstance(response, ResNotifyHostSlaveMode):
-                    logger.info(
-                        "dwarf.system.bootstrap_host_status module=%s cmd=%s mode=%s lock=%s",
-                        module_id,
-                        command,
-                        getattr(response, "mode", None),
-                        bool(getattr(response, "lock", False)),
-                    )
-                elif isinstance(response, ComResponse) and response.code != protocol_pb2.OK:
-                    logger.warning(
-                        "dwarf.system.bootstrap_command_nonzero module=%s cmd=%s code=%s",
-                        module_id,
-                        command,
-                        response.code,
-                    )
             except Exception as exc:  # pragma: no cover - hardware dependent
                 logger.warning(
                     "dwarf.system.bootstrap_command_failed module=%s cmd=%s error=%s",
@@ -925,7 +1301,23 @@ class DwarfSession:
                     exc,
                 )
                 return
-            await asyncio.sleep(0.2)
+            if isinstance(response, ResNotifyHostSlaveMode):
+                logger.debug(
+                    "dwarf.system.bootstrap_host_status module=%s cmd=%s mode=%s lock=%s",
+                    module_id,
+                    command,
+                    getattr(response, "mode", None),
+                    bool(getattr(response, "lock", False)),
+                )
+            elif isinstance(response, ComResponse) and response.code != protocol_pb2.OK:
+                logger.warning(
+                    "dwarf.system.bootstrap_command_nonzero module=%s cmd=%s code=%s",
+                    module_id,
+                    command,
+                    response.code,
+                )
+            if gap > 0:
+                await asyncio.sleep(gap)
 
         self._ws_bootstrapped = True
 
@@ -935,11 +1327,11 @@ class DwarfSession:
 
         mode_expected_responses = {
             (
-                protocol_pb2.ModuleId.MODULE_NOTIFY,
+                _MODULE_NOTIFY,
                 _CMD_NOTIFY_V3_DEVICE_STATE,
             ): V3ResNotifyDeviceState,
             (
-                protocol_pb2.ModuleId.MODULE_NOTIFY,
+                _MODULE_NOTIFY,
                 _CMD_NOTIFY_V3_MODE_CHANGE,
             ): V3ResNotifyModeChange,
         }
@@ -1050,7 +1442,7 @@ class DwarfSession:
         open_tele = V3ReqOpenTeleCamera()
         open_tele.action = 1
         await self._send_and_check(
-            protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
+            _MODULE_CAMERA_TELE,
             10050,
             open_tele,
             timeout=8.0,
@@ -1061,9 +1453,9 @@ class DwarfSession:
             shooting_mode=shooting_mode,
         )
 
-    async def _handle_notification(self, packet: Message) -> None:
+    async def _handle_notification(self, packet: WsPacket) -> None:
         if self.camera_state.capture_id is not None:
-            raw_data = bytes(getattr(packet, "data", b"") or b"")
+            raw_data = packet.data
             command_id_for_trace = int(getattr(packet, "cmd", 0))
             module_id_for_trace = int(getattr(packet, "module_id", 0))
             logger.info(
@@ -1079,47 +1471,11 @@ class DwarfSession:
                 payload_truncated=len(raw_data) > 512,
             )
         self._trace_calibration_notification(packet)
-        module_id = getattr(packet, "module_id", None)
-        if module_id != protocol_pb2.ModuleId.MODULE_NOTIFY:
-            return
-        command_id = getattr(packet, "cmd", None)
-        if command_id == protocol_pb2.DwarfCMD.CMD_NOTIFY_FOCUS:
-            self._handle_focus_notification(packet)
-        elif command_id == protocol_pb2.DwarfCMD.CMD_NOTIFY_TEMPERATURE:
-            self._handle_temperature_notification(packet)
-        elif command_id == protocol_pb2.DwarfCMD.CMD_NOTIFY_STATE_ASTRO_CALIBRATION:
-            self._handle_calibration_state_notification(packet)
-        elif command_id == protocol_pb2.DwarfCMD.CMD_NOTIFY_STATE_ASTRO_GOTO:
-            self._handle_goto_state_notification(packet)
-        elif command_id == protocol_pb2.DwarfCMD.CMD_NOTIFY_STATE_ASTRO_ONE_CLICK_GOTO:
-            self._handle_one_click_goto_state_notification(packet)
-        elif command_id == protocol_pb2.DwarfCMD.CMD_NOTIFY_CALIBRATION_RESULT:
-            self._handle_calibration_result_notification(packet)
-        elif command_id == protocol_pb2.DwarfCMD.CMD_NOTIFY_STATE_ASTRO_TRACKING:
-            self._handle_tracking_state_notification(packet)
-        elif command_id == protocol_pb2.DwarfCMD.CMD_NOTIFY_SET_FEATURE_PARAM:
-            self._handle_feature_param_notification(packet)
-        elif command_id == protocol_pb2.DwarfCMD.CMD_NOTIFY_PROGRASS_CAPTURE_RAW_LIVE_STACKING:
-            self._handle_astro_capture_progress_notification(packet)
-        elif command_id == _CMD_NOTIFY_V3_EXPOSURE_PROGRESS:
-            self._handle_v3_exposure_progress_notification(packet)
-        elif command_id == _CMD_NOTIFY_V3_DEVICE_STATE:
-            self._handle_v3_device_state_notification(packet)
-        elif command_id == _CMD_NOTIFY_V3_CAMERA_PARAM_STATE:
-            self._handle_v3_camera_param_state_notification(packet)
-        elif command_id == _CMD_NOTIFY_V3_MODE_CHANGE:
-            self._handle_v3_mode_change_notification(packet)
-        elif command_id in {
-            protocol_pb2.DwarfCMD.CMD_V3_NOTIFY_AUTOFOCUS_STATE,
-            protocol_pb2.DwarfCMD.CMD_V3_NOTIFY_AUTOFOCUS_STATE_ALT,
-        }:
-            self._handle_v3_autofocus_state_notification(packet)
-        elif command_id == _CMD_NOTIFY_V3_TEMPERATURE2:
-            self._handle_v3_temperature2_notification(packet)
-        elif command_id == _CMD_NOTIFY_V3_OBSERVATION_STATE:
-            self._handle_v3_observation_state_notification(packet)
-        elif command_id == protocol_pb2.DwarfCMD.CMD_NOTIFY_ELE:
-            self._handle_battery_notification(packet)
+        if packet.module_id != _MODULE_NOTIFY:
+            return
+        handler = self._notify_dispatch.get(packet.cmd)
+        if handler is not None:
+            handler(packet)
 
     @staticmethod
     def _enum_name(enum_wrapper: Any, value: int) -> str:
@@ -1128,7 +1484,7 @@ class DwarfSession:
         except (KeyError, ValueError):
             return "UNKNOWN"
 
-    def _trace_calibration_notification(self, packet: Message) -> None:
+    def _trace_calibration_notification(self, packet: WsPacket) -> None:
         started = self._calibration_trace_started
         if started is None:
             return
@@ -1136,7 +1492,7 @@ class DwarfSession:
         module_id = int(getattr(packet, "module_id", 0))
         command_id = int(getattr(packet, "cmd", 0))
         packet_type = int(getattr(packet, "type", 0))
-        raw_data = bytes(getattr(packet, "data", b"") or b"")
+        raw_data = packet.data
         logged_data = raw_data[:512]
         logger.info(
             "dwarf.telescope.calibration.trace.notification",
@@ -1181,8 +1537,8 @@ class DwarfSession:
         self._calibration_trace_started = None
         self._calibration_trace_last_state = None
 
-    def _handle_calibration_state_notification(self, packet: Message) -> None:
-        raw_data = getattr(packet, "data", b"") or b""
+    def _handle_calibration_state_notification(self, packet: WsPacket) -> None:
+        raw_data = packet.data
         if not raw_data:
             logger.warning("dwarf.telescope.calibration.notification.empty", command_id=15210)
             return
@@ -1228,8 +1584,8 @@ class DwarfSession:
             payload_hex=raw_data.hex(),
         )
 
-    def _handle_calibration_result_notification(self, packet: Message) -> None:
-        raw_data = getattr(packet, "data", b"") or b""
+    def _handle_calibration_result_notification(self, packet: WsPacket) -> None:
+        raw_data = packet.data
         if not raw_data:
             logger.warning("dwarf.telescope.calibration.result.empty", command_id=15256)
             return
@@ -1263,8 +1619,8 @@ class DwarfSession:
         )
         self._finish_calibration_trace(outcome="successful")
 
-    def _handle_battery_notification(self, packet: Message) -> None:
-        raw_data = getattr(packet, "data", b"") or b""
+    def _handle_battery_notification(self, packet: WsPacket) -> None:
+        raw_data = packet.data
         if not raw_data:
             return
         value = _decode_com_res_with_int_value(raw_data)
@@ -1282,13 +1638,13 @@ class DwarfSession:
         state.battery_percent = percent
         state.last_battery_time = time.time()
 
-    def _handle_feature_param_notification(self, packet: Message) -> None:
+    def _handle_feature_param_notification(self, packet: WsPacket) -> None:
         # Feature-param notifications are not Mini filter-wheel readback.
         # App 3.4.1 carries the Mini filter only in the astronomy start request.
         return
 
-    def _handle_astro_capture_progress_notification(self, packet: Message) -> None:
-        raw_data = getattr(packet, "data", b"") or b""
+    def _handle_astro_capture_progress_notification(self, packet: WsPacket) -> None:
+        raw_data = packet.data
         if not raw_data:
             return
         message = ResNotifyProgressCaptureRawLiveStacking()
@@ -1343,14 +1699,14 @@ class DwarfSession:
         if completed and state.capture_id is not None:
             self._capture_frame_complete_event.set()
 
-    def _handle_v3_camera_param_state_notification(self, packet: Message) -> None:
+    def _handle_v3_camera_param_state_notification(self, packet: WsPacket) -> None:
         # Command 15264 reports general camera parameters. Treating parameter
         # 13 as a wheel position was an unverified inference and is incorrect
         # for the Mini Deep Sky filter selector.
         return
 
-    def _handle_v3_exposure_progress_notification(self, packet: Message) -> None:
-        raw_data = getattr(packet, "data", b"") or b""
+    def _handle_v3_exposure_progress_notification(self, packet: WsPacket) -> None:
+        raw_data = packet.data
         if not raw_data:
             return
         message = V3ResNotifyExposureProgress()
@@ -1367,8 +1723,8 @@ class DwarfSession:
         self._v3_exposure_progress = (elapsed, total)
         self._capture_start_evidence_event.set()
 
-    def _handle_v3_device_state_notification(self, packet: Message) -> None:
-        raw_data = getattr(packet, "data", b"") or b""
+    def _handle_v3_device_state_notification(self, packet: WsPacket) -> None:
+        raw_data = packet.data
         if not raw_data:
             return
         message = V3ResNotifyDeviceState()
@@ -1391,8 +1747,8 @@ class DwarfSession:
         self._v3_device_state_path = path_value or None
         self._capture_start_evidence_event.set()
 
-    def _handle_v3_mode_change_notification(self, packet: Message) -> None:
-        raw_data = getattr(packet, "data", b"") or b""
+    def _handle_v3_mode_change_notification(self, packet: WsPacket) -> None:
+        raw_data = packet.data
         if not raw_data:
             return
         message = V3ResNotifyModeChange()
@@ -1410,8 +1766,8 @@ class DwarfSession:
         self._v3_mode_change = (changing, mode, sub_mode)
         self._v3_device_state_mode = mode
 
-    def _handle_v3_autofocus_state_notification(self, packet: Message) -> None:
-        raw_data = getattr(packet, "data", b"") or b""
+    def _handle_v3_autofocus_state_notification(self, packet: WsPacket) -> None:
+        raw_data = packet.data
         if not raw_data:
             logger.warning("dwarf.focus.autofocus.notification.empty")
             return
@@ -1443,8 +1799,8 @@ class DwarfSession:
             payload_hex=raw_data.hex(),
         )
 
-    def _handle_v3_temperature2_notification(self, packet: Message) -> None:
-        raw_data = getattr(packet, "data", b"") or b""
+    def _handle_v3_temperature2_notification(self, packet: WsPacket) -> None:
+        raw_data = packet.data
         if not raw_data:
             return
         message = V3ResNotifyTemperature2()
@@ -1460,12 +1816,12 @@ class DwarfSession:
             self.camera_state.temperature_c = float(temp_raw)
         except (TypeError, ValueError):
             return
-        self.camera_state.last_temperature_time = time.time()
+        self.camera_state.last_temperature_time = time.monotonic()
         # V3 temperature2 notification does not include a response code.
         self.camera_state.last_temperature_code = protocol_pb2.OK
 
-    def _handle_v3_observation_state_notification(self, packet: Message) -> None:
-        raw_data = getattr(packet, "data", b"") or b""
+    def _handle_v3_observation_state_notification(self, packet: WsPacket) -> None:
+        raw_data = packet.data
         if not raw_data:
             return
         message = V3ResNotifyObservationState()
@@ -1480,11 +1836,11 @@ class DwarfSession:
             return
         self._capture_start_evidence_event.set()
 
-    def _handle_focus_notification(self, packet: Message) -> None:
-        raw_data = getattr(packet, "data", b"") or b""
+    def _handle_focus_notification(self, packet: WsPacket) -> None:
+        raw_data = packet.data
         if not raw_data:
             return
-        message = ResNotifyFocus()
+        message = self._focus_msg
         try:
             message.ParseFromString(raw_data)
         except Exception as exc:  # pragma: no cover - defensive logging
@@ -1496,20 +1852,22 @@ class DwarfSession:
         focus_value = getattr(message, "focus", None)
         if focus_value is None:
             return
-        position = max(0, min(int(focus_value), 20000))
+        position = int(focus_value)
+        position = position if position > 0 else 0
+        position = position if position < 20000 else 20000
         state = self.focuser_state
         if state.position != position:
             logger.info("dwarf.focus.notification", position=position)
         state.position = position
         state.connected = True
-        state.last_update = time.time()
+        state.last_update = time.monotonic()
         self._focus_update_event.set()
 
-    def _handle_temperature_notification(self, packet: Message) -> None:
-        raw_data = getattr(packet, "data", b"") or b""
+    def _handle_temperature_notification(self, packet: WsPacket) -> None:
+        raw_data = packet.data
         if not raw_data:
             return
-        message = ResNotifyTemperature()
+        message = self._temp_msg
         try:
             message.ParseFromString(raw_data)
         except Exception as exc:  # pragma: no cover - defensive logging
@@ -1527,7 +1885,7 @@ class DwarfSession:
         if state.temperature_c != temperature_c:
             logger.info("dwarf.temperature.notification", temperature=temperature_c)
         state.temperature_c = temperature_c
-        state.last_temperature_time = time.time()
+        state.last_temperature_time = time.monotonic()
         state.last_temperature_code = code
         if code not in (None, protocol_pb2.OK):
             logger.warning(
@@ -1536,12 +1894,12 @@ class DwarfSession:
                 temperature=temperature_c,
             )
 
-    def _handle_goto_state_notification(self, packet: Message) -> None:
+    def _handle_goto_state_notification(self, packet: WsPacket) -> None:
         if self.simulation:
             return
         if not self._goto_pending or self._last_goto_kind != _GOTO_KIND_DSO:
             return
-        raw_data = getattr(packet, "data", b"") or b""
+        raw_data = packet.data
         if not raw_data:
             return
         message = ResNotifyStateAstroGoto()
@@ -1574,8 +1932,8 @@ class DwarfSession:
         elif state == _AstroState.IDLE and self._goto_waiting_for_tracking:
             self._resolve_goto("failed", reason="goto_idle", keep_record=False)
 
-    def _handle_one_click_goto_state_notification(self, packet: Message) -> None:
-        raw_data = getattr(packet, "data", b"") or b""
+    def _handle_one_click_goto_state_notification(self, packet: WsPacket) -> None:
+        raw_data = packet.data
         if not raw_data:
             logger.warning("dwarf.goto.one_click.notification.empty", command_id=15233)
             return
@@ -1631,10 +1989,10 @@ class DwarfSession:
                 reason = f"one_click_tracking_running:{target_name}"
             self._resolve_goto("success", reason=reason, keep_record=True)
 
-    def _handle_tracking_state_notification(self, packet: Message) -> None:
+    def _handle_tracking_state_notification(self, packet: WsPacket) -> None:
         if self.simulation:
             return
-        raw_data = getattr(packet, "data", b"") or b""
+        raw_data = packet.data
         if not raw_data:
             return
         message = ResNotifyStateAstroTracking()
@@ -1680,75 +2038,59 @@ class DwarfSession:
                 reason = f"tracking_not_running:{target_name}"
             self._resolve_goto("failed", reason=reason, keep_record=False)
 
-    def _ensure_temperature_monitor_task(self) -> None:
-        task = self._temperature_task
-        if task and task.done():
-            with contextlib.suppress(asyncio.CancelledError, Exception):
-                task.result()
-            self._temperature_task = None
+    async def get_temperature(self) -> float | None:
+        """Return the cached sensor temperature, refreshing it in the background when stale.
 
-        if self.simulation:
-            return
-        if self.settings.temperature_refresh_interval_seconds <= 0:
-            return
-        if self._temperature_task is None:
-            self._temperature_task = asyncio.create_task(self._temperature_monitor_loop())
+        Alpaca clients poll temperature often, so a read never waits for the device;
+        a fresh reading lands in ``camera_state`` when its notification arrives.
+        """
 
-    async def _temperature_monitor_loop(self) -> None:
-        try:
-            while True:
-                interval = self.settings.temperature_refresh_interval_seconds
-                if interval <= 0:
-                    await asyncio.sleep(1.0)
-                    continue
-
-                if (
-                    not self.simulation
-                    and self._ws_client.connected
-                    and self.camera_state.connected
-                ):
-                    stale_after = self.settings.temperature_stale_after_seconds
-                    last_update = self.camera_state.last_temperature_time
-                    now = time.time()
-                    is_stale = last_update is None
-                    if not is_stale and stale_after > 0:
-                        is_stale = now - last_update >= stale_after
-
-                    if is_stale:
-                        try:
-                            await self._request_temperature_update()
-                        except asyncio.CancelledError:
-                            raise
-                        except Exception as exc:  # pragma: no cover - hardware dependent
-                            logger.debug("dwarf.temperature.refresh_failed", error=str(exc))
+        state = self.camera_state
+        if self.simulation or not state.connected or self._uses_v3_protocol():
+            return state.temperature_c
+        # Bound once per read; configure_session() swaps the whole Settings object.
+        settings = self.settings
+        interval = settings.temperature_refresh_interval_seconds
+        if interval <= 0:
+            return state.temperature_c
+        now = time.monotonic()
+        stale_after = settings.temperature_stale_after_seconds
+        last_update = state.last_temperature_time
+        if last_update is not None and (stale_after <= 0 or now - last_update < stale_after):
+            return state.temperature_c
+
+        task = self._temp_refresh_task
+        requested_at = self._temp_refresh_requested_at
+        # At most one request per refresh interval, however often clients poll.
+        if (task is None or task.done()) and (
+            requested_at is None or now - requested_at >= interval
+        ):
+            self._temp_refresh_requested_at = now
+            self._temp_refresh_task = asyncio.create_task(self._refresh_temperature())
+        return state.temperature_c
 
-                try:
-                    await asyncio.sleep(interval)
-                except asyncio.CancelledError:
-                    raise
+    async def _refresh_temperature(self) -> None:
+        try:
+            await self._request_temperature_update()
         except asyncio.CancelledError:
-            logger.debug("dwarf.temperature.monitor.cancelled")
             raise
+        except Exception as exc:  # pragma: no cover - hardware dependent
+            logger.debug("dwarf.temperature.refresh_failed", error=str(exc))
+        finally:
+            if self._temp_refresh_task is asyncio.current_task():
+                self._temp_refresh_task = None
 
     async def _request_temperature_update(self) -> None:
         if self._uses_v3_protocol():
             return
-        await self._ensure_ws()
+        if not (self._ws_client.connected and self._master_lock_acquired):
+            await self._ensure_ws()
         request = ReqGetSystemWorkingState()
-        expected_responses = {
-            (
-                protocol_pb2.ModuleId.MODULE_SYSTEM,
-                protocol_pb2.DwarfCMD.CMD_NOTIFY_WS_HOST_SLAVE_MODE,
-            ): ResNotifyHostSlaveMode,
-            (
-                protocol_pb2.ModuleId.MODULE_NOTIFY,
-                protocol_pb2.DwarfCMD.CMD_NOTIFY_WS_HOST_SLAVE_MODE,
-            ): ResNotifyHostSlaveMode,
-        }
+        expected_responses = _HOST_SLAVE_EXPECTED
         try:
             await self._send_command(
-                protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-                protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_GET_SYSTEM_WORKING_STATE,
+                _MODULE_CAMERA_TELE,
+                _CMD_CAMERA_TELE_GET_SYSTEM_WORKING_STATE,
                 request,
                 timeout=5.0,
                 expected_responses=expected_responses,
@@ -1764,83 +2106,61 @@ class DwarfSession:
         self,
         module_id: int,
         command_id: int,
-        request: Message,
+        request: Message | bytes,
         *,
         timeout: float = 10.0,
-        expected_responses: Optional[Dict[Tuple[int, int], Type[Message]]] = None,
+        expected_responses: Optional[Mapping[Tuple[int, int], Type[Message]]] = None,
         suppress_timeout_warning: bool = False,
         close_ws_on_timeout: bool = True,
     ) -> Message:
-        lock = self._get_ws_command_lock()
-        async with lock:
-            expected_summary = {
-                f"{mid}:{cid}": resp_cls.__name__
-                for (mid, cid), resp_cls in (expected_responses or {}).items()
-            }
-            logger.info(
-                "dwarf.ws.command.send_and_check",
-                module_id=module_id,
-                command_id=command_id,
-                timeout=timeout,
-                request_type=request.__class__.__name__,
-                request_payload=_message_to_log(request),
-                expected_responses=expected_summary,
-            )
-            try:
-                response = await send_and_check(
-                    self._ws_client,
-                    module_id,
-                    command_id,
-                    request,
-                    timeout=timeout,
-                    expected_responses=expected_responses,
-                )
-            except asyncio.TimeoutError as exc:
-                await self._handle_ws_timeout_with_options(
-                    module_id,
-                    command_id,
-                    exc,
-                    log_as_warning=not suppress_timeout_warning,
-                    close_ws=close_ws_on_timeout,
-                )
-                raise
-            logger.info(
-                "dwarf.ws.command.send_and_check.completed",
-                module_id=module_id,
-                command_id=command_id,
-            )
-            return response
+        response = await self._send_request(
+            module_id,
+            command_id,
+            request,
+            ComResponse,
+            timeout=timeout,
+            expected_responses=expected_responses,
+            suppress_timeout_warning=suppress_timeout_warning,
+            close_ws_on_timeout=close_ws_on_timeout,
+        )
+        code = getattr(response, "code", 0)
+        if code != 0:
+            raise DwarfCommandError(module_id, command_id, code)
+        return response
 
     async def _send_request(
         self,
         module_id: int,
         command_id: int,
-        request: Message,
+        request: Message | bytes,
         response_cls: Type[Message],
         *,
         timeout: float = 10.0,
-        expected_responses: Optional[Dict[Tuple[int, int], Type[Message]]] = None,
+        expected_responses: Optional[Mapping[Tuple[int, int], Type[Message]]] = None,
         suppress_timeout_warning: bool = False,
         close_ws_on_timeout: bool = True,
+        request_type: str | None = None,
     ) -> Message:
-        lock = self._get_ws_command_lock()
-        async with lock:
-            expected_summary = {
-                f"{mid}:{cid}": resp_cls.__name__
-                for (mid, cid), resp_cls in (expected_responses or {}).items()
-            }
-            logger.info(
+        raw = isinstance(request, bytes)
+        debug = _stdlib_logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            # The expected-response summary is only built when the event is emitted.
+            logger.debug(
                 "dwarf.ws.command.send",
                 module_id=module_id,
                 command_id=command_id,
                 timeout=timeout,
-                request_type=request.__class__.__name__,
-                request_payload=_message_to_log(request),
-                expected_responses=expected_summary,
+                request_type=request_type or request.__class__.__name__,
+                request_payload=None if raw else _LazyMsg(request),
+                expected_responses={
+                    f"{mid}:{cid}": resp_cls.__name__
+                    for (mid, cid), resp_cls in (expected_responses or {}).items()
+                },
                 expected_response_type=response_cls.__name__,
             )
-            try:
-                response = await self._ws_client.send_request(
+        try:
+            if raw:
+                response = await self._ws_client.send_raw_request(
                     module_id,
                     command_id,
                     request,
@@ -1848,24 +2168,34 @@ class DwarfSession:
                     timeout=timeout,
                     expected_responses=expected_responses,
                 )
-            except asyncio.TimeoutError as exc:
-                await self._handle_ws_timeout_with_options(
+            else:
+                response = await self._ws_client.send_request(
                     module_id,
                     command_id,
-                    exc,
-                    log_as_warning=not suppress_timeout_warning,
-                    close_ws=close_ws_on_timeout,
+                    request,
+                    response_cls,
+                    timeout=timeout,
+                    expected_responses=expected_responses,
                 )
-                raise
-            logger.info(
+        except asyncio.TimeoutError as exc:
+            await self._handle_ws_timeout_with_options(
+                module_id,
+                command_id,
+                exc,
+                log_as_warning=not suppress_timeout_warning,
+                close_ws=close_ws_on_timeout,
+            )
+            raise
+        if debug:
+            logger.debug(
                 "dwarf.ws.command.response",
                 module_id=module_id,
                 command_id=command_id,
                 response_type=response.__class__.__name__,
-                response_payload=_message_to_log(response),
+                response_payload=_LazyMsg(response),
                 response_code=getattr(response, "code", None),
             )
-            return response
+        return response
 
     async def _begin_request(
         self,
@@ -1876,22 +2206,20 @@ class DwarfSession:
     ) -> asyncio.Future[Message]:
         """Send a long-running request without blocking on its final response."""
 
-        lock = self._get_ws_command_lock()
-        async with lock:
-            logger.info(
-                "dwarf.ws.command.begin",
-                module_id=module_id,
-                command_id=command_id,
-                request_type=request.__class__.__name__,
-                request_payload=_message_to_log(request),
-                expected_response_type=response_cls.__name__,
-            )
-            return await self._ws_client.begin_request(
-                module_id,
-                command_id,
-                request,
-                response_cls,
-            )
+        logger.debug(
+            "dwarf.ws.command.begin",
+            module_id=module_id,
+            command_id=command_id,
+            request_type=request.__class__.__name__,
+            request_payload=_LazyMsg(request),
+            expected_response_type=response_cls.__name__,
+        )
+        return await self._ws_client.begin_request(
+            module_id,
+            command_id,
+            request,
+            response_cls,
+        )
 
     async def _send_command(
         self,
@@ -1900,7 +2228,7 @@ class DwarfSession:
         request: Message,
         *,
         timeout: float = 10.0,
-        expected_responses: Optional[Dict[Tuple[int, int], Type[Message]]] = None,
+        expected_responses: Optional[Mapping[Tuple[int, int], Type[Message]]] = None,
         suppress_timeout_warning: bool = False,
         close_ws_on_timeout: bool = True,
     ) -> Message:
@@ -1915,93 +2243,120 @@ class DwarfSession:
             close_ws_on_timeout=close_ws_on_timeout,
         )
 
+    async def _send_raw_command(
+        self,
+        module_id: int,
+        command_id: int,
+        payload: bytes,
+        *,
+        request_type: str,
+        timeout: float = 10.0,
+        expected_responses: Optional[Mapping[Tuple[int, int], Type[Message]]] = None,
+    ) -> Message:
+        """Send a pre-serialized request body, expecting a ``ComResponse``."""
+
+        return await self._send_request(
+            module_id,
+            command_id,
+            payload,
+            ComResponse,
+            timeout=timeout,
+            expected_responses=expected_responses,
+            request_type=request_type,
+        )
+
     async def _ensure_master_lock(self) -> None:
         if self.simulation or self._master_lock_acquired:
             return
-        async with self._master_lock_lock:
-            if self.simulation or self._master_lock_acquired:
-                return
-            if not self._ws_client.connected:
-                return
-            await self._bootstrap_ws()
-            request = ReqsetMasterLock()
-            request.lock = True
-            expected_responses = {
-                (
-                    protocol_pb2.ModuleId.MODULE_SYSTEM,
-                    protocol_pb2.DwarfCMD.CMD_NOTIFY_WS_HOST_SLAVE_MODE,
-                ): ResNotifyHostSlaveMode,
-                (
-                    protocol_pb2.ModuleId.MODULE_NOTIFY,
-                    protocol_pb2.DwarfCMD.CMD_NOTIFY_WS_HOST_SLAVE_MODE,
-                ): ResNotifyHostSlaveMode,
-            }
-            try:
-                response = await self._ws_client.send_request(
-                    protocol_pb2.ModuleId.MODULE_SYSTEM,
-                    protocol_pb2.DwarfCMD.CMD_SYSTEM_SET_MASTERLOCK,
-                    request,
-                    ComResponse,
-                    timeout=15.0,
-                    expected_responses=expected_responses,
-                )
+        # Devices racing through acquire() share one handshake instead of queuing on
+        # the lock and re-running the bootstrap checks one after another.
+        future = self._master_lock_future
+        if future is not None:
+            await asyncio.shield(future)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._master_lock_future = future
+        try:
+            async with self._master_lock_lock:
+                await self._acquire_master_lock()
+        finally:
+            self._master_lock_future = None
+            future.set_result(None)
 
-                if isinstance(response, ComResponse):
-                    if response.code != protocol_pb2.OK:
-                        raise DwarfCommandError(
-                            protocol_pb2.ModuleId.MODULE_SYSTEM,
-                            protocol_pb2.DwarfCMD.CMD_SYSTEM_SET_MASTERLOCK,
-                            response.code,
-                        )
+    async def _acquire_master_lock(self) -> None:
+        if self.simulation or self._master_lock_acquired:
+            return
+        if not self._ws_client.connected:
+            return
+        await self._bootstrap_ws()
+        request = ReqsetMasterLock(lock=True)
+        expected_responses = _HOST_SLAVE_EXPECTED
+        try:
+            response = await self._ws_client.send_request(
+                _MODULE_SYSTEM,
+                _CMD_SYSTEM_SET_MASTERLOCK,
+                request,
+                ComResponse,
+                timeout=15.0,
+                expected_responses=expected_responses,
+            )
+
+            if isinstance(response, ComResponse):
+                if response.code != protocol_pb2.OK:
+                    raise DwarfCommandError(
+                        _MODULE_SYSTEM,
+                        _CMD_SYSTEM_SET_MASTERLOCK,
+                        response.code,
+                    )
+                self._master_lock_acquired = True
+                logger.info(
+                    "dwarf.system.master_lock_acquired ip=%s",
+                    self.settings.dwarf_ap_ip,
+                )
+            elif isinstance(response, ResNotifyHostSlaveMode):
+                mode = getattr(response, "mode", None)
+                lock = bool(getattr(response, "lock", False))
+                if mode == 0 and lock:
                     self._master_lock_acquired = True
                     logger.info(
-                        "dwarf.system.master_lock_acquired ip=%s",
+                        "dwarf.system.master_lock_acquired ip=%s mode=%s lock=%s",
                         self.settings.dwarf_ap_ip,
+                        mode,
+                        lock,
                     )
-                elif isinstance(response, ResNotifyHostSlaveMode):
-                    mode = getattr(response, "mode", None)
-                    lock = bool(getattr(response, "lock", False))
-                    if mode == 0 and lock:
-                        self._master_lock_acquired = True
-                        logger.info(
-                            "dwarf.system.master_lock_acquired ip=%s mode=%s lock=%s",
-                            self.settings.dwarf_ap_ip,
-                            mode,
-                            lock,
-                        )
-                    else:
-                        logger.warning(
-                            "dwarf.system.master_lock_unlocked ip=%s mode=%s lock=%s",
-                            self.settings.dwarf_ap_ip,
-                            mode,
-                            lock,
-                        )
                 else:
                     logger.warning(
-                        "dwarf.system.master_lock_unhandled_response ip=%s response_type=%s",
+                        "dwarf.system.master_lock_unlocked ip=%s mode=%s lock=%s",
                         self.settings.dwarf_ap_ip,
-                        type(response).__name__,
+                        mode,
+                        lock,
                     )
-
-                if self._master_lock_acquired and self._uses_v3_protocol():
-                    await self._bootstrap_v3_state()
-            except DwarfCommandError as exc:  # pragma: no cover - hardware dependent
+            else:
                 logger.warning(
-                    "dwarf.system.master_lock_failed ip=%s code=%s",
+                    "dwarf.system.master_lock_unhandled_response ip=%s response_type=%s",
                     self.settings.dwarf_ap_ip,
-                    exc.code,
-                )
-            except Exception as exc:  # pragma: no cover - hardware dependent
-                logger.warning(
-                    "dwarf.system.master_lock_failed ip=%s error=%s error_type=%s error_repr=%r",
-                    self.settings.dwarf_ap_ip,
-                    exc,
-                    type(exc).__name__,
-                    exc,
+                    type(response).__name__,
                 )
 
-            if self._master_lock_acquired:
-                await self._sync_device_clock()
+            if self._master_lock_acquired and self._uses_v3_protocol():
+                await self._bootstrap_v3_state()
+        except DwarfCommandError as exc:  # pragma: no cover - hardware dependent
+            logger.warning(
+                "dwarf.system.master_lock_failed ip=%s code=%s",
+                self.settings.dwarf_ap_ip,
+                exc.code,
+            )
+        except Exception as exc:  # pragma: no cover - hardware dependent
+            logger.warning(
+                "dwarf.system.master_lock_failed ip=%s error=%s error_type=%s error_repr=%r",
+                self.settings.dwarf_ap_ip,
+                exc,
+                type(exc).__name__,
+                exc,
+            )
+
+        if self._master_lock_acquired:
+            await self._sync_device_clock()
 
     async def _release_master_lock(self) -> None:
         if self.simulation:
@@ -2024,23 +2379,13 @@ class DwarfSession:
                     self._master_lock_acquired = False
                     return
 
-            request = ReqsetMasterLock()
-            request.lock = False
-            expected_responses = {
-                (
-                    protocol_pb2.ModuleId.MODULE_SYSTEM,
-                    protocol_pb2.DwarfCMD.CMD_NOTIFY_WS_HOST_SLAVE_MODE,
-                ): ResNotifyHostSlaveMode,
-                (
-                    protocol_pb2.ModuleId.MODULE_NOTIFY,
-                    protocol_pb2.DwarfCMD.CMD_NOTIFY_WS_HOST_SLAVE_MODE,
-                ): ResNotifyHostSlaveMode,
-            }
+            request = ReqsetMasterLock(lock=False)
+            expected_responses = _HOST_SLAVE_EXPECTED
 
             try:
                 response = await self._ws_client.send_request(
-                    protocol_pb2.ModuleId.MODULE_SYSTEM,
-                    protocol_pb2.DwarfCMD.CMD_SYSTEM_SET_MASTERLOCK,
+                    _MODULE_SYSTEM,
+                    _CMD_SYSTEM_SET_MASTERLOCK,
                     request,
                     ComResponse,
                     timeout=10.0,
@@ -2098,16 +2443,14 @@ class DwarfSession:
             if timezone_label == self._last_time_sync_timezone:
                 return
 
-        request = ReqSetTime()
         timestamp_utc = math.floor(time.time())
-        request.timestamp = timestamp_utc
-        request.timezone_offset = timezone_offset
+        request = ReqSetTime(timestamp=timestamp_utc, timezone_offset=timezone_offset)
         local_timestamp = timestamp_utc + int(round(timezone_offset * 3600.0))
 
         try:
             await self._send_and_check(
-                protocol_pb2.ModuleId.MODULE_SYSTEM,
-                protocol_pb2.DwarfCMD.CMD_SYSTEM_SET_TIME,
+                _MODULE_SYSTEM,
+                _CMD_SYSTEM_SET_TIME,
                 request,
                 timeout=5.0,
             )
@@ -2129,12 +2472,11 @@ class DwarfSession:
             and "/" in timezone_label
             and timezone_label != self._last_time_sync_timezone
         ):
-            tz_request = ReqSetTimezone()
-            tz_request.timezone = timezone_label
+            tz_request = ReqSetTimezone(timezone=timezone_label)
             try:
                 await self._send_and_check(
-                    protocol_pb2.ModuleId.MODULE_SYSTEM,
-                    protocol_pb2.DwarfCMD.CMD_SYSTEM_SET_TIME_ZONE,
+                    _MODULE_SYSTEM,
+                    _CMD_SYSTEM_SET_TIME_ZONE,
                     tz_request,
                     timeout=5.0,
                 )
@@ -2207,16 +2549,10 @@ class DwarfSession:
 
     @staticmethod
     def _system_timezone_details() -> tuple[str | None, float]:
-        local_dt = datetime.now().astimezone()
-        offset = local_dt.utcoffset()
-        offset_hours = offset.total_seconds() / 3600.0 if offset else 0.0
-        tzinfo = local_dt.tzinfo
-        label: str | None = None
-        if tzinfo is not None:
-            candidate = getattr(tzinfo, "key", None) or getattr(tzinfo, "zone", None)
-            if isinstance(candidate, str) and "/" in candidate:
-                label = candidate.strip() or None
-        return label, offset_hours
+        # The host clock only exposes an abbreviation such as "CEST", never an IANA
+        # key, so the label is left for ``timezone_name`` to provide. The offset is
+        # read per call so DST transitions are picked up by long-running servers.
+        return None, time.localtime().tm_gmtoff / 3600.0
 
     @staticmethod
     def _format_timezone_label(offset_hours: float) -> str:
@@ -2235,13 +2571,15 @@ class DwarfSession:
             try:
                 await self._ensure_ws()
             except Exception:
-                self._refs[device] = max(0, self._refs[device] - 1)
+                self._refs[device] -= 1
                 raise
 
     async def release(self, device: str) -> None:
         async with self._lock:
-            self._refs[device] = max(0, self._refs[device] - 1)
+            if self._refs[device] > 0:
+                self._refs[device] -= 1
             if not self.simulation and all(count == 0 for count in self._refs.values()):
+                await self._stop_ws_keepalive_task()
                 await self._cancel_capture_protocol_tasks()
                 task = self._calibration_task
                 if task and not task.done():
@@ -2249,8 +2587,9 @@ class DwarfSession:
                     with contextlib.suppress(asyncio.CancelledError, Exception):
                         await task
                 self._calibration_task = None
+                # HTTP and FTP pools outlive device refs so the next acquire reuses
+                # their keep-alive connections; shutdown() closes them.
                 await self._ws_client.close()
-                await self._http_client.aclose()
                 self._master_lock_acquired = False
 
     async def shutdown(self) -> None:
@@ -2261,13 +2600,15 @@ class DwarfSession:
         self.camera_state.capture_task = None
 
         await self._cancel_capture_protocol_tasks()
+        await self._stop_ws_keepalive_task()
 
-        temperature_task = self._temperature_task
-        if temperature_task:
-            temperature_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await temperature_task
-            self._temperature_task = None
+        temp_task = self._temp_refresh_task
+        self._temp_refresh_task = None
+        if temp_task and not temp_task.done():
+            temp_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await temp_task
+        self._temp_refresh_requested_at = None
 
         task = self._calibration_task
         if task and not task.done():
@@ -2288,9 +2629,11 @@ class DwarfSession:
         if not self.simulation:
             await self._ws_client.close()
             await self._http_client.aclose()
+            await self._ftp_client.close()
 
         self._master_lock_acquired = False
         self._ws_bootstrapped = False
+        self._applied_feature_state.clear()
         for key in self._refs:
             self._refs[key] = 0
         self._last_calibration_time = None
@@ -2309,12 +2652,12 @@ class DwarfSession:
         cancel_pending = getattr(self._ws_client, "cancel_pending", None)
         if callable(cancel_pending):
             cancel_pending(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
-                protocol_pb2.DwarfCMD.CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
+                _MODULE_ASTRO,
+                _CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
             )
             cancel_pending(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
-                protocol_pb2.DwarfCMD.CMD_ASTRO_STOP_CAPTURE_RAW_LIVE_STACKING,
+                _MODULE_ASTRO,
+                _CMD_ASTRO_STOP_CAPTURE_RAW_LIVE_STACKING,
             )
 
     # --- Telescope -----------------------------------------------------------------
@@ -2346,16 +2689,26 @@ class DwarfSession:
         use_one_click_goto = (
             self.settings.auto_calibrate_on_slew and not self._has_recent_calibration()
         )
+        goto_payload: bytes | None = None
         if use_one_click_goto:
             await self._prepare_calibration_autofocus()
             await self._prepare_one_click_goto_mode()
+        else:
+            # Serialized once so a busy retry resends the same bytes.
+            goto_payload = ReqGotoDSO(
+                ra=ra_hours * 15.0,  # DWARF expects degrees
+                dec=dec_degrees,
+                target_name=target_name,
+            ).SerializeToString()
         try:
             if use_one_click_goto:
                 await self._start_one_click_goto_command(
                     ra_hours, dec_degrees, target_name
                 )
             else:
-                await self._start_goto_command(ra_hours, dec_degrees, target_name)
+                await self._start_goto_command(
+                    ra_hours, dec_degrees, target_name, payload=goto_payload
+                )
         except DwarfCommandError as exc:
             retryable_codes = {
                 protocol_pb2.CODE_ASTRO_FUNCTION_BUSY,
@@ -2378,9 +2731,17 @@ class DwarfSession:
                     ra_hours, dec_degrees, target_name
                 )
             else:
-                await self._start_goto_command(ra_hours, dec_degrees, target_name)
+                await self._start_goto_command(
+                    ra_hours, dec_degrees, target_name, payload=goto_payload
+                )
         return ra_hours, dec_degrees
 
+    @property
+    def _manual_axes_snapshot(self) -> dict[int, float]:
+        # Log-only view keyed by axis; built solely on paths that emit the event.
+        rates = self._manual_axis_rates
+        return {0: rates[0], 1: rates[1]}
+
     async def telescope_move_axis(self, axis: int, rate: float) -> None:
         if axis not in (0, 1):
             raise ValueError(f"Unsupported axis {axis}")
@@ -2388,21 +2749,23 @@ class DwarfSession:
         clamped_rate = max(min(rate, _MAX_JOYSTICK_SPEED), -_MAX_JOYSTICK_SPEED)
         manual_motion = abs(clamped_rate) >= 1e-6
         if self.simulation:
-            self._manual_axis_rates[axis] = 0.0 if abs(clamped_rate) < 1e-6 else clamped_rate
+            self._manual_axis_rates[axis] = clamped_rate if manual_motion else 0.0
             return
 
         if not manual_motion:
             await self.telescope_stop_axis(axis)
             return
 
-        await self._ensure_ws()
+        if not self._ws_ready:
+            await self._ensure_ws()
         self._manual_axis_rates[axis] = clamped_rate
-        logger.info(
-            "dwarf.telescope.moveaxis.command",
-            axis=axis,
-            rate=clamped_rate,
-            axes=dict(self._manual_axis_rates),
-        )
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "dwarf.telescope.moveaxis.command",
+                axis=axis,
+                rate=clamped_rate,
+                axes=self._manual_axes_snapshot,
+            )
         await self._send_manual_vector()
 
     async def telescope_stop_axis(self, axis: int, *, ensure_ws: bool = True) -> None:
@@ -2411,51 +2774,46 @@ class DwarfSession:
         if self.simulation:
             self._manual_axis_rates[axis] = 0.0
             return
-        if ensure_ws:
-            await self._ensure_ws()
-
-        if abs(self._manual_axis_rates.get(axis, 0.0)) < 1e-6 and not self._joystick_active:
+        # Nothing to send for an idle axis, so skip the websocket check entirely.
+        if abs(self._manual_axis_rates[axis]) < 1e-6 and not self._joystick_active:
             return
+        if ensure_ws and not self._ws_ready:
+            await self._ensure_ws()
 
         self._manual_axis_rates[axis] = 0.0
-        logger.info(
-            "dwarf.telescope.stopaxis.command",
-            axis=axis,
-            axes=dict(self._manual_axis_rates),
-        )
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "dwarf.telescope.stopaxis.command",
+                axis=axis,
+                axes=self._manual_axes_snapshot,
+            )
         await self._send_manual_vector()
 
     async def _send_manual_vector(self) -> None:
-        rate_x = self._manual_axis_rates[0] * self._axis_direction_polarity.get(0, 1)
-        rate_y = self._manual_axis_rates[1] * self._axis_direction_polarity.get(1, 1)
-        magnitude = math.hypot(rate_x, rate_y)
-
-        if magnitude < 1e-6:
+        rates = self._manual_axis_rates
+        polarity = self._axis_direction_polarity
+        vector = _joystick_vector(rates[0] * polarity[0], rates[1] * polarity[1])
+        if vector is None:
             if self._joystick_active:
                 await self._send_joystick_stop()
             return
 
-        speed = max(min(magnitude, _MAX_JOYSTICK_SPEED), _MIN_JOYSTICK_SPEED)
-        vector_length = min(1.0, magnitude / speed) if speed > 1e-6 else 0.0
-        angle = math.degrees(math.atan2(rate_y, rate_x))
-        if angle < 0.0:
-            angle += 360.0
-
-        request = ReqMotorServiceJoystick()
+        angle, vector_length, speed = vector
+        request = self._joystick_req
         request.vector_angle = angle
         request.vector_length = vector_length
         request.speed = speed
 
         try:
             await self._send_and_check(
-                protocol_pb2.ModuleId.MODULE_MOTOR,
-                protocol_pb2.DwarfCMD.CMD_STEP_MOTOR_SERVICE_JOYSTICK,
+                _MODULE_MOTOR,
+                _CMD_STEP_MOTOR_SERVICE_JOYSTICK,
                 request,
             )
         except DwarfCommandError as exc:
             logger.warning(
                 "dwarf.telescope.manual_vector.failed",
-                axes=dict(self._manual_axis_rates),
+                axes=self._manual_axes_snapshot,
                 vector_angle=angle,
                 vector_length=vector_length,
                 speed=speed,
@@ -2464,20 +2822,21 @@ class DwarfSession:
             raise
         else:
             self._joystick_active = True
-            logger.info(
-                "dwarf.telescope.manual_vector",
-                axes=dict(self._manual_axis_rates),
-                vector_angle=angle,
-                vector_length=vector_length,
-                speed=speed,
-            )
+            if _stdlib_logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "dwarf.telescope.manual_vector",
+                    axes=self._manual_axes_snapshot,
+                    vector_angle=angle,
+                    vector_length=vector_length,
+                    speed=speed,
+                )
 
     async def _send_joystick_stop(self) -> None:
-        request = ReqMotorServiceJoystickStop()
+        request = self._joystick_stop_req
         try:
             await self._send_and_check(
-                protocol_pb2.ModuleId.MODULE_MOTOR,
-                protocol_pb2.DwarfCMD.CMD_STEP_MOTOR_SERVICE_JOYSTICK_STOP,
+                _MODULE_MOTOR,
+                _CMD_STEP_MOTOR_SERVICE_JOYSTICK_STOP,
                 request,
             )
         except DwarfCommandError as exc:
@@ -2490,25 +2849,32 @@ class DwarfSession:
             self._joystick_active = False
             logger.info("dwarf.telescope.manual_vector.stopped")
 
-    async def _halt_manual_motion(self) -> None:
+    async def _halt_manual_motion(self, *, ensure_ws: bool = True) -> None:
         if self.simulation:
             return
-        await self._ensure_ws()
-        for axis in (0, 1):
-            with contextlib.suppress(Exception):
-                await self.telescope_stop_axis(axis, ensure_ws=False)
+        # Zero both axes together so the mount sees a single joystick stop rather
+        # than a one-axis vector followed by a stop.
+        rates = self._manual_axis_rates
+        rates[0] = rates[1] = 0.0
+        if not self._joystick_active:
+            return
+        if ensure_ws and not self._ws_ready:
+            await self._ensure_ws()
+        with contextlib.suppress(Exception):
+            await self._send_joystick_stop()
 
     def _record_goto(
         self, ra_hours: float, dec_degrees: float, *, kind: str = _GOTO_KIND_DSO
     ) -> None:
-        self._last_goto_time = time.time()
+        self._last_goto_time = time.monotonic()
         self._last_goto_target = (ra_hours, dec_degrees)
         self._last_goto_kind = kind
-        logger.debug(
-            "dwarf.telescope.goto_recorded",
-            ra_hours=ra_hours,
-            dec_degrees=dec_degrees,
-        )
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "dwarf.telescope.goto_recorded",
+                ra_hours=ra_hours,
+                dec_degrees=dec_degrees,
+            )
 
     def _drop_goto_record(self) -> None:
         self._last_goto_time = None
@@ -2524,7 +2890,7 @@ class DwarfSession:
         self._goto_result = None
         self._goto_reason = None
         self._goto_target_name = target_name or None
-        self._goto_start_time = time.time()
+        self._goto_start_time = time.monotonic()
         self._goto_completion_event.clear()
         logger.info(
             "dwarf.telescope.goto.pending",
@@ -2537,7 +2903,7 @@ class DwarfSession:
             return
         duration = None
         if self._goto_start_time is not None:
-            duration = time.time() - self._goto_start_time
+            duration = time.monotonic() - self._goto_start_time
         self._goto_pending = False
         self._goto_waiting_for_tracking = False
         self._one_click_goto_active = False
@@ -2545,7 +2911,7 @@ class DwarfSession:
         self._goto_reason = reason
         self._goto_start_time = None
         if keep_record:
-            self._last_goto_time = time.time()
+            self._last_goto_time = time.monotonic()
         else:
             self._drop_goto_record()
         self._goto_completion_event.set()
@@ -2567,11 +2933,12 @@ class DwarfSession:
     def _clear_goto(self, *, reason: str | None = None) -> None:
         if self._last_goto_time is None:
             return
-        logger.debug(
-            "dwarf.telescope.goto_cleared",
-            reason=reason,
-            last_target=self._last_goto_target,
-        )
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "dwarf.telescope.goto_cleared",
+                reason=reason,
+                last_target=self._last_goto_target,
+            )
         self._goto_completion_event.set()
         self._goto_pending = False
         self._goto_waiting_for_tracking = False
@@ -2584,7 +2951,7 @@ class DwarfSession:
             return True
         if self._last_goto_time is None:
             return False
-        return (time.time() - self._last_goto_time) <= max_age
+        return (time.monotonic() - self._last_goto_time) <= max_age
 
     def _has_recent_calibration(self) -> bool:
         max_age_value = self.settings.calibration_valid_seconds
@@ -2668,18 +3035,18 @@ class DwarfSession:
         request = ReqAstroAutoFocus(mode=1)
         logger.info("dwarf.focus.autofocus.before_calibration.starting", timeout=timeout)
         response = await self._send_and_check(
-            protocol_pb2.ModuleId.MODULE_FOCUS,
-            protocol_pb2.DwarfCMD.CMD_FOCUS_START_ASTRO_AUTO_FOCUS,
+            _MODULE_FOCUS,
+            _CMD_FOCUS_START_ASTRO_AUTO_FOCUS,
             request,
             timeout=timeout,
             expected_responses={
                 (
-                    protocol_pb2.ModuleId.MODULE_NOTIFY,
-                    protocol_pb2.DwarfCMD.CMD_V3_NOTIFY_AUTOFOCUS_STATE,
+                    _MODULE_NOTIFY,
+                    _CMD_V3_NOTIFY_AUTOFOCUS_STATE,
                 ): V3ResNotifyAutoFocusState,
                 (
-                    protocol_pb2.ModuleId.MODULE_NOTIFY,
-                    protocol_pb2.DwarfCMD.CMD_V3_NOTIFY_AUTOFOCUS_STATE_ALT,
+                    _MODULE_NOTIFY,
+                    _CMD_V3_NOTIFY_AUTOFOCUS_STATE_ALT,
                 ): V3ResNotifyAutoFocusState,
             },
         )
@@ -2703,13 +3070,13 @@ class DwarfSession:
             return False
         if self._calibration_autofocus_ip != self.settings.dwarf_ap_ip:
             return False
-        return (time.time() - self._calibration_autofocus_time) <= 300.0
+        return (time.monotonic() - self._calibration_autofocus_time) <= 300.0
 
     async def _prepare_calibration_autofocus(self) -> tuple[float, float]:
         latitude, longitude = self._require_observer_location()
         if not self._has_recent_calibration_autofocus():
             await self._autofocus_before_calibration()
-            self._calibration_autofocus_time = time.time()
+            self._calibration_autofocus_time = time.monotonic()
             self._calibration_autofocus_ip = self.settings.dwarf_ap_ip
         self._calibration_status = "awaiting target"
         self._calibration_detail = "Calibration will run with the next GoTo target"
@@ -2747,14 +3114,14 @@ class DwarfSession:
 
         open_tele = V3ReqOpenTeleCamera(action=1)
         await self._send_and_check(
-            protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
+            _MODULE_CAMERA_TELE,
             10050,
             open_tele,
             timeout=8.0,
         )
         open_wide = V3ReqOpenWideCamera(action=1)
         await self._send_and_check(
-            protocol_pb2.ModuleId.MODULE_CAMERA_WIDE,
+            _MODULE_CAMERA_WIDE,
             12036,
             open_wide,
             timeout=8.0,
@@ -2808,14 +3175,14 @@ class DwarfSession:
             deadline = time.monotonic() + timeout
             try:
                 response = await self._send_and_check(
-                    protocol_pb2.ModuleId.MODULE_ASTRO,
-                    protocol_pb2.DwarfCMD.CMD_ASTRO_START_CALIBRATION,
+                    _MODULE_ASTRO,
+                    _CMD_ASTRO_START_CALIBRATION,
                     request,
                     timeout=timeout,
                     expected_responses={
                         (
-                            protocol_pb2.ModuleId.MODULE_NOTIFY,
-                            protocol_pb2.DwarfCMD.CMD_NOTIFY_CALIBRATION_RESULT,
+                            _MODULE_NOTIFY,
+                            _CMD_NOTIFY_CALIBRATION_RESULT,
                         ): CalibrationResult,
                     },
                 )
@@ -2869,16 +3236,22 @@ class DwarfSession:
         ra_hours: float,
         dec_degrees: float,
         target_name: str,
+        *,
+        payload: bytes | None = None,
     ) -> None:
-        request = ReqGotoDSO()
-        request.ra = ra_hours * 15.0  # DWARF expects degrees
-        request.dec = dec_degrees
-        request.target_name = target_name
+        request: Message | bytes
+        if payload is not None:
+            request = payload
+        else:
+            request = ReqGotoDSO()
+            request.ra = ra_hours * 15.0  # DWARF expects degrees
+            request.dec = dec_degrees
+            request.target_name = target_name
         timeout_value = max(float(self.settings.goto_command_timeout_seconds), 1.0)
         try:
             await self._send_and_check(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
-                protocol_pb2.DwarfCMD.CMD_ASTRO_START_GOTO_DSO,
+                _MODULE_ASTRO,
+                _CMD_ASTRO_START_GOTO_DSO,
                 request,
                 timeout=timeout_value,
             )
@@ -2930,8 +3303,8 @@ class DwarfSession:
         )
         try:
             response_future = await self._begin_request(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
-                protocol_pb2.DwarfCMD.CMD_ASTRO_START_ONE_CLICK_GOTO_DSO,
+                _MODULE_ASTRO,
+                _CMD_ASTRO_START_ONE_CLICK_GOTO_DSO,
                 request,
                 astro_pb2.ResOneClickGoto,
             )
@@ -2974,8 +3347,8 @@ class DwarfSession:
             )
             if code != protocol_pb2.OK and self._one_click_goto_active:
                 error = DwarfCommandError(
-                    protocol_pb2.ModuleId.MODULE_ASTRO,
-                    protocol_pb2.DwarfCMD.CMD_ASTRO_START_ONE_CLICK_GOTO_DSO,
+                    _MODULE_ASTRO,
+                    _CMD_ASTRO_START_ONE_CLICK_GOTO_DSO,
                     code,
                 )
                 self._calibration_status = "failed"
@@ -2988,8 +3361,8 @@ class DwarfSession:
             raise
         except asyncio.TimeoutError as exc:
             self._ws_client.cancel_pending(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
-                protocol_pb2.DwarfCMD.CMD_ASTRO_START_ONE_CLICK_GOTO_DSO,
+                _MODULE_ASTRO,
+                _CMD_ASTRO_START_ONE_CLICK_GOTO_DSO,
             )
             if self._one_click_goto_active:
                 self._calibration_status = "not confirmed"
@@ -3041,28 +3414,27 @@ class DwarfSession:
                 task.cancel()
             self._one_click_response_task = None
             self._ws_client.cancel_pending(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
-                protocol_pb2.DwarfCMD.CMD_ASTRO_START_ONE_CLICK_GOTO_DSO,
+                _MODULE_ASTRO,
+                _CMD_ASTRO_START_ONE_CLICK_GOTO_DSO,
             )
         self._cancel_goto("aborted", reason="slew_aborted")
         if self.simulation:
             return
-        await self._ensure_ws()
+        if not self._ws_ready:
+            await self._ensure_ws()
         request = (
             astro_pb2.ReqStopOneClickGoto() if one_click else ReqStopGoto()
         )
         await self._send_and_check(
-            protocol_pb2.ModuleId.MODULE_ASTRO,
+            _MODULE_ASTRO,
             (
-                protocol_pb2.DwarfCMD.CMD_ASTRO_STOP_ONE_CLICK_GOTO
+                _CMD_ASTRO_STOP_ONE_CLICK_GOTO
                 if one_click
-                else protocol_pb2.DwarfCMD.CMD_ASTRO_STOP_GOTO
+                else _CMD_ASTRO_STOP_GOTO
             ),
             request,
         )
-        for axis in (0, 1):
-            with contextlib.suppress(Exception):
-                await self.telescope_stop_axis(axis, ensure_ws=False)
+        await self._halt_manual_motion(ensure_ws=False)
 
     # --- Camera --------------------------------------------------------------------
 
@@ -3075,7 +3447,7 @@ class DwarfSession:
             request = V3ReqOpenTeleCamera()
             request.action = 1
             await self._send_and_check(
-                protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
+                _MODULE_CAMERA_TELE,
                 10050,
                 request,
             )
@@ -3086,8 +3458,8 @@ class DwarfSession:
         request.binning = False
         request.rtsp_encode_type = 0
         await self._send_and_check(
-            protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-            protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_OPEN_CAMERA,
+            _MODULE_CAMERA_TELE,
+            _CMD_CAMERA_TELE_OPEN_CAMERA,
             request,
         )
         self.camera_state.connected = True
@@ -3109,7 +3481,7 @@ class DwarfSession:
             timeout_value = max(float(self.settings.camera_disconnect_timeout_seconds), 0.5)
             try:
                 await self._send_and_check(
-                    protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
+                    _MODULE_CAMERA_TELE,
                     10050,
                     request,
                     timeout=timeout_value,
@@ -3144,8 +3516,8 @@ class DwarfSession:
         timeout_value = max(float(self.settings.camera_disconnect_timeout_seconds), 0.5)
         try:
             await self._send_and_check(
-                protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-                protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_CLOSE_CAMERA,
+                _MODULE_CAMERA_TELE,
+                _CMD_CAMERA_TELE_CLOSE_CAMERA,
                 request,
                 timeout=timeout_value,
             )
@@ -3335,7 +3707,11 @@ class DwarfSession:
                 duration=duration,
                 light=light,
                 goto_valid_seconds=self.settings.goto_valid_seconds,
-                last_goto_time=self._last_goto_time,
+                last_goto_age=(
+                    None
+                    if self._last_goto_time is None
+                    else time.monotonic() - self._last_goto_time
+                ),
                 last_goto_target=self._last_goto_target,
                 ignored=True,
             )
@@ -3367,17 +3743,20 @@ class DwarfSession:
             state.capture_id = None
             state.capture_phase = CapturePhase.FAILED
             state.start_time = None
+            self._dark_check_ok_until = 0.0
             raise
         except asyncio.TimeoutError:
             state.last_error = "timeout"
             state.capture_id = None
             state.capture_phase = CapturePhase.FAILED
             state.start_time = None
+            self._dark_check_ok_until = 0.0
             raise
         except Exception:
             state.capture_id = None
             state.capture_phase = CapturePhase.FAILED
             state.start_time = None
+            self._dark_check_ok_until = 0.0
             raise
 
         if state.capture_id != capture_id or state.capture_phase != CapturePhase.STARTING:
@@ -3440,8 +3819,8 @@ class DwarfSession:
         request = V3ReqGetAstroParams()
         request.mode = 0
         response = await self._send_request(
-            protocol_pb2.ModuleId.MODULE_ASTRO,
-            protocol_pb2.DwarfCMD.CMD_V3_ASTRO_GET_PARAMS,
+            _MODULE_ASTRO,
+            _CMD_V3_ASTRO_GET_PARAMS,
             request,
             V3ResGetAstroParams,
             timeout=8.0,
@@ -3604,7 +3983,7 @@ class DwarfSession:
             await self._resolve_v3_astro_controls(duration, gain)
         )
         expected = {
-            (protocol_pb2.ModuleId.MODULE_NOTIFY, protocol_pb2.DwarfCMD.CMD_V3_NOTIFY_CAMERA_PARAM_STATE):
+            (_MODULE_NOTIFY, _CMD_V3_NOTIFY_CAMERA_PARAM_STATE):
                 V3ResNotifyCameraParamState
         }
         exp_request = V3ReqSetCameraParam()
@@ -3707,7 +4086,6 @@ class DwarfSession:
             self._params_config = None
             return None
         self._params_config = payload
-        self._filter_options = None
         self._gain_support_param = None
         self._gain_value_options = None
         self._gain_manual_mode_supported = None
@@ -3727,44 +4105,36 @@ class DwarfSession:
         self._exposure_resolver = resolver
         return resolver
 
+    def _feature_params(self) -> _FeatureParamIndex:
+        config = self._params_config
+        ws_params = self._ws_feature_params
+        index = self._feature_param_index
+        if (
+            index is None
+            or index.params_config is not config
+            or index.ws_feature_params is not ws_params
+        ):
+            index = _FeatureParamIndex.build(config, ws_params)
+            self._feature_param_index = index
+        return index
+
     def _find_feature_param(self, name: str) -> dict[str, Any] | None:
         needle = name.strip().lower()
         if not needle:
             return None
-        for entry in self._iter_feature_params():
-            entry_name = str(entry.get("name", "")).strip().lower()
-            if entry_name == needle:
-                return entry
-        return None
+        return self._feature_params().features_by_name.get(needle)
 
     def _find_feature_param_contains(self, substring: str) -> dict[str, Any] | None:
         haystack = substring.strip().lower()
         if not haystack:
             return None
-        for entry in self._iter_feature_params():
-            entry_name = str(entry.get("name", "")).strip().lower()
+        for entry_name, entry in self._feature_params().features:
             if haystack in entry_name:
                 return entry
         return None
 
-    def _iter_feature_params(self) -> Iterator[dict[str, Any]]:
-        if not self._params_config:
-            params = []
-        else:
-            data = self._params_config.get("data")
-            if not isinstance(data, dict):
-                params = []
-            else:
-                params = data.get("featureParams")
-                if not isinstance(params, list):
-                    params = []
-        for entry in params:
-            if isinstance(entry, dict):
-                yield entry
-        ws_params = self._ws_feature_params or []
-        for entry in ws_params:
-            if isinstance(entry, dict):
-                yield entry
+    def _feature_param_entries(self) -> tuple[dict[str, Any], ...]:
+        return self._feature_params().entries
 
     @staticmethod
     def _common_param_to_dict(param: Message) -> dict[str, Any]:
@@ -3787,8 +4157,8 @@ class DwarfSession:
             await self._ensure_ws()
             request = ReqGetAllFeatureParams()
             response = await self._send_request(
-                protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-                protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_GET_ALL_FEATURE_PARAMS,
+                _MODULE_CAMERA_TELE,
+                _CMD_CAMERA_TELE_GET_ALL_FEATURE_PARAMS,
                 request,
                 ResGetAllFeatureParams,
                 timeout=8.0,
@@ -3824,43 +4194,16 @@ class DwarfSession:
             filter_value=self._ws_v3_filter_value,
         )
 
-    @staticmethod
-    def _tele_param_expected_responses() -> Dict[Tuple[int, int], Type[Message]]:
-        return {
-            (
-                protocol_pb2.ModuleId.MODULE_NOTIFY,
-                protocol_pb2.DwarfCMD.CMD_NOTIFY_TELE_SET_PARAM,
-            ): ResNotifyParam,
-        }
-
-    def _iter_camera_support_params(
+    def _camera_support_params(
         self,
         *,
         camera_name: str | None = None,
-    ) -> Iterator[tuple[str, dict[str, Any]]]:
-        if not self._params_config:
-            return
-        data = self._params_config.get("data")
-        if not isinstance(data, dict):
-            return
-        cameras = data.get("cameras")
-        if not isinstance(cameras, list):
-            return
-        name_filter = camera_name.strip().lower() if camera_name else None
-        for camera in cameras:
-            if not isinstance(camera, dict):
-                continue
-            raw_name = str(camera.get("name", ""))
-            resolved_name = raw_name.strip()
-            lowered = resolved_name.lower()
-            if name_filter and lowered != name_filter:
-                continue
-            params = camera.get("supportParams")
-            if not isinstance(params, list):
-                continue
-            for param in params:
-                if isinstance(param, dict):
-                    yield resolved_name, param
+    ) -> tuple[tuple[str, str, dict[str, Any]], ...]:
+        """Return ``(camera_name, lowered_param_name, param)`` rows for support params."""
+        index = self._feature_params()
+        if not camera_name:
+            return index.support_params
+        return index.support_by_camera.get(camera_name.strip().lower(), ())
 
     def _find_support_param_contains(
         self,
@@ -3871,9 +4214,8 @@ class DwarfSession:
         needle = substring.strip().lower()
         if not needle:
             return None
-        for _, param in self._iter_camera_support_params(camera_name=camera_name):
-            name = str(param.get("name", "")).strip().lower()
-            if needle in name:
+        for _, param_name, param in self._camera_support_params(camera_name=camera_name):
+            if needle in param_name:
                 return param
         return None
 
@@ -3927,8 +4269,9 @@ class DwarfSession:
     @staticmethod
     def _extract_feature_options(
         feature: dict[str, Any],
-    ) -> list[tuple[int | None, int, str, float | None]]:
-        options: list[tuple[int | None, int, str, float | None]] = []
+    ) -> list[_FeatureOption]:
+        """Return every selectable option found anywhere under ``feature``."""
+        options: list[_FeatureOption] = []
 
         def _coerce_float(value: Any) -> float | None:
             if isinstance(value, (int, float)):
@@ -3940,66 +4283,94 @@ class DwarfSession:
                     return None
             return None
 
-        def _walk(node: Any, mode_index: int | None) -> None:
+        # Each child's type is checked exactly once, by the loop that finds it;
+        # the walkers themselves trust the container type they are handed.
+        def _walk_values(values: Any, mode_index: int | None) -> None:
+            for value in values:
+                if isinstance(value, dict):
+                    _walk_dict(value, mode_index)
+                elif isinstance(value, list):
+                    _walk_values(value, mode_index)
+
+        def _walk_dict(node: dict[str, Any], mode_index: int | None) -> None:
             current_mode = mode_index
-            if isinstance(node, dict):
-                if "modeIndex" in node:
-                    try:
-                        current_mode = int(node["modeIndex"])
-                    except (TypeError, ValueError):
-                        current_mode = mode_index
-                has_index = "index" in node and "name" in node
-                if has_index:
-                    try:
-                        index_value = int(node["index"])
-                    except (TypeError, ValueError):
-                        index_value = None
-                    if index_value is not None:
-                        label = str(node.get("name", ""))
-                        continue_raw = (
-                            node.get("continueValue")
-                            if "continueValue" in node
-                            else node.get("value")
+            if "modeIndex" in node:
+                try:
+                    current_mode = int(node["modeIndex"])
+                except (TypeError, ValueError):
+                    current_mode = mode_index
+            if "index" in node and "name" in node:
+                try:
+                    index_value = int(node["index"])
+                except (TypeError, ValueError):
+                    index_value = None
+                if index_value is not None:
+                    label = str(node.get("name", ""))
+                    continue_raw = (
+                        node.get("continueValue")
+                        if "continueValue" in node
+                        else node.get("value")
+                    )
+                    continue_value = _coerce_float(continue_raw)
+                    options.append(
+                        _FeatureOption(
+                            current_mode,
+                            index_value,
+                            label,
+                            label.strip().lower(),
+                            continue_value,
                         )
-                        continue_value = _coerce_float(continue_raw)
-                        options.append((current_mode, index_value, label, continue_value))
-                for value in node.values():
-                    if isinstance(value, (dict, list)):
-                        _walk(value, current_mode)
-            elif isinstance(node, list):
-                for item in node:
-                    if isinstance(item, (dict, list)):
-                        _walk(item, mode_index)
-
-        _walk(feature, None)
+                    )
+            _walk_values(node.values(), current_mode)
+
+        _walk_dict(feature, None)
+        return options
+
+    def _feature_options(
+        self,
+        feature: dict[str, Any],
+    ) -> tuple[_FeatureOption, ...]:
+        """Return memoized ``_extract_feature_options`` rows for the current config."""
+        cache = self._feature_params().feature_options
+        cached = cache.get(id(feature))
+        if cached is not None and cached[0] is feature:
+            return cached[1]
+        options = tuple(self._extract_feature_options(feature))
+        cache[id(feature)] = (feature, options)
         return options
 
     def _find_feature_option_by_label(
         self,
         label_substring: str,
-    ) -> tuple[dict[str, Any], tuple[int | None, int, str, float | None]] | None:
+    ) -> tuple[dict[str, Any], _FeatureOption] | None:
         needle = label_substring.strip().lower()
         if not needle:
             return None
-        for feature in self._iter_feature_params():
-            options = self._extract_feature_options(feature)
-            for option in options:
-                _, _, label, _ = option
-                if needle in label.strip().lower():
+        for feature in self._feature_param_entries():
+            for option in self._feature_options(feature):
+                if needle in option.label_lower:
                     return feature, option
         return None
 
     def _list_feature_names(self) -> list[str]:
         names: list[str] = []
-        for feature in self._iter_feature_params():
+        for feature in self._feature_param_entries():
             name = feature.get("name")
             if isinstance(name, str):
                 names.append(name)
         return names
 
     async def _get_filter_options(self) -> list[FilterOption]:
-        if self._filter_options is not None:
-            return self._filter_options
+        options = self._filter_options
+        if options is not None and self._filter_options_config is self._params_config:
+            return options
+        options = await self._resolve_filter_options()
+        # Keyed on the params config object itself: a refetch or reconfigure replaces
+        # it, which invalidates the cached list without an explicit reset.
+        self._filter_options_config = self._params_config
+        return options
+
+    async def _resolve_filter_options(self) -> list[FilterOption]:
         fallback_labels = self._fallback_filter_labels()
         if self.profile.filters.control_path == "astro-start-ir-index":
             # V3 applies the physical filter as part of the astronomy-start request,
@@ -4085,18 +4456,12 @@ class DwarfSession:
             continue_value: float | None,
         ) -> None:
             resolved = self._normalize_filter_label(label, index)
-            key = resolved.strip().lower()
+            # Canonical labels carry no surrounding whitespace, so lowering is enough.
+            key = resolved.lower()
             if key in seen:
                 return
             seen.add(key)
             param_dict: dict[str, Any] | None = parameter if isinstance(parameter, dict) else None
-            has_id = False
-            if param_dict is not None:
-                try:
-                    _ = param_dict.get("id")
-                    has_id = _ is not None
-                except AttributeError:
-                    param_dict = None
             options.append(
                 FilterOption(
                     parameter=param_dict,
@@ -4104,13 +4469,13 @@ class DwarfSession:
                     index=index,
                     label=resolved,
                     continue_value=continue_value,
-                    controllable=has_id,
+                    controllable=param_dict is not None and param_dict.get("id") is not None,
+                    is_ir_cut=param_dict is not None and _is_ir_cut_parameter(param_dict),
                 )
             )
 
         filter_keywords = ("filter", "ir cut", "ir-cut")
-        for _, param in self._iter_camera_support_params(camera_name="tele"):
-            name = str(param.get("name", "")).strip().lower()
+        for _, name, param in self._camera_support_params(camera_name="tele"):
             if not any(keyword in name for keyword in filter_keywords):
                 continue
             for mode_index, index, label, continue_value in self._extract_support_param_options(
@@ -4119,18 +4484,15 @@ class DwarfSession:
                 _add_option(param, mode_index, index, label, continue_value)
 
         if not options:
-            for feature in self._iter_feature_params():
-                feature_name = str(feature.get("name", "")).strip().lower()
+            for feature_name, feature in self._feature_params().features:
                 if "filter" not in feature_name:
                     continue
-                for mode_index, index, label, continue_value in self._extract_feature_options(
-                    feature
-                ):
+                for mode_index, index, label, _, continue_value in self._feature_options(feature):
                     _add_option(feature, mode_index, index, label, continue_value)
 
         if not options and self._is_dwarf_mini():
             # Mini firmware can expose filter-like options under non-filter parameter names.
-            for _, param in self._iter_camera_support_params(camera_name="tele"):
+            for _, _, param in self._camera_support_params(camera_name="tele"):
                 extracted = self._extract_support_param_options(param)
                 labels = [label for _, _, label, _ in extracted]
                 if not self._looks_like_filter_option_set(labels):
@@ -4138,20 +4500,21 @@ class DwarfSession:
                 for mode_index, index, label, continue_value in extracted:
                     _add_option(param, mode_index, index, label, continue_value)
             if not options:
-                for feature in self._iter_feature_params():
-                    extracted = self._extract_feature_options(feature)
-                    labels = [label for _, _, label, _ in extracted]
+                for feature in self._feature_param_entries():
+                    extracted = self._feature_options(feature)
+                    labels = [option.label for option in extracted]
                     if not self._looks_like_filter_option_set(labels):
                         continue
-                    for mode_index, index, label, continue_value in extracted:
+                    for mode_index, index, label, _, continue_value in extracted:
                         _add_option(feature, mode_index, index, label, continue_value)
 
         if not options:
             fallback = self._find_feature_option_by_label("filter")
             if fallback is not None:
                 feature, option = fallback
-                mode_index, index, label, continue_value = option
-                _add_option(feature, mode_index, index, label, continue_value)
+                _add_option(
+                    feature, option.mode_index, option.index, option.label, option.continue_value
+                )
 
         if not options and self._is_dwarf_mini():
             await self._ensure_ws_feature_params()
@@ -4202,6 +4565,17 @@ class DwarfSession:
             self._filter_options = self._canonicalize_mini_filter_options(options)
         return self._filter_options
 
+    def _filter_positions_by_label(self, options: list[FilterOption]) -> dict[str, int]:
+        """Map each lowercased option label to its first position in ``options``."""
+        cached = self._filter_label_positions
+        if cached is not None and cached[0] is options:
+            return cached[1]
+        positions: dict[str, int] = {}
+        for position, option in enumerate(options):
+            positions.setdefault(option.label.lower(), position)
+        self._filter_label_positions = (options, positions)
+        return positions
+
     async def get_filter_labels(self) -> list[str]:
         options = await self._get_filter_options()
         return [option.label for option in options]
@@ -4276,27 +4650,14 @@ class DwarfSession:
             )
             return
 
-        param_id_raw = None
-        try:
-            param_id_raw = option.parameter.get("id")
-            param_name = str(option.parameter.get("name", ""))
-        except AttributeError:
-            param_id_raw = None
-            param_name = ""
-        try:
-            param_id = int(param_id_raw) if param_id_raw is not None else None
-        except (TypeError, ValueError):
-            param_id = None
-        is_ir_cut = param_id == 8 or "ir cut" in param_name.strip().lower()
-
-        if is_ir_cut:
+        if option.is_ir_cut:
             await self._set_ir_cut(value=option.index)
         else:
             await self._set_feature_param(
                 option.parameter,
                 mode_index=option.mode_index,
                 index=option.index,
-                continue_value=option.continue_value if option.continue_value is not None else 0.0,
+                continue_value=option.continue_value or 0.0,
                 strict=True,
             )
         state.filter_name = option.label
@@ -4317,10 +4678,10 @@ class DwarfSession:
         request = ReqSetIrCut()
         request.value = int(value)
         await self._send_and_check(
-            protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-            protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_SET_IRCUT,
+            _MODULE_CAMERA_TELE,
+            _CMD_CAMERA_TELE_SET_IRCUT,
             request,
-            expected_responses=self._tele_param_expected_responses(),
+            expected_responses=_TELE_PARAM_EXPECTED,
         )
 
     async def _set_v3_camera_param(self, *, param_id: int, value: int, flag: int = 0) -> None:
@@ -4328,12 +4689,12 @@ class DwarfSession:
             return
         expected = {
             (
-                protocol_pb2.ModuleId.MODULE_NOTIFY,
+                _MODULE_NOTIFY,
                 _CMD_NOTIFY_V3_CAMERA_PARAM_STATE,
             ): V3ResNotifyCameraParamState,
             (
-                protocol_pb2.ModuleId.MODULE_NOTIFY,
-                protocol_pb2.DwarfCMD.CMD_NOTIFY_SET_FEATURE_PARAM,
+                _MODULE_NOTIFY,
+                _CMD_NOTIFY_SET_FEATURE_PARAM,
             ): ResNotifyParam,
         }
 
@@ -4435,6 +4796,7 @@ class DwarfSession:
         )
 
     async def set_filter_position(self, position: int) -> str:
+        self._last_applied_filter_signature = None
         async with self._get_filter_change_lock():
             options = await self._get_filter_options()
             if position < 0 or position >= len(options):
@@ -4467,21 +4829,15 @@ class DwarfSession:
             return
 
         target_lower = target.lower()
+        positions = self._filter_positions_by_label(options)
         if state.filter_name:
             current_lower = state.filter_name.strip().lower()
             if target_lower in current_lower:
                 if state.filter_index is None:
-                    for idx, option in enumerate(options):
-                        if option.label.lower() == current_lower:
-                            state.filter_index = idx
-                            break
+                    state.filter_index = positions.get(current_lower)
                 return
 
-        selected_index: int | None = None
-        for idx, option in enumerate(options):
-            if option.label.lower() == target_lower:
-                selected_index = idx
-                break
+        selected_index = positions.get(target_lower)
         if selected_index is None:
             for idx, option in enumerate(options):
                 if target_lower in option.label.lower():
@@ -4520,6 +4876,17 @@ class DwarfSession:
 
     async def _ensure_selected_filter(self) -> None:
         state = self.camera_state
+        if (
+            state.filter_index is not None
+            and (state.filter_index, state.filter_name) == self._last_applied_filter_signature
+            and self._filter_options_config is self._params_config
+            and self.profile.filters.control_path != "v3-camera-param"
+        ):
+            # Nothing changed since the last confirmed selection and the filter
+            # options it was checked against are still current.
+            state.applied_filter_name = state.filter_name
+            return
+        self._last_applied_filter_signature = None
         index = state.filter_index
         if index is None:
             await self._ensure_default_filter()
@@ -4550,37 +4917,50 @@ class DwarfSession:
                 f"Selected filter {option.label!r} cannot be controlled on this firmware"
             )
 
-        current_label = (state.filter_name or "").strip().lower()
-        desired_label = option.label.strip().lower()
-        if (
-            current_label == desired_label
-            and state.filter_name
-            and self.profile.filters.control_path != "v3-camera-param"
-        ):
-            state.applied_filter_name = state.filter_name
-            return
+        # Held against set_filter_position so a filter change arriving mid-capture
+        # cannot interleave with the refresh below. The default-filter fallback
+        # re-enters set_filter_position, so it runs after the lock is released.
+        async with self._get_filter_change_lock():
+            if state.filter_index != index:
+                # A concurrent set_filter_position already applied a newer choice.
+                state.applied_filter_name = state.filter_name
+                return
+            current_label = (state.filter_name or "").strip().lower()
+            desired_label = option.label.strip().lower()
+            if (
+                current_label == desired_label
+                and state.filter_name
+                and self.profile.filters.control_path != "v3-camera-param"
+            ):
+                state.applied_filter_name = state.filter_name
+                self._last_applied_filter_signature = (index, state.filter_name)
+                return
 
-        try:
-            await self._apply_filter_option(index, option)
-        except Exception as exc:  # pragma: no cover - hardware dependent
-            logger.warning(
-                "dwarf.camera.filter_refresh_failed",
-                position=index,
-                filter=option.label,
-                error=str(exc),
-                error_type=type(exc).__name__,
-            )
-            if current_label:
-                raise CaptureConfigurationError(
-                    f"Could not confirm selected filter {option.label!r}"
-                ) from exc
-            state.filter_index = None
-            state.filter_name = ""
-            await self._ensure_default_filter()
-            if state.filter_index is None:
-                raise CaptureConfigurationError(
-                    f"Could not apply selected filter {option.label!r}"
-                ) from exc
+            try:
+                await self._apply_filter_option(index, option)
+                self._last_applied_filter_signature = (index, state.filter_name)
+                return
+            except Exception as exc:  # pragma: no cover - hardware dependent
+                logger.warning(
+                    "dwarf.camera.filter_refresh_failed",
+                    position=index,
+                    filter=option.label,
+                    error=str(exc),
+                    error_type=type(exc).__name__,
+                )
+                if current_label:
+                    raise CaptureConfigurationError(
+                        f"Could not confirm selected filter {option.label!r}"
+                    ) from exc
+                state.filter_index = None
+                state.filter_name = ""
+                apply_error = exc
+
+        await self._ensure_default_filter()
+        if state.filter_index is None:
+            raise CaptureConfigurationError(
+                f"Could not apply selected filter {option.label!r}"
+            ) from apply_error
 
     async def _set_feature_param(
         self,
@@ -4605,10 +4985,10 @@ class DwarfSession:
         request.param.CopyFrom(param)
         try:
             await self._send_and_check(
-                protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-                protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_SET_FEATURE_PARAM,
+                _MODULE_CAMERA_TELE,
+                _CMD_CAMERA_TELE_SET_FEATURE_PARAM,
                 request,
-                expected_responses=self._tele_param_expected_responses(),
+                expected_responses=_TELE_PARAM_EXPECTED,
             )
         except Exception as exc:  # pragma: no cover - hardware dependent
             logger.warning(
@@ -4630,6 +5010,15 @@ class DwarfSession:
     ) -> None:
         if self.simulation:
             return
+        async with self._get_camera_config_lock():
+            await self._apply_astro_capture_config(frames=frames, binning=binning)
+
+    async def _apply_astro_capture_config(
+        self,
+        *,
+        frames: int,
+        binning: tuple[int, int] | None,
+    ) -> None:
         uses_v3 = self._uses_v3_protocol()
         config = await self._ensure_params_config()
         if config is None:
@@ -4668,30 +5057,41 @@ class DwarfSession:
             )
             return
 
-        async def _set_feature_by_label(feature_name: str, label_tokens: tuple[str, ...]) -> None:
+        # (feature, mode_index, index, continue_value, strict) for every send. Everything
+        # is resolved before the first request so a missing parameter fails the
+        # capture without leaving the camera half-configured. ReqSetFeatureParams
+        # carries a single param and responses are matched per command, so the
+        # sends themselves stay sequential.
+        pending: list[tuple[dict[str, Any], int, int, float, bool]] = []
+
+        def _missing(feature_name: str) -> None:
+            if uses_v3:
+                logger.debug(
+                    "dwarf.camera.feature_param_missing_optional",
+                    name=feature_name,
+                    device="dwarfmini",
+                )
+            else:
+                logger.warning("dwarf.camera.feature_param_missing", name=feature_name)
+
+        def _queue_feature_by_label(feature_name: str, label_tokens: tuple[str, ...]) -> None:
             feature = self._find_feature_param(feature_name)
             if feature is None:
-                if uses_v3:
-                    logger.debug(
-                        "dwarf.camera.feature_param_missing_optional",
-                        name=feature_name,
-                        device="dwarfmini",
-                    )
-                else:
-                    logger.warning("dwarf.camera.feature_param_missing", name=feature_name)
+                _missing(feature_name)
                 raise CaptureConfigurationError(
                     f"Required capture parameter {feature_name!r} is unavailable"
                 )
-            options = self._extract_feature_options(feature)
-            for mode_index, index, label, continue_value in options:
-                lowered = label.strip().lower()
-                if all(token in lowered for token in label_tokens):
-                    await self._set_feature_param(
-                        feature,
-                        mode_index=mode_index or 0,
-                        index=index,
-                        continue_value=continue_value or 0.0,
-                        strict=True,
+            tokens = tuple(token.lower() for token in label_tokens)
+            for option in self._feature_options(feature):
+                if all(token in option.label_lower for token in tokens):
+                    pending.append(
+                        (
+                            feature,
+                            option.mode_index or 0,
+                            option.index,
+                            option.continue_value or 0.0,
+                            True,
+                        )
                     )
                     return
             logger.warning(
@@ -4710,46 +5110,45 @@ class DwarfSession:
         for name, mode_index, index, continue_value in desired_fixed:
             feature = self._find_feature_param(name)
             if feature is None:
-                if uses_v3:
-                    logger.debug(
-                        "dwarf.camera.feature_param_missing_optional", name=name, device="dwarfmini"
-                    )
-                else:
-                    logger.warning("dwarf.camera.feature_param_missing", name=name)
+                _missing(name)
                 continue
-            await self._set_feature_param(
-                feature,
-                mode_index=mode_index,
-                index=index,
-                continue_value=continue_value,
-            )
+            pending.append((feature, mode_index, index, continue_value, False))
 
         bin_label = f"{bin_x}x{bin_y}"
-        await _set_feature_by_label("Astro binning", (bin_label.lower(),))
-        await _set_feature_by_label("Astro format", ("fit",))
+        _queue_feature_by_label("Astro binning", (bin_label,))
+        _queue_feature_by_label("Astro format", ("fit",))
 
         frames = max(1, int(frames))
         frames_feature = self._find_feature_param("Astro img_to_take")
-        if frames_feature is not None:
-            await self._set_feature_param(
-                frames_feature,
-                mode_index=1,
-                index=0,
-                continue_value=float(frames),
-                strict=True,
-            )
-        else:
-            if uses_v3:
-                logger.debug(
-                    "dwarf.camera.feature_param_missing_optional",
-                    name="Astro img_to_take",
-                    device="dwarfmini",
-                )
-            else:
-                logger.warning("dwarf.camera.feature_param_missing", name="Astro img_to_take")
+        if frames_feature is None:
+            _missing("Astro img_to_take")
             raise CaptureConfigurationError(
                 "Frame-count control is unavailable; requested count cannot be confirmed"
             )
+        pending.append((frames_feature, 1, 0, float(frames), True))
+
+        # The device keeps these values for the lifetime of the connection, so
+        # repeated captures only send what actually changed.
+        applied = self._applied_feature_state
+        for feature, mode_index, index, continue_value, strict in pending:
+            name = _normalized_name(feature)
+            key = (mode_index, index, continue_value)
+            if applied.get(name) == key:
+                continue
+            applied.pop(name, None)
+            try:
+                await self._set_feature_param(
+                    feature,
+                    mode_index=mode_index,
+                    index=index,
+                    continue_value=continue_value,
+                    strict=True,
+                )
+            except Exception:
+                if strict:
+                    raise
+                continue
+            applied[name] = key
         self.camera_state.applied_bin = (bin_x, bin_y)
         self.camera_state.applied_frame_count = frames
 
@@ -4766,7 +5165,7 @@ class DwarfSession:
             timeout=3.0,
             expected_responses={
                 (
-                    protocol_pb2.ModuleId.MODULE_NOTIFY,
+                    _MODULE_NOTIFY,
                     _CMD_NOTIFY_V3_CAMERA_PARAM_STATE,
                 ): V3ResNotifyCameraParamState,
             },
@@ -4828,8 +5227,8 @@ class DwarfSession:
         self._capture_start_evidence_event.clear()
         if self._uses_v3_protocol():
             response_future = await self._begin_request(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
-                protocol_pb2.DwarfCMD.CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
+                _MODULE_ASTRO,
+                _CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
                 request,
                 astro_pb2.ResAstroShooting,
             )
@@ -4838,9 +5237,7 @@ class DwarfSession:
             await asyncio.sleep(0)
             if response_future.done():
                 immediate_response = response_future.result()
-                immediate_code = int(
-                    getattr(immediate_response, "code", protocol_pb2.OK)
-                )
+                immediate_code = immediate_response.code
                 if not (
                     immediate_code in _ASTRO_FORCE_START_DARK_WARNING_CODES
                     and force_on_dark_warning
@@ -4880,8 +5277,8 @@ class DwarfSession:
             return protocol_pb2.OK
         try:
             response = await self._send_command(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
-                protocol_pb2.DwarfCMD.CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
+                _MODULE_ASTRO,
+                _CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
                 request,
                 timeout=timeout,
             )
@@ -4921,7 +5318,7 @@ class DwarfSession:
         *,
         option: FilterOption | None = None,
     ) -> int:
-        code = int(getattr(response, "code", protocol_pb2.OK))
+        code = response.code
         if code == protocol_pb2.OK:
             if option is not None:
                 self.camera_state.applied_filter_name = option.label
@@ -4930,8 +5327,8 @@ class DwarfSession:
         if code in _ASTRO_NON_FATAL_START_WARNING_CODES:
             logger.warning(
                 "dwarf.camera.astro_capture_start_warning",
-                module_id=protocol_pb2.ModuleId.MODULE_ASTRO,
-                command_id=protocol_pb2.DwarfCMD.CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
+                module_id=_MODULE_ASTRO,
+                command_id=_CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
                 code=code,
                 non_fatal=True,
             )
@@ -4942,21 +5339,21 @@ class DwarfSession:
         if code == protocol_pb2.CODE_ASTRO_FUNCTION_BUSY:
             logger.warning(
                 "dwarf.camera.astro_capture_busy",
-                module_id=protocol_pb2.ModuleId.MODULE_ASTRO,
-                command_id=protocol_pb2.DwarfCMD.CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
+                module_id=_MODULE_ASTRO,
+                command_id=_CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
                 code=code,
             )
         else:
             logger.warning(
                 "dwarf.camera.astro_capture_unexpected_code",
-                module_id=protocol_pb2.ModuleId.MODULE_ASTRO,
-                command_id=protocol_pb2.DwarfCMD.CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
+                module_id=_MODULE_ASTRO,
+                command_id=_CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
                 code=code,
             )
 
         raise DwarfCommandError(
-            protocol_pb2.ModuleId.MODULE_ASTRO,
-            protocol_pb2.DwarfCMD.CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
+            _MODULE_ASTRO,
+            _CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
             code,
         )
 
@@ -4968,7 +5365,7 @@ class DwarfSession:
         force_legacy: bool = False,
     ) -> tuple[asyncio.Future[Message], int]:
         if self.profile.model_id != "dwarf2" and not force_legacy:
-            command_id = protocol_pb2.DwarfCMD.CMD_ASTRO_CONTINUE_SHOOTING
+            command_id = _CMD_ASTRO_CONTINUE_SHOOTING
             logger.info(
                 "dwarf.camera.astro_capture_continue",
                 reason=reason,
@@ -4976,7 +5373,7 @@ class DwarfSession:
                 protocol_minimum="2.5",
             )
             future = await self._begin_request(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
+                _MODULE_ASTRO,
                 command_id,
                 astro_pb2.ReqContinueShooting(),
                 ComResponse,
@@ -4984,7 +5381,7 @@ class DwarfSession:
             return future, command_id
 
         command_id = (
-            protocol_pb2.DwarfCMD.CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING
+            _CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING
         )
         retry_request = astro_pb2.ReqCaptureRawLiveStacking()
         retry_request.ir_index = ir_index
@@ -4996,7 +5393,7 @@ class DwarfSession:
             force_start=True,
         )
         future = await self._begin_request(
-            protocol_pb2.ModuleId.MODULE_ASTRO,
+            _MODULE_ASTRO,
             command_id,
             retry_request,
             ComResponse,
@@ -5014,11 +5411,11 @@ class DwarfSession:
         force_on_dark_warning: bool,
     ) -> None:
         pending_command_id = (
-            protocol_pb2.DwarfCMD.CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING
+            _CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING
         )
         try:
             response = await asyncio.wait_for(response_future, timeout=timeout)
-            code = int(getattr(response, "code", protocol_pb2.OK))
+            code = response.code
             if code in _ASTRO_FORCE_START_DARK_WARNING_CODES:
                 warning_reason = (
                     "dark_missing"
@@ -5050,10 +5447,10 @@ class DwarfSession:
                         )
                     )
                     response = await asyncio.wait_for(retry_future, timeout=timeout)
-                    continue_code = int(getattr(response, "code", protocol_pb2.OK))
+                    continue_code = response.code
                     if (
                         pending_command_id
-                        == protocol_pb2.DwarfCMD.CMD_ASTRO_CONTINUE_SHOOTING
+                        == _CMD_ASTRO_CONTINUE_SHOOTING
                         and continue_code
                         in {
                             protocol_pb2.WS_PARSE_PROTOBUF_ERROR,
@@ -5083,7 +5480,7 @@ class DwarfSession:
             raise
         except asyncio.TimeoutError:
             self._ws_client.cancel_pending(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
+                _MODULE_ASTRO,
                 pending_command_id,
             )
             logger.warning(
@@ -5112,12 +5509,11 @@ class DwarfSession:
     async def _astro_go_live(self) -> None:
         if self.simulation:
             return
-        request = astro_pb2.ReqGoLive()
         try:
             await self._send_and_check(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
-                protocol_pb2.DwarfCMD.CMD_ASTRO_GO_LIVE,
-                request,
+                _MODULE_ASTRO,
+                _CMD_ASTRO_GO_LIVE,
+                _GO_LIVE_REQUEST,
                 timeout=max(self.settings.go_live_timeout_seconds, 1.0),
             )
         except DwarfCommandError as exc:
@@ -5137,15 +5533,15 @@ class DwarfSession:
     async def _check_dark_library(self) -> tuple[int | None, int | None]:
         if self.simulation:
             return protocol_pb2.OK, None
-        request = astro_pb2.ReqCheckDarkFrame()
         timeout = max(self.settings.dark_check_timeout_seconds, 1.0)
         try:
             response = await self._send_request(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
-                protocol_pb2.DwarfCMD.CMD_ASTRO_CHECK_GOT_DARK,
-                request,
+                _MODULE_ASTRO,
+                _CMD_ASTRO_CHECK_GOT_DARK,
+                _CHECK_DARK_REQUEST,
                 astro_pb2.ResCheckDarkFrame,
                 timeout=timeout,
+                request_type="ReqCheckDarkFrame",
             )
         except Exception as exc:  # pragma: no cover - hardware dependent
             logger.warning(
@@ -5154,13 +5550,19 @@ class DwarfSession:
                 error_type=type(exc).__name__,
             )
             return None, None
-        code = getattr(response, "code", None)
-        progress = getattr(response, "progress", None)
-        return code, progress
+        return response.code, response.progress
 
     async def _ensure_dark_library(self, *, continue_without_darks: bool) -> bool:
-        code, progress = await self._check_dark_library()
         state = self.camera_state
+        if (
+            self._last_dark_check_code == protocol_pb2.OK
+            and time.monotonic() < self._dark_check_ok_until
+        ):
+            state.last_dark_check_code = protocol_pb2.OK
+            state.dark_status = "ready"
+            return True
+        self._dark_check_ok_until = 0.0
+        code, progress = await self._check_dark_library()
         previous_code = self._last_dark_check_code
         if code is not None:
             self._last_dark_check_code = code
@@ -5179,6 +5581,7 @@ class DwarfSession:
             )
         if code == protocol_pb2.OK:
             state.dark_status = "ready"
+            self._dark_check_ok_until = time.monotonic() + _DARK_CHECK_OK_TTL_SECONDS
             if previous_code != code:
                 logger.info("dwarf.camera.dark_library_ready")
             if state.last_error == "dark_missing":
@@ -5196,8 +5599,8 @@ class DwarfSession:
                 state.last_error = "dark_missing"
                 return False
             raise DwarfCommandError(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
-                protocol_pb2.DwarfCMD.CMD_ASTRO_CHECK_GOT_DARK,
+                _MODULE_ASTRO,
+                _CMD_ASTRO_CHECK_GOT_DARK,
                 code,
             )
         logger.warning(
@@ -5211,20 +5614,19 @@ class DwarfSession:
             state.last_error = f"dark_code:{code}"
             return False
         raise DwarfCommandError(
-            protocol_pb2.ModuleId.MODULE_ASTRO,
-            protocol_pb2.DwarfCMD.CMD_ASTRO_CHECK_GOT_DARK,
+            _MODULE_ASTRO,
+            _CMD_ASTRO_CHECK_GOT_DARK,
             code,
         )
 
     async def _start_photo_capture(self, *, timeout: float) -> bool:
         if self.simulation:
             return True
-        request = ReqPhotoRaw()
         try:
             await self._send_and_check(
-                protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-                protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_PHOTO_RAW,
-                request,
+                _MODULE_CAMERA_TELE,
+                _CMD_CAMERA_TELE_PHOTO_RAW,
+                _PHOTO_RAW_REQUEST,
                 timeout=timeout,
             )
             return True
@@ -5246,15 +5648,11 @@ class DwarfSession:
             raise
 
     async def _start_photo_capture_fallback(self, *, timeout: float) -> bool:
-        request = ReqPhoto()
-        request.x = 0
-        request.y = 0
-        request.ratio = 0.0
         try:
             await self._send_and_check(
-                protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-                protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_PHOTOGRAPH,
-                request,
+                _MODULE_CAMERA_TELE,
+                _CMD_CAMERA_TELE_PHOTOGRAPH,
+                _PHOTO_FALLBACK_REQUEST,
                 timeout=timeout,
             )
         except Exception as exc:  # pragma: no cover - hardware dependent
@@ -5280,15 +5678,15 @@ class DwarfSession:
                     start_task.cancel()
                 self._capture_start_response_task = None
                 self._ws_client.cancel_pending(
-                    protocol_pb2.ModuleId.MODULE_ASTRO,
-                    protocol_pb2.DwarfCMD.CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
+                    _MODULE_ASTRO,
+                    _CMD_ASTRO_START_CAPTURE_RAW_LIVE_STACKING,
                 )
                 stop_task = self._capture_stop_response_task
                 if stop_task and not stop_task.done():
                     return
                 response_future = await self._begin_request(
-                    protocol_pb2.ModuleId.MODULE_ASTRO,
-                    protocol_pb2.DwarfCMD.CMD_ASTRO_STOP_CAPTURE_RAW_LIVE_STACKING,
+                    _MODULE_ASTRO,
+                    _CMD_ASTRO_STOP_CAPTURE_RAW_LIVE_STACKING,
                     request,
                     ComResponse,
                 )
@@ -5298,8 +5696,8 @@ class DwarfSession:
                 logger.info("dwarf.camera.astro_stop_dispatched")
                 return
             await self._send_and_check(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
-                protocol_pb2.DwarfCMD.CMD_ASTRO_STOP_CAPTURE_RAW_LIVE_STACKING,
+                _MODULE_ASTRO,
+                _CMD_ASTRO_STOP_CAPTURE_RAW_LIVE_STACKING,
                 request,
             )
         except Exception as exc:  # pragma: no cover - hardware dependent
@@ -5312,11 +5710,11 @@ class DwarfSession:
     ) -> None:
         try:
             response = await asyncio.wait_for(response_future, timeout=30.0)
-            code = int(getattr(response, "code", protocol_pb2.OK))
+            code = response.code
             if code != protocol_pb2.OK:
                 raise DwarfCommandError(
-                    protocol_pb2.ModuleId.MODULE_ASTRO,
-                    protocol_pb2.DwarfCMD.CMD_ASTRO_STOP_CAPTURE_RAW_LIVE_STACKING,
+                    _MODULE_ASTRO,
+                    _CMD_ASTRO_STOP_CAPTURE_RAW_LIVE_STACKING,
                     code,
                 )
             logger.info("dwarf.camera.astro_stop_response", code=code)
@@ -5324,8 +5722,8 @@ class DwarfSession:
             raise
         except asyncio.TimeoutError:
             self._ws_client.cancel_pending(
-                protocol_pb2.ModuleId.MODULE_ASTRO,
-                protocol_pb2.DwarfCMD.CMD_ASTRO_STOP_CAPTURE_RAW_LIVE_STACKING,
+                _MODULE_ASTRO,
+                _CMD_ASTRO_STOP_CAPTURE_RAW_LIVE_STACKING,
             )
             logger.warning("dwarf.camera.astro_stop_response_timeout", timeout=30.0)
         except Exception as exc:
@@ -5339,23 +5737,21 @@ class DwarfSession:
                 self._capture_stop_response_task = None
 
     async def _set_exposure_mode_manual(self) -> None:
-        request = ReqSetExpMode()
-        request.mode = protocol_pb2.PhotoMode.Manual
         await self._send_and_check(
-            protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-            protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_SET_EXP_MODE,
-            request,
-            expected_responses=self._tele_param_expected_responses(),
+            _MODULE_CAMERA_TELE,
+            _CMD_CAMERA_TELE_SET_EXP_MODE,
+            _EXP_MODE_MANUAL_REQUEST,
+            expected_responses=_TELE_PARAM_EXPECTED,
         )
 
     async def _set_exposure_index(self, index: int) -> None:
-        request = ReqSetExp()
+        request = self._set_exp_req
         request.index = index
         await self._send_and_check(
-            protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-            protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_SET_EXP,
+            _MODULE_CAMERA_TELE,
+            _CMD_CAMERA_TELE_SET_EXP,
             request,
-            expected_responses=self._tele_param_expected_responses(),
+            expected_responses=_TELE_PARAM_EXPECTED,
         )
 
     @staticmethod
@@ -5439,6 +5835,10 @@ class DwarfSession:
     async def _ensure_gain_settings(self) -> None:
         if self.simulation:
             return
+        async with self._get_camera_config_lock():
+            await self._apply_gain_settings()
+
+    async def _apply_gain_settings(self) -> None:
         state = self.camera_state
         gain_value = state.requested_gain
         if gain_value is None:
@@ -5471,9 +5871,10 @@ class DwarfSession:
 
         command_timeout = max(self.settings.camera_gain_command_timeout_seconds, 0.5)
 
-        if await self._gain_manual_mode_enabled():
+        if not state.gain_mode_manual and await self._gain_manual_mode_enabled():
             try:
                 await self._set_gain_mode_manual(timeout=command_timeout)
+                state.gain_mode_manual = True
             except Exception as exc:  # pragma: no cover - hardware dependent
                 logger.debug(
                     "dwarf.camera.gain_mode_set_failed",
@@ -5554,34 +5955,36 @@ class DwarfSession:
             self._gain_command_warning_logged = True
 
     async def _set_gain_mode_manual(self, *, timeout: float | None = None) -> None:
-        request = ReqSetGainMode()
-        request.mode = 1
         effective_timeout = timeout if timeout is not None else 10.0
         await self._send_and_check(
-            protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-            protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_SET_GAIN_MODE,
-            request,
+            _MODULE_CAMERA_TELE,
+            _CMD_CAMERA_TELE_SET_GAIN_MODE,
+            _GAIN_MODE_MANUAL_REQUEST,
             timeout=effective_timeout,
-            expected_responses=self._tele_param_expected_responses(),
+            expected_responses=_TELE_PARAM_EXPECTED,
         )
 
     async def _set_gain_index(self, index: int, *, timeout: float | None = None) -> None:
-        request = ReqSetGain()
+        request = self._set_gain_req
         request.index = index
         effective_timeout = timeout if timeout is not None else 10.0
         await self._send_and_check(
-            protocol_pb2.ModuleId.MODULE_CAMERA_TELE,
-            protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_SET_GAIN,
+            _MODULE_CAMERA_TELE,
+            _CMD_CAMERA_TELE_SET_GAIN,
             request,
             timeout=effective_timeout,
-            expected_responses=self._tele_param_expected_responses(),
+            expected_responses=_TELE_PARAM_EXPECTED,
         )
 
     async def _refresh_capture_baseline(self, *, capture_kind: str) -> None:
         state = self.camera_state
         if capture_kind == "photo":
-            await self._refresh_ftp_baseline(capture_kind=capture_kind)
-            await self._refresh_album_baseline(media_type=1)
+            # FTP and the HTTP album are separate services; each refresh logs and
+            # absorbs its own failures, so they can simply run side by side.
+            await asyncio.gather(
+                self._refresh_ftp_baseline(capture_kind=capture_kind),
+                self._refresh_album_baseline(media_type=1),
+            )
         else:
             # Walking every astronomy directory over FTP can take longer than
             # NINA's 10-second StartExposure timeout. Astro retrieval already
@@ -5705,7 +6108,7 @@ class DwarfSession:
         file_id = str(fits_entry.get("filePath") or fits_entry.get("url"))
         try:
             content = await self._http_client.fetch_media_file(file_id)
-            frame = self._decode_capture_content(file_id, content)
+            frame = await asyncio.to_thread(self._decode_capture_content, file_id, content)
         except Exception as exc:  # pragma: no cover - hardware dependent
             logger.warning(
                 "dwarf.camera.astro_fits_download_failed",
@@ -5730,10 +6133,9 @@ class DwarfSession:
         await asyncio.sleep(state.duration)
         width = 640
         height = 480
-        x = np.linspace(0, 65535, width, dtype=np.uint16)
         y = np.linspace(0, 65535, height, dtype=np.uint16)
-        grid = np.outer(y, np.ones_like(x)).astype(np.uint16)
-        state.image = grid
+        # Row gradient: broadcast the column instead of an outer product with ones.
+        state.image = np.broadcast_to(y[:, None], (height, width)).copy()
         state.frame_width = width
         state.frame_height = height
         state.image_timestamp = time.time()
@@ -5848,7 +6250,9 @@ class DwarfSession:
             state.pending_ftp_baseline = state.last_ftp_entry
             return False
         try:
-            frame = self._decode_capture_content(capture.entry.path, capture.content)
+            frame = await asyncio.to_thread(
+                self._decode_capture_content, capture.entry.path, capture.content
+            )
         except Exception as exc:
             logger.warning(
                 "dwarf.camera.ftp_decode_failed",
@@ -5883,40 +6287,29 @@ class DwarfSession:
             return
         baseline = state.pending_album_baseline
         last_known_file = state.last_album_file
-        deadline = time.time() + max(state.duration + 15.0, 20.0)
+        deadline = time.monotonic() + max(state.duration + 15.0, 20.0)
         entry: dict[str, Any] | None = None
         media_type = 4 if state.capture_mode == "astro" else 1
-        while time.time() < deadline:
+        delay = _ALBUM_POLL_INITIAL_SECONDS
+        while True:
             mod_time, latest_entry = await self._get_latest_album_entry(media_type=media_type)
-            if latest_entry is None:
-                await asyncio.sleep(0.75)
-                continue
-            file_id = self._album_entry_file(latest_entry)
-            is_new = False
-            if mod_time is not None:
-                if baseline is None or mod_time > baseline:
-                    is_new = True
-            if not is_new and file_id and file_id != last_known_file:
-                is_new = True
-            if is_new and not self._album_entry_is_recent(
-                latest_entry, not_before=state.last_start_time
+            if latest_entry is not None and self._is_new_album_entry(
+                state, latest_entry, mod_time, baseline=baseline, last_known_file=last_known_file
             ):
-                logger.warning(
-                    "dwarf.camera.album_stale_entry_rejected",
-                    capture_id=state.capture_id,
-                    file=file_id,
-                    modification_time=mod_time,
-                    exposure_started_at=state.last_start_time,
-                )
-                is_new = False
-            if is_new:
                 entry = latest_entry
                 if mod_time is not None:
                     state.last_album_mod_time = mod_time
+                file_id = self._album_entry_file(latest_entry)
                 if file_id:
                     state.last_album_file = file_id
                 break
-            await asyncio.sleep(0.75)
+            # The album has no change notification; back off so a slow device is
+            # not hammered while a quick one is still picked up promptly.
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 1.5, _ALBUM_POLL_MAX_SECONDS)
 
         if entry is None:
             logger.warning(
@@ -5961,7 +6354,7 @@ class DwarfSession:
             return
 
         try:
-            frame = self._decode_capture_content(file_id, media_bytes)
+            frame = await asyncio.to_thread(self._decode_capture_content, file_id, media_bytes)
         except Exception as exc:
             logger.warning("dwarf.camera.decode_failed", path=file_id, error=str(exc))
             state.start_time = None
@@ -5978,6 +6371,33 @@ class DwarfSession:
         self._store_frame(state, frame, timestamp)
         state.pending_album_baseline = state.last_album_mod_time
 
+    def _is_new_album_entry(
+        self,
+        state: CameraState,
+        entry: dict[str, Any],
+        mod_time: int | None,
+        *,
+        baseline: int | None,
+        last_known_file: str | None,
+    ) -> bool:
+        file_id = self._album_entry_file(entry)
+        is_new = False
+        if mod_time is not None:
+            if baseline is None or mod_time > baseline:
+                is_new = True
+        if not is_new and file_id and file_id != last_known_file:
+            is_new = True
+        if is_new and not self._album_entry_is_recent(entry, not_before=state.last_start_time):
+            logger.warning(
+                "dwarf.camera.album_stale_entry_rejected",
+                capture_id=state.capture_id,
+                file=file_id,
+                modification_time=mod_time,
+                exposure_started_at=state.last_start_time,
+            )
+            is_new = False
+        return is_new
+
     @staticmethod
     def _album_entry_is_recent(
         entry: dict[str, Any], *, not_before: float | None
@@ -6019,51 +6439,55 @@ class DwarfSession:
         state.last_error = None
 
     def _decode_capture_content(self, identifier: str, content: bytes) -> np.ndarray:
+        # Runs in a worker thread (asyncio.to_thread): the cv2 decode and FITS
+        # numpy work release the GIL, so large frames no longer stall the event loop.
         name = identifier.rsplit("/", 1)[-1]
         lower = name.lower()
         if lower.endswith((".fits", ".fit")):
             self.camera_state.source_format = "FITS"
             self.camera_state.source_bit_depth = 16
-            return self._decode_fits(content)
+            return self._decode_fits(content, scratch=self._fits_scratch)
         self.camera_state.source_format = "JPEG"
         self.camera_state.source_bit_depth = 8
         return self._decode_jpeg(content)
 
     @staticmethod
     def _decode_jpeg(content: bytes) -> np.ndarray:
-        import cv2  # type: ignore
-
+        cv2 = _load_cv2()
         array = np.frombuffer(content, dtype=np.uint8)
-        frame = cv2.imdecode(array, cv2.IMREAD_UNCHANGED)
+        # Decoding straight to grayscale lets libjpeg emit the luma plane without
+        # building a BGR frame and converting it in a second full-frame pass.
+        # Unlike IMREAD_UNCHANGED, these flags apply the EXIF orientation unless told
+        # not to, which would rotate the sensor geometry.
+        frame = cv2.imdecode(
+            array,
+            cv2.IMREAD_GRAYSCALE | cv2.IMREAD_ANYDEPTH | cv2.IMREAD_IGNORE_ORIENTATION,
+        )
         if frame is None:
             raise ValueError("decode_failed")
-        if frame.ndim == 3:
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         if frame.dtype not in (np.uint8, np.uint16):
             raise ValueError(f"unsupported_jpeg_dtype:{frame.dtype}")
         return frame
 
     @staticmethod
-    def _decode_fits(content: bytes) -> np.ndarray:
+    def _decode_fits(content: bytes, *, scratch: _FitsScratch | None = None) -> np.ndarray:
+        end = DwarfSession._find_fits_end_card(content)
+        if end < 0:
+            raise ValueError("fits_header_incomplete")
+        # Only the structural keywords are read. A strided S8 view over the keyword
+        # field of every card finds them in one vectorized comparison, so the (often
+        # long) rest of the header is never sliced or decoded in Python.
+        keywords = np.ndarray((end // 80,), dtype="S8", buffer=content, strides=(80,))
         header: dict[str, Any] = {}
-        offset = 0
-        block_size = 2880
-        content_len = len(content)
-        while True:
-            if offset + 80 > content_len:
-                raise ValueError("fits_header_incomplete")
-            card = content[offset : offset + 80]
-            offset += 80
-            keyword = card[0:8].decode("ascii", errors="ignore").strip()
-            if keyword == "END":
-                break
-            if not keyword:
-                continue
-            value_field = card[10:80].decode("ascii", errors="ignore")
+        for card in np.flatnonzero(np.isin(keywords, _FITS_STRUCTURAL_KEYWORD_FIELDS)):
+            offset = int(card) * 80
+            keyword = content[offset : offset + 8].decode("ascii").rstrip()
+            value_field = content[offset + 10 : offset + 80].decode("ascii", errors="ignore")
             value_str = value_field.split("/", 1)[0].strip()
             if value_str:
                 header[keyword] = DwarfSession._parse_fits_value(value_str)
-        header_size = ((offset + block_size - 1) // block_size) * block_size
+        block_size = 2880
+        header_size = ((end + 80 + block_size - 1) // block_size) * block_size
         bitpix = int(header.get("BITPIX", 16))
         naxis = int(header.get("NAXIS", 0))
         if naxis < 2:
@@ -6083,10 +6507,82 @@ class DwarfSession:
         array = array.reshape((height, width))
         bscale = float(header.get("BSCALE", 1.0))
         bzero = float(header.get("BZERO", 0.0))
-        scaled = array.astype(np.float64) * bscale + bzero
-        scaled = np.clip(scaled, 0, 65535)
+        if bitpix == 16 and bscale == 1.0 and bzero == 32768.0:
+            # Standard unsigned 16-bit encoding: adding 32768 to a signed value is
+            # a sign-bit flip, done in one integer pass straight into native uint16.
+            return np.bitwise_xor(array.view(">u2"), np.uint16(0x8000), dtype=np.uint16)
+        int_work = np.int64 if bitpix >= 32 else np.int32
+        int_info = np.iinfo(int_work)
+        if (
+            bscale == 1.0
+            and bzero.is_integer()
+            and bitpix > 0
+            and int_info.min <= bzero <= int_info.max
+        ):
+            # Integer offsets need no floating point. Clipping happens in the source
+            # domain, so any temporary stays at source width, and a single add then
+            # byteswaps, offsets and narrows straight into the native uint16 frame.
+            # Offsets the working integer cannot hold, such as the unsigned 64-bit
+            # BZERO of 2**63, take the float path below.
+            offset = int(bzero)
+            info = np.iinfo(array.dtype)
+            low = max(-offset, info.min)
+            high = min(65535 - offset, info.max)
+            if low > high:
+                # The offset pushes every representable value out of range.
+                return np.full(array.shape, 0 if offset < 0 else 65535, dtype=np.uint16)
+            if low > info.min or high < info.max:
+                array = np.clip(array, low, high)
+            frame = np.empty(array.shape, dtype=np.uint16)
+            np.add(array, int_work(offset), out=frame, dtype=int_work, casting="unsafe")
+            return frame
+        # Single precision halves the bytes moved by the scale, offset and clip
+        # passes, but is only used when it gives exactly the float64 result.
+        exact = DwarfSession._fits_float32_exact(bitpix, bscale, bzero)
+        work = np.float32 if exact else np.float64
+        if scratch is None:
+            return DwarfSession._scale_fits(array, bscale, bzero, np.empty(array.shape, work))
+        with scratch.lock:
+            return DwarfSession._scale_fits(array, bscale, bzero, scratch.take(array.shape, work))
+
+    @staticmethod
+    def _fits_float32_exact(bitpix: int, bscale: float, bzero: float) -> bool:
+        """True when every ``value * bscale + bzero`` is exact in single precision."""
+        if bitpix == -32:
+            # float32 data only stays exact when it is not rescaled at all.
+            return bscale == 1.0 and bzero == 0.0
+        if bitpix not in (8, 16):
+            return False
+        # Both factors are dyadic rationals a/2**p and b/2**q. Over a common
+        # denominator every result is an integer numerator, and it is exact in
+        # float32 when that numerator fits the 24-bit significand.
+        scale_num, scale_den = bscale.as_integer_ratio()
+        zero_num, zero_den = bzero.as_integer_ratio()
+        denominator = max(scale_den, zero_den)
+        bound = (1 << bitpix) * abs(scale_num) * (denominator // scale_den)
+        bound += abs(zero_num) * (denominator // zero_den)
+        return bound < 1 << 24
+
+    @staticmethod
+    def _scale_fits(
+        array: np.ndarray, bscale: float, bzero: float, scaled: np.ndarray
+    ) -> np.ndarray:
+        work = scaled.dtype.type
+        np.multiply(array, work(bscale), out=scaled, dtype=scaled.dtype)
+        scaled += work(bzero)
+        np.clip(scaled, 0, 65535, out=scaled)
         return scaled.astype(np.uint16)
 
+    @staticmethod
+    def _find_fits_end_card(content: bytes) -> int:
+        """Return the offset of the card-aligned ``END`` card, or -1 if absent."""
+        position = content.find(b"END")
+        while position >= 0:
+            if position % 80 == 0 and not content[position + 3 : position + 8].strip():
+                return position if position + 80 <= len(content) else -1
+            position = content.find(b"END", position + 1)
+        return -1
+
     @staticmethod
     def _parse_fits_value(value: str) -> Any:
         stripped = value.strip()
@@ -6098,9 +6594,9 @@ class DwarfSession:
         if upper in {"T", "F"}:
             return upper == "T"
         try:
-            if any(ch in stripped for ch in (".", "E", "e")):
-                return float(stripped)
-            return int(stripped)
+            if _FITS_FLOAT_CHARS.isdisjoint(stripped):
+                return int(stripped)
+            return float(stripped)
         except ValueError:
             return stripped
 
@@ -6135,7 +6631,7 @@ class DwarfSession:
             request = V3ReqFocusInit()
             try:
                 response = await self._send_request(
-                    protocol_pb2.ModuleId.MODULE_FOCUS,
+                    _MODULE_FOCUS,
                     _CMD_V3_FOCUS_INIT,
                     request,
                     V3ResFocusInit,
@@ -6146,7 +6642,7 @@ class DwarfSession:
                 if isinstance(response, V3ResFocusInit):
                     focus_position = int(getattr(response, "focus_position", state.position))
                     state.position = max(0, min(focus_position, 20000))
-                    state.last_update = time.time()
+                    state.last_update = time.monotonic()
             except Exception as exc:  # pragma: no cover - hardware dependent
                 logger.debug(
                     "dwarf.focus.v3_init_failed",
@@ -6163,8 +6659,8 @@ class DwarfSession:
             stop = ReqStopManualContinuFocus()
             with contextlib.suppress(Exception):
                 await self._send_and_check(
-                    protocol_pb2.ModuleId.MODULE_FOCUS,
-                    protocol_pb2.DwarfCMD.CMD_FOCUS_STOP_MANUAL_CONTINU_FOCUS,
+                    _MODULE_FOCUS,
+                    _CMD_FOCUS_STOP_MANUAL_CONTINU_FOCUS,
                     stop,
                 )
         state.connected = False
@@ -6188,14 +6684,16 @@ class DwarfSession:
         if self.simulation:
             await self._simulate_focus_move(delta)
             state.position = target
-            state.last_update = time.time()
+            state.last_update = time.monotonic()
             state.is_moving = False
             return
 
         await self._ensure_ws()
         received_update = False
         try:
-            last_update_age = None if state.last_update is None else time.time() - state.last_update
+            last_update_age = (
+                None if state.last_update is None else time.monotonic() - state.last_update
+            )
             prefer_single_step = steps <= 10 or self._is_dwarf_mini()
             fallback_reason = None
             if steps > 10 and (last_update_age is None or last_update_age > 5.0):
@@ -6218,8 +6716,8 @@ class DwarfSession:
                 for _ in range(steps):
                     self._focus_update_event.clear()
                     await self._send_and_check(
-                        protocol_pb2.ModuleId.MODULE_FOCUS,
-                        protocol_pb2.DwarfCMD.CMD_FOCUS_MANUAL_SINGLE_STEP_FOCUS,
+                        _MODULE_FOCUS,
+                        _CMD_FOCUS_MANUAL_SINGLE_STEP_FOCUS,
                         request,
                     )
                     try:
@@ -6227,7 +6725,7 @@ class DwarfSession:
                         received_update = True
                     except asyncio.TimeoutError:
                         state.position = max(0, min(state.position + direction, 20000))
-                        state.last_update = time.time()
+                        state.last_update = time.monotonic()
                         received_update = True
                     finally:
                         self._focus_update_event.clear()
@@ -6242,8 +6740,8 @@ class DwarfSession:
                 start_request.direction = command_direction
                 self._focus_update_event.clear()
                 await self._send_and_check(
-                    protocol_pb2.ModuleId.MODULE_FOCUS,
-                    protocol_pb2.DwarfCMD.CMD_FOCUS_START_MANUAL_CONTINU_FOCUS,
+                    _MODULE_FOCUS,
+                    _CMD_FOCUS_START_MANUAL_CONTINU_FOCUS,
                     start_request,
                 )
                 deadline = time.monotonic() + min(max(steps * 0.015, 1.5), 15.0)
@@ -6272,8 +6770,8 @@ class DwarfSession:
                 stop_request = ReqStopManualContinuFocus()
                 self._focus_update_event.clear()
                 await self._send_and_check(
-                    protocol_pb2.ModuleId.MODULE_FOCUS,
-                    protocol_pb2.DwarfCMD.CMD_FOCUS_STOP_MANUAL_CONTINU_FOCUS,
+                    _MODULE_FOCUS,
+                    _CMD_FOCUS_STOP_MANUAL_CONTINU_FOCUS,
                     stop_request,
                 )
                 try:
@@ -6289,7 +6787,7 @@ class DwarfSession:
         else:
             if not received_update:
                 state.position = target
-                state.last_update = time.time()
+                state.last_update = time.monotonic()
             state.position = max(0, min(state.position, 20000))
             tolerance = max(0, int(getattr(self.settings, "focuser_target_tolerance_steps", 0)))
             if (
@@ -6327,15 +6825,15 @@ class DwarfSession:
             request.direction = self._focus_command_direction(error)
             self._focus_update_event.clear()
             await self._send_and_check(
-                protocol_pb2.ModuleId.MODULE_FOCUS,
-                protocol_pb2.DwarfCMD.CMD_FOCUS_MANUAL_SINGLE_STEP_FOCUS,
+                _MODULE_FOCUS,
+                _CMD_FOCUS_MANUAL_SINGLE_STEP_FOCUS,
                 request,
             )
             try:
                 await asyncio.wait_for(self._focus_update_event.wait(), timeout=0.6)
             except asyncio.TimeoutError:
                 state.position = max(0, min(state.position + step_direction, 20000))
-                state.last_update = time.time()
+                state.last_update = time.monotonic()
             finally:
                 self._focus_update_event.clear()
 
@@ -6366,22 +6864,31 @@ class DwarfSession:
         stop = ReqStopManualContinuFocus()
         try:
             await self._send_and_check(
-                protocol_pb2.ModuleId.MODULE_FOCUS,
-                protocol_pb2.DwarfCMD.CMD_FOCUS_STOP_MANUAL_CONTINU_FOCUS,
+                _MODULE_FOCUS,
+                _CMD_FOCUS_STOP_MANUAL_CONTINU_FOCUS,
                 stop,
             )
         finally:
             state.is_moving = False
 
     async def _simulate_focus_move(self, delta: int) -> None:
-        steps = abs(delta)
-        direction = 1 if delta > 0 else -1
-        for _ in range(steps):
-            self.focuser_state.position += direction
-            self.focuser_state.position = max(0, min(self.focuser_state.position, 20000))
-            self.focuser_state.last_update = time.time()
+        state = self.focuser_state
+        start = state.position
+        # Clamping the end point once keeps every intermediate position in range,
+        # so the loop itself needs no per-step clamp.
+        target = max(0, min(start + delta, 20000))
+        steps = abs(target - start)
+        direction = 1 if target > start else -1
+        moved = 0
+        while moved < steps:
+            # Advance a batch of steps per wake-up; the sleep still covers every
+            # step, so the simulated focuser keeps its speed.
+            batch = min(_SIM_FOCUS_STEPS_PER_TICK, steps - moved)
+            moved += batch
+            state.position = start + direction * moved
+            state.last_update = time.monotonic()
             self._focus_update_event.set()
-            await asyncio.sleep(0.005)
+            await asyncio.sleep(_SIM_FOCUS_STEP_SECONDS * batch)
 
 
 _session: DwarfSession | None = None
@@ -6425,6 +6932,7 @@ def configure_session(settings: Settings) -> None:
         _session._http_client.retries = settings.http_retries
         _session._http_client._client = None
         _session._http_client._jpeg_client = None
+        _session._http_client._file_client = None
         _session._ftp_client.host = settings.dwarf_ap_ip
         _session._ftp_client.port = settings.dwarf_ftp_port
         _session._ftp_client.timeout = settings.ftp_timeout_seconds
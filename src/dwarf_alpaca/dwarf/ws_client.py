@@ -4,7 +4,7 @@ import asyncio
 import contextlib
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Tuple, Type, TypeVar
+from typing import Dict, Mapping, Optional, Tuple, Type, TypeVar
 
 import structlog
 from google.protobuf.message import DecodeError, Message
@@ -48,6 +48,7 @@ class DwarfWsClient:
         device_id: int = 1,
         client_id: str | None = None,
         ping_interval: float | None = None,
+        max_inflight: int = 8,
     ) -> None:
         self.uri = f"ws://{host}:{port}/"
         self.major_version = major_version
@@ -66,6 +67,9 @@ class DwarfWsClient:
         self._notifications: set[NotificationHandler] = set()
         self._connected_event = asyncio.Event()
         self._ping_task: Optional[asyncio.Task[None]] = None
+        self._max_inflight = max(1, max_inflight)
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._inflight_loop: Optional[asyncio.AbstractEventLoop] = None
 
     def set_client_id(self, client_id: str | None) -> None:
         self._client_id = client_id or ""
@@ -78,6 +82,32 @@ class DwarfWsClient:
                     self._pending_aliases.pop(alias_key, None)
         return pending
 
+    def _get_inflight_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._inflight
+        if semaphore is None or self._inflight_loop is not loop:
+            semaphore = asyncio.Semaphore(self._max_inflight)
+            self._inflight = semaphore
+            self._inflight_loop = loop
+        return semaphore
+
+    def _blocking_requests(self, keys: list[Tuple[int, int]]) -> set[asyncio.Future[Message]]:
+        """Return the futures of pending requests that answer on any of ``keys``.
+
+        DWARF packets carry no correlation id, so responses are matched on
+        ``(module_id, cmd)``; requests sharing a key must not overlap.
+        """
+
+        return {
+            pending.future
+            for key in keys
+            if (pending := self._pending.get(self._pending_aliases.get(key, key))) is not None
+        }
+
+    @property
+    def has_pending_requests(self) -> bool:
+        return bool(self._pending)
+
     @property
     def connected(self) -> bool:
         conn = self._conn
@@ -132,6 +162,14 @@ class DwarfWsClient:
     async def wait_connected(self) -> None:
         await self._connected_event.wait()
 
+    async def wait_disconnected(self) -> None:
+        """Return once the current connection's reader has stopped."""
+
+        task = self._reader_task
+        if task is None or task.done():
+            return
+        await asyncio.wait({task})
+
     async def send_request(
         self,
         module_id: int,
@@ -140,21 +178,52 @@ class DwarfWsClient:
         response_cls: Type[ResponseT],
         *,
         timeout: float = 10.0,
-        expected_responses: Optional[Dict[Tuple[int, int], Type[Message]]] = None,
+        expected_responses: Optional[Mapping[Tuple[int, int], Type[Message]]] = None,
     ) -> Message:
-        future = await self.begin_request(
+        return await self.send_raw_request(
             module_id,
             command_id,
-            request_message,
+            request_message.SerializeToString(),
             response_cls,
+            timeout=timeout,
             expected_responses=expected_responses,
         )
+
+    async def send_raw_request(
+        self,
+        module_id: int,
+        command_id: int,
+        payload: bytes,
+        response_cls: Type[ResponseT],
+        *,
+        timeout: float = 10.0,
+        expected_responses: Optional[Mapping[Tuple[int, int], Type[Message]]] = None,
+    ) -> Message:
+        """Like :meth:`send_request`, for a request body that is already serialized.
+
+        Requests on different ``(module_id, cmd)`` keys are pipelined: each caller
+        only waits for its own response, up to ``max_inflight`` at a time. A request
+        whose key is already in flight waits for that one to finish first.
+        """
+
         key = (module_id, command_id)
-        try:
-            return await asyncio.wait_for(future, timeout=timeout)
-        except Exception:
-            self._pop_pending_request(key)
-            raise
+        # Only the wait for the response counts against ``timeout``; queueing
+        # behind other requests is unbounded, as with a command lock.
+        async with self._get_inflight_semaphore():
+            future = await self.begin_raw_request(
+                module_id,
+                command_id,
+                payload,
+                response_cls,
+                expected_responses=expected_responses,
+            )
+            try:
+                return await asyncio.wait_for(future, timeout=timeout)
+            except Exception:
+                pending = self._pending.get(key)
+                if pending is not None and pending.future is future:
+                    self._pop_pending_request(key)
+                raise
 
     async def begin_request(
         self,
@@ -163,20 +232,48 @@ class DwarfWsClient:
         request_message: Message,
         response_cls: Type[ResponseT],
         *,
-        expected_responses: Optional[Dict[Tuple[int, int], Type[Message]]] = None,
+        expected_responses: Optional[Mapping[Tuple[int, int], Type[Message]]] = None,
     ) -> asyncio.Future[Message]:
         """Send a request and return its response future without awaiting completion."""
 
-        await self.connect()
-        if not self._conn:
-            raise RuntimeError("DWARF websocket connection unavailable")
+        return await self.begin_raw_request(
+            module_id,
+            command_id,
+            request_message.SerializeToString(),
+            response_cls,
+            expected_responses=expected_responses,
+        )
+
+    async def begin_raw_request(
+        self,
+        module_id: int,
+        command_id: int,
+        payload: bytes,
+        response_cls: Type[ResponseT],
+        *,
+        expected_responses: Optional[Mapping[Tuple[int, int], Type[Message]]] = None,
+    ) -> asyncio.Future[Message]:
+        """Like :meth:`begin_request`, for a request body that is already serialized.
+
+        A request whose response key is already in flight waits for that one to
+        finish first.
+        """
 
         key = (module_id, command_id)
+        keys = [key, *(expected_responses or ())]
+        while True:
+            await self.connect()
+            conn = self._conn
+            if not conn:
+                raise RuntimeError("DWARF websocket connection unavailable")
+            # Nothing awaits between this check and registering the request below,
+            # so a concurrent caller on the same key cannot slip in between.
+            blocking = self._blocking_requests(keys)
+            if not blocking:
+                break
+            await asyncio.wait(blocking)
+
         loop = asyncio.get_running_loop()
-        if key in self._pending:
-            raise RuntimeError(
-                f"Another request for module {module_id} cmd {command_id} is already pending"
-            )
         future: asyncio.Future[Message] = loop.create_future()
         alternates = dict(expected_responses or {})
         self._pending[key] = _PendingRequest(
@@ -192,12 +289,12 @@ class DwarfWsClient:
         packet.module_id = module_id
         packet.cmd = command_id
         packet.type = TYPE_REQUEST
-        packet.data = request_message.SerializeToString()
+        packet.data = payload
         if self._client_id:
             packet.client_id = self._client_id
 
         try:
-            await self._conn.send(packet.SerializeToString())
+            await conn.send(packet.SerializeToString())
         except Exception:
             self._pop_pending_request(key)
             raise
@@ -210,7 +307,7 @@ class DwarfWsClient:
         request_message: Message,
         *,
         timeout: float = 10.0,
-        expected_responses: Optional[Dict[Tuple[int, int], Type[Message]]] = None,
+        expected_responses: Optional[Mapping[Tuple[int, int], Type[Message]]] = None,
     ) -> Message:
         response = await self.send_request(
             module_id,
@@ -336,8 +433,7 @@ class DwarfWsClient:
                     result: Message = packet
                 else:
                     result = response_cls()
-                    raw_data = getattr(packet, "data", b"")
-                    result.ParseFromString(raw_data)
+                    result.ParseFromString(packet.data)
                 pending.future.set_result(result)
             except Exception as exc:  # pragma: no cover - defensive
                 pending.future.set_exception(exc)
@@ -373,7 +469,7 @@ async def send_and_check(
     request: Message,
     *,
     timeout: float = 10.0,
-    expected_responses: Optional[Dict[Tuple[int, int], Type[Message]]] = None,
+    expected_responses: Optional[Mapping[Tuple[int, int], Type[Message]]] = None,
 ) -> Message:
     response = await client.send_command(
         module_id,
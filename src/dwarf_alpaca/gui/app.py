@@ -68,6 +68,7 @@ def _configure_gui_structlog() -> None:
 
     structlog.configure(
         processors=[
+            structlog.stdlib.filter_by_level,
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.stdlib.add_log_level,
             structlog.processors.StackInfoRenderer(),
@@ -111,6 +112,9 @@ WS_CLIENT_CHOICES: list[tuple[str, str]] = [
 
 _MODEL_DEFAULT_CLIENT_ID = {model: client_id for _, model, client_id in DWARF_MODEL_CHOICES}
 _CLIENT_ID_MODEL = {client_id: model for _, model, client_id in DWARF_MODEL_CHOICES}
+# Discovery, the Wi-Fi list and provisioning are separate clicks, so keep the
+# discovered devices long enough for the later steps to resolve them by address.
+_BLE_SCAN_CACHE_TTL_SECONDS = 120.0
 
 
 def _infer_dwarf_model_from_name(name: str) -> str | None:
@@ -939,6 +943,13 @@ class MainWindow(QMainWindow):
         self.server_widget.set_running(False, "Stopped")
         self._handle_worker_error(exc, "Preflight failed")
 
+    @staticmethod
+    def _ble_provisioner(settings: Settings) -> DwarfBleProvisioner:
+        return DwarfBleProvisioner(
+            response_timeout=settings.ble_response_timeout_seconds,
+            scan_cache_ttl=_BLE_SCAN_CACHE_TTL_SECONDS,
+        )
+
     def _handle_discover(self, payload: dict) -> None:
         worker = AsyncWorker(lambda: self._discover_devices(payload))
         worker.finished_success.connect(self._on_discover_success)
@@ -951,8 +962,8 @@ class MainWindow(QMainWindow):
     async def _discover_devices(self, payload: dict) -> list[tuple[str, str]]:
         settings = self._current_settings()
         adapter = settings.ble_adapter
-        provisioner = DwarfBleProvisioner()
-        devices = await provisioner.discover_devices(adapter=adapter)  # type: ignore[arg-type]
+        provisioner = self._ble_provisioner(settings)
+        devices = await provisioner.scan_devices(adapter=adapter, refresh=True)
         return [(device.name or "<unnamed>", getattr(device, "address", "")) for device in devices]
 
     def _on_discover_success(self, result: object) -> None:
@@ -979,7 +990,7 @@ class MainWindow(QMainWindow):
         device = payload.get("device_address")
         settings = self._current_settings()
         resolved_ble_password = ble_password or settings.ble_password or "DWARF_12345678"
-        provisioner = DwarfBleProvisioner()
+        provisioner = self._ble_provisioner(settings)
         try:
             networks = await provisioner.fetch_wifi_list(
                 device=device if device else None,
@@ -1040,6 +1051,7 @@ class MainWindow(QMainWindow):
             adapter=settings.ble_adapter,
             ble_password=payload.get("ble_password"),
             device_address=payload.get("device_address"),
+            provisioner=self._ble_provisioner(settings),
         )
 
     def _on_provision_success(self) -> None:
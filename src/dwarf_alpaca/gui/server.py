@@ -91,6 +91,7 @@ class ServerService(QObject):
     async def _run(self, settings: Settings) -> None:
         structlog.configure(
             processors=[
+                structlog.stdlib.filter_by_level,
                 structlog.processors.TimeStamper(fmt="iso"),
                 structlog.stdlib.add_log_level,
                 structlog.processors.StackInfoRenderer(),
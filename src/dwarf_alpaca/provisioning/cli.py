@@ -6,7 +6,8 @@ from typing import Sequence
 
 from ..config.settings import Settings
 from ..dwarf.ble_packets import DEFAULT_BLE_PASSWORD
-from ..dwarf.ble_provisioner import DwarfBleProvisioner, ProvisioningError
+from ..dwarf.ble_provisioner import BLEDevice, DwarfBleProvisioner, ProvisioningError
+from ..dwarf.state import ConnectivityState
 from .workflow import create_state_store, provision_sta
 
 
@@ -57,7 +58,6 @@ async def provision_guide_command(
     resolved_adapter = adapter or settings.ble_adapter
     state_store = create_state_store(settings.state_directory)
     state = state_store.load()
-    provisioner = DwarfBleProvisioner(response_timeout=settings.ble_response_timeout_seconds)
 
     devices = await DwarfBleProvisioner.discover_devices(adapter=resolved_adapter)
     if not devices:
@@ -90,6 +90,31 @@ async def provision_guide_command(
             secret=False,
         )
 
+    # Keep one BLE link open for the Wi-Fi list and every provisioning attempt.
+    async with DwarfBleProvisioner(
+        response_timeout=settings.ble_response_timeout_seconds,
+        device=chosen,
+        adapter=resolved_adapter,
+    ) as provisioner:
+        await _guide_wifi_setup(
+            provisioner,
+            settings=settings,
+            state=state,
+            device=chosen,
+            adapter=resolved_adapter,
+            ble_password=resolved_ble_password,
+        )
+
+
+async def _guide_wifi_setup(
+    provisioner: DwarfBleProvisioner,
+    *,
+    settings: Settings,
+    state: ConnectivityState,
+    device: BLEDevice,
+    adapter: str | None,
+    ble_password: str,
+) -> None:
     saved_credentials = {
         ssid: password for ssid, password in state.wifi_credentials.items() if ssid and password
     }
@@ -140,9 +165,10 @@ async def provision_guide_command(
                     settings=settings,
                     ssid=chosen_ssid,
                     password=wifi_password,
-                    adapter=resolved_adapter,
-                    ble_password=resolved_ble_password,
-                    device_address=chosen.address,
+                    adapter=adapter,
+                    ble_password=ble_password,
+                    device_address=device.address,
+                    provisioner=provisioner,
                 )
             except RuntimeError as exc:
                 print(f"⚠️  Provisioning with saved Wi-Fi '{chosen_ssid}' failed: {exc}")
@@ -157,9 +183,9 @@ async def provision_guide_command(
     print("📡 Requesting Wi-Fi networks (this may take a few seconds)…")
     try:
         wifi_list = await provisioner.fetch_wifi_list(
-            device=chosen,
-            adapter=resolved_adapter,
-            ble_password=resolved_ble_password,
+            device=device,
+            adapter=adapter,
+            ble_password=ble_password,
             timeout=settings.provisioning_timeout_seconds,
         )
         ssid_options = sorted({ssid for ssid in wifi_list if ssid})
@@ -211,8 +237,9 @@ async def provision_guide_command(
         settings=settings,
         ssid=ssid,
         password=wifi_password,
-        adapter=resolved_adapter,
-        ble_password=resolved_ble_password,
-        device_address=chosen.address,
+        adapter=adapter,
+        ble_password=ble_password,
+        device_address=device.address,
+        provisioner=provisioner,
     )
     print("✅ Provisioning completed. Check var/connectivity.json for the reported STA IP.")
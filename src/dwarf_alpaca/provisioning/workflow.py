@@ -19,8 +19,12 @@ async def provision_sta(
     adapter: str | None,
     ble_password: str | None,
     device_address: str | None = None,
+    provisioner: DwarfBleProvisioner | None = None,
 ) -> None:
-    """Provision DWARF onto the local WLAN using BLE."""
+    """Provision DWARF onto the local WLAN using BLE.
+
+    Pass ``provisioner`` to reuse a link the caller already holds open.
+    """
 
     state_store = create_state_store(settings.state_directory)
 
@@ -31,7 +35,8 @@ async def provision_sta(
         state_store.record_error("Wi-Fi password missing for provisioning")
         raise RuntimeError("Wi-Fi password is required for provisioning")
 
-    provisioner = DwarfBleProvisioner(response_timeout=settings.ble_response_timeout_seconds)
+    if provisioner is None:
+        provisioner = DwarfBleProvisioner(response_timeout=settings.ble_response_timeout_seconds)
 
     resolved_adapter = adapter or settings.ble_adapter
     resolved_password = ble_password or settings.ble_password
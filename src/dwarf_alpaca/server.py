@@ -140,6 +140,7 @@ async def run_server(settings: Settings) -> None:
     """Launch the Alpaca server and discovery responder."""
     structlog.configure(
         processors=[
+            structlog.stdlib.filter_by_level,
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.stdlib.add_log_level,
             structlog.processors.StackInfoRenderer(),
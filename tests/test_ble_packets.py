@@ -0,0 +1,59 @@
+import pytest
+
+from dwarf_alpaca.dwarf.ble_packets import (
+    BlePacketError,
+    build_req_getconfig,
+    build_req_getwifilist,
+    calculate_crc16,
+    parse_notification,
+)
+from dwarf_alpaca.proto import ble_pb2
+
+
+def _bitwise_crc16(data: bytes) -> int:
+    crc = 0xFFFF
+    for value in data:
+        crc ^= value
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def test_crc16_matches_modbus_reference() -> None:
+    assert calculate_crc16(b"123456789") == 0x4B37
+    payload = bytes(range(256)) * 3
+    assert calculate_crc16(payload) == _bitwise_crc16(payload)
+
+
+def test_build_frame_layout() -> None:
+    assert build_req_getconfig("pw")[2] == 1
+    frame = build_req_getwifilist()
+    assert frame[0] == 0xAA
+    assert frame[2] == 6
+    assert frame[-1] == 0x0D
+    length = int.from_bytes(frame[7:9], "big")
+    assert len(frame) == 9 + length + 3
+    assert int.from_bytes(frame[9 + length : 11 + length], "big") == calculate_crc16(
+        frame[: 9 + length]
+    )
+
+
+def test_parse_notification_round_trip() -> None:
+    message = ble_pb2.ResWifilist(cmd=6, code=0)
+    message.ssid.extend(["Home", "Office"])
+    payload = message.SerializeToString()
+    raw = bytearray([0xAA, 0x01, 6, 0x00, 0x01, 0x00, 0x00])
+    raw += len(payload).to_bytes(2, "big") + payload
+    raw += calculate_crc16(bytes(raw)).to_bytes(2, "big") + b"\x0d"
+
+    packet = parse_notification(bytes(raw))
+
+    assert packet.cmd == 6
+    assert list(packet.payload.ssid) == ["Home", "Office"]
+
+
+def test_parse_notification_rejects_unknown_command() -> None:
+    raw = bytearray([0xAA, 0x01, 42, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00])
+    raw += calculate_crc16(bytes(raw)).to_bytes(2, "big") + b"\x0d"
+    with pytest.raises(BlePacketError, match="Unknown BLE command 42"):
+        parse_notification(bytes(raw))
@@ -1,10 +1,12 @@
 import asyncio
 import types
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 
 from dwarf_alpaca.config.settings import Settings
+from dwarf_alpaca.devices import camera
 from dwarf_alpaca.devices.camera import state as camera_state
 from dwarf_alpaca.dwarf.session import get_session
 from dwarf_alpaca.server import build_app
@@ -327,3 +329,15 @@ def test_camera_temperature_reflects_session_state():
     session.camera_state.temperature_c = None
     camera_state.ccd_temperature = 25.0
     camera_state.heatsink_temperature = 25.0
+
+
+def test_image_readout_converts_each_frame_once():
+    frame = np.arange(6, dtype=np.uint16).reshape(2, 3)
+
+    first, type_code = camera._readout_image_array(frame)
+    second, _ = camera._readout_image_array(frame)
+
+    assert type_code == 2
+    assert first.dtype == np.int32
+    assert second is first
+    assert camera._readout_image_array(frame.copy())[0] is not first
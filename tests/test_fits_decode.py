@@ -1,6 +1,7 @@
 import numpy as np
+import pytest
 
-from dwarf_alpaca.dwarf.session import DwarfSession
+from dwarf_alpaca.dwarf.session import DwarfSession, _FitsScratch
 
 
 def _fits_card(keyword: str, value: str) -> bytes:
@@ -11,7 +12,7 @@ def _fits_end_card() -> bytes:
     return "END".ljust(80).encode("ascii")
 
 
-def _build_test_fits() -> bytes:
+def _build_test_fits(bzero: str = "0", pixels: tuple[int, ...] = (0, 100, 200, 300)) -> bytes:
     cards = [
         _fits_card("SIMPLE", "T"),
         _fits_card("BITPIX", "16"),
@@ -19,13 +20,13 @@ def _build_test_fits() -> bytes:
         _fits_card("NAXIS1", "2"),
         _fits_card("NAXIS2", "2"),
         _fits_card("BSCALE", "1"),
-        _fits_card("BZERO", "0"),
+        _fits_card("BZERO", bzero),
         _fits_end_card(),
     ]
     header = b"".join(cards)
     padding = (2880 - (len(header) % 2880)) % 2880
     header += b" " * padding
-    pixel_values = np.array([0, 100, 200, 300], dtype=">i2")
+    pixel_values = np.array(pixels, dtype=">i2")
     data = pixel_values.tobytes()
     return header + data
 
@@ -37,3 +38,124 @@ def test_decode_fits_basic():
     assert frame.dtype == np.uint16
     expected = np.array([[0, 100], [200, 300]], dtype=np.uint16)
     np.testing.assert_array_equal(frame, expected)
+
+
+def test_decode_fits_unsigned_16_bit_offset():
+    fits_bytes = _build_test_fits(bzero="32768", pixels=(-32768, -1, 0, 32767))
+    frame = DwarfSession._decode_fits(fits_bytes)
+    assert frame.dtype == np.uint16
+    expected = np.array([[0, 32767], [32768, 65535]], dtype=np.uint16)
+    np.testing.assert_array_equal(frame, expected)
+
+
+def test_decode_fits_skips_unrelated_cards_and_unaligned_end():
+    base = _build_test_fits()
+    extra = _fits_card("OBJECT", "'THE END'") + "COMMENT  not END here".ljust(80).encode("ascii")
+    cards = base[:80] + extra + base[80 : 80 * 8]
+    padding = (2880 - (len(cards) % 2880)) % 2880
+    fits_bytes = cards + b" " * padding + base[2880:]
+
+    frame = DwarfSession._decode_fits(fits_bytes)
+
+    np.testing.assert_array_equal(frame, np.array([[0, 100], [200, 300]], dtype=np.uint16))
+
+
+def test_decode_fits_rejects_header_without_end():
+    with pytest.raises(ValueError, match="fits_header_incomplete"):
+        DwarfSession._decode_fits(_fits_card("SIMPLE", "T") * 3)
+
+
+def test_decode_fits_integer_offset_clips_without_float_math():
+    fits_bytes = _build_test_fits(bzero="-100", pixels=(50, 100, 150, 32767))
+    frame = DwarfSession._decode_fits(fits_bytes)
+    assert frame.dtype == np.uint16
+    np.testing.assert_array_equal(frame, np.array([[0, 0], [50, 32667]], dtype=np.uint16))
+
+
+def test_decode_fits_fractional_offset_truncates():
+    fits_bytes = _build_test_fits(bzero="0.5", pixels=(-10, 1, 2, 32767))
+    frame = DwarfSession._decode_fits(fits_bytes)
+    assert frame.dtype == np.uint16
+    np.testing.assert_array_equal(frame, np.array([[0, 1], [2, 32767]], dtype=np.uint16))
+
+
+@pytest.mark.parametrize(("bzero", "fill"), [("-40000", 0), ("100000", 65535)])
+def test_decode_fits_offset_outside_uint16_range_saturates(bzero, fill):
+    frame = DwarfSession._decode_fits(_build_test_fits(bzero=bzero, pixels=(-32768, 0, 1, 32767)))
+    np.testing.assert_array_equal(frame, np.full((2, 2), fill, dtype=np.uint16))
+
+
+def test_decode_fits_unsigned_64_bit_offset_uses_float_path():
+    header = b"".join(
+        [
+            _fits_card("SIMPLE", "T"),
+            _fits_card("BITPIX", "64"),
+            _fits_card("NAXIS", "2"),
+            _fits_card("NAXIS1", "4"),
+            _fits_card("NAXIS2", "1"),
+            _fits_card("BZERO", str(2**63)),
+            _fits_end_card(),
+        ]
+    )
+    values = np.array([-(2**63), 0, 2**63 - 1, -(2**63)], dtype=">i8")
+
+    frame = DwarfSession._decode_fits(header.ljust(2880) + values.tobytes())
+
+    np.testing.assert_array_equal(frame, np.array([[0, 65535, 65535, 0]], dtype=np.uint16))
+
+
+@pytest.mark.parametrize(
+    ("bscale", "bzero"), [("0.1", "100.3"), ("0.7", "0"), ("0.5", "0.25"), ("3", "-7.5")]
+)
+def test_decode_fits_scaled_frame_matches_float64_reference(bscale, bzero):
+    # Every 16-bit value, so rounding near integer boundaries cannot hide.
+    values = np.arange(-32768, 32768, dtype=">i2")
+    header = b"".join(
+        [
+            _fits_card("SIMPLE", "T"),
+            _fits_card("BITPIX", "16"),
+            _fits_card("NAXIS", "2"),
+            _fits_card("NAXIS1", "256"),
+            _fits_card("NAXIS2", "256"),
+            _fits_card("BSCALE", bscale),
+            _fits_card("BZERO", bzero),
+            _fits_end_card(),
+        ]
+    )
+
+    frame = DwarfSession._decode_fits(header.ljust(2880) + values.tobytes())
+
+    reference = values.astype(np.float64) * float(bscale) + float(bzero)
+    expected = np.clip(reference, 0, 65535).astype(np.uint16).reshape(256, 256)
+    np.testing.assert_array_equal(frame, expected)
+
+
+def test_decode_fits_reuses_scratch_buffer_for_scaled_frames():
+    scratch = _FitsScratch()
+    fits_bytes = _build_test_fits(bzero="0.5", pixels=(1, 2, 3, 4))
+
+    first = DwarfSession._decode_fits(fits_bytes, scratch=scratch)
+    buffer = scratch.buffer
+    second = DwarfSession._decode_fits(fits_bytes, scratch=scratch)
+
+    assert buffer is not None and scratch.buffer is buffer
+    assert not np.shares_memory(first, buffer) and not np.shares_memory(first, second)
+    np.testing.assert_array_equal(second, np.array([[1, 2], [3, 4]], dtype=np.uint16))
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("  42 ", 42),
+        ("-7", -7),
+        ("1.5", 1.5),
+        ("2E3", 2000.0),
+        ("3e-2", 0.03),
+        ("'M42     '", "M42     "),
+        ("T", True),
+        ("NaNish", "NaNish"),
+        ("", None),
+    ],
+)
+def test_parse_fits_value_dispatches_by_literal_kind(raw, expected):
+    assert DwarfSession._parse_fits_value(raw) == expected
@@ -62,7 +62,7 @@ async def test_continuous_move_triggers_trim_on_overshoot():
     async def fake_send_and_check(module_id, command_id, request):
         if command_id == protocol_pb2.DwarfCMD.CMD_FOCUS_START_MANUAL_CONTINU_FOCUS:
             session.focuser_state.position = 620
-            session.focuser_state.last_update = time.time()
+            session.focuser_state.last_update = time.monotonic()
             session._focus_update_event.set()
         elif command_id == protocol_pb2.DwarfCMD.CMD_FOCUS_STOP_MANUAL_CONTINU_FOCUS:
             session._focus_update_event.set()
@@ -0,0 +1,401 @@
+import asyncio
+import socket
+import threading
+from ftplib import error_perm
+
+import pytest
+
+from dwarf_alpaca.dwarf import ftp_client
+from dwarf_alpaca.dwarf.ftp_client import DwarfFtpClient
+
+
+class FakeFTP:
+    """In-memory stand-in for ``ftplib.FTP`` serving a fixed directory tree."""
+
+    files: dict[str, dict[str, tuple[str, bytes]]] = {}
+    instances: list["FakeFTP"] = []
+    supports_mlsd = True
+    dir_stamps: dict[str, str] = {}
+
+    def __init__(self) -> None:
+        self.cwd_path = "/"
+        self.commands: list[str] = []
+        self.closed = False
+        self.pending_replies: list[str] = []
+        FakeFTP.instances.append(self)
+
+    def connect(self, host, port, timeout=None):
+        self.commands.append("CONNECT")
+
+    def login(self, user, passwd):
+        self.commands.append("LOGIN")
+
+    def set_pasv(self, value):
+        pass
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+    def voidcmd(self, cmd):
+        self.commands.append(cmd)
+        return "200 OK"
+
+    def pwd(self):
+        self.commands.append("PWD")
+        return self.cwd_path
+
+    def cwd(self, path):
+        self.commands.append(f"CWD {path}")
+        if path != "/" and path not in self.files:
+            raise error_perm("550 No such directory")
+        self.cwd_path = path
+
+    def _resolve_dir(self, path):
+        directory = path if path is not None else self.cwd_path
+        if directory not in self.files:
+            raise error_perm("550 No such directory")
+        return directory
+
+    def nlst(self, *args):
+        self.commands.append("NLST")
+        directory = self._resolve_dir(args[0] if args else None)
+        return list(self.files[directory])
+
+    def mlsd(self, path="", facts=()):
+        self.commands.append(f"MLSD {path}")
+        if not self.supports_mlsd:
+            raise error_perm("500 Unknown command")
+        if path not in self.files:
+            raise error_perm("550 No such directory")
+        for name, (modify, _) in self.files[path].items():
+            yield name, {"type": "file", "modify": modify}
+
+    def sendcmd(self, cmd):
+        self.commands.append(cmd)
+        verb, _, argument = cmd.partition(" ")
+        if verb == "MDTM":
+            if argument in self.dir_stamps:
+                return f"213 {self.dir_stamps[argument]}"
+            directory, _, name = argument.rpartition("/")
+            directory = directory or self.cwd_path
+            entry = self.files.get(directory, {}).get(name)
+            if entry is None:
+                raise error_perm("550 No such file")
+            return f"213 {entry[0]}"
+        raise error_perm("500 Unknown command")
+
+    def putline(self, line):
+        try:
+            self.pending_replies.append(self.sendcmd(line))
+        except error_perm as exc:
+            self.pending_replies.append(str(exc))
+
+    def getmultiline(self):
+        return self.pending_replies.pop(0)
+
+    def retrbinary(self, cmd, callback, blocksize=8192, rest=None):
+        self.commands.append("RETR")
+        path = cmd.split(" ", 1)[1]
+        directory, _, name = path.rpartition("/")
+        content = self.files[directory][name][1]
+        for offset in range(0, len(content), blocksize):
+            callback(content[offset : offset + blocksize])
+        return "226 Transfer complete"
+
+
+def _all_commands(fake) -> list[str]:
+    return [command for instance in fake.instances for command in instance.commands]
+
+
+@pytest.fixture
+def fake_ftp(monkeypatch):
+    FakeFTP.instances = []
+    FakeFTP.supports_mlsd = True
+    FakeFTP.dir_stamps = {}
+    FakeFTP.files = {
+        "/Normal_Photos": {
+            "DWARF3_TELE_20240101_000001.jpg": ("20240101000001", b"old"),
+            "DWARF3_TELE_20240101_000005.jpg": ("20240101000005", b"new-photo"),
+            "DWARF3_WIDE_20240101_000009.jpg": ("20240101000009", b"wide"),
+            "notes.txt": ("20240101000010", b"ignored"),
+        },
+    }
+    monkeypatch.setattr(ftp_client, "_DataTunedFTP", FakeFTP)
+    return FakeFTP
+
+
+@pytest.mark.asyncio
+async def test_latest_photo_entry_picks_newest_matching_file(fake_ftp):
+    client = DwarfFtpClient("192.0.2.1")
+
+    entry = await client.get_latest_photo_entry("tele")
+
+    assert entry is not None
+    assert entry.path == "/Normal_Photos/DWARF3_TELE_20240101_000005.jpg"
+    assert entry.timestamp == pytest.approx(1704067205.0)
+
+
+@pytest.mark.asyncio
+async def test_control_connection_is_reused_between_operations(fake_ftp):
+    client = DwarfFtpClient("192.0.2.1", max_connections=1)
+
+    baseline = await client.get_latest_photo_entry("TELE")
+    fake_ftp.files["/Normal_Photos"]["DWARF3_TELE_20240101_000007.jpg"] = (
+        "20240101000007",
+        b"fresh",
+    )
+    capture = await client.wait_for_new_photo(baseline, timeout=1.0)
+
+    assert capture is not None
+    assert capture.content == b"fresh"
+    assert len(fake_ftp.instances) == 1
+    assert fake_ftp.instances[0].commands.count("LOGIN") == 1
+
+    await client.close()
+    assert fake_ftp.instances[0].closed is True
+
+
+@pytest.mark.asyncio
+async def test_connection_is_replaced_after_transport_error(fake_ftp):
+    client = DwarfFtpClient("192.0.2.1", max_connections=1)
+    await client.get_latest_photo_entry("TELE")
+
+    def broken_listing(*args, **kwargs):
+        raise EOFError("connection closed")
+
+    fake_ftp.instances[0].mlsd = broken_listing
+    with pytest.raises(EOFError):
+        await client.get_latest_photo_entry("TELE")
+
+    entry = await client.get_latest_photo_entry("TELE")
+
+    assert entry is not None
+    assert len(fake_ftp.instances) == 2
+    assert fake_ftp.instances[0].closed is True
+
+
+@pytest.mark.asyncio
+async def test_listing_uses_mlsd_without_per_file_mdtm(fake_ftp):
+    client = DwarfFtpClient("192.0.2.1")
+
+    await client.get_latest_photo_entry("TELE")
+
+    commands = _all_commands(fake_ftp)
+    assert not any(command.startswith("MDTM /Normal_Photos/") for command in commands)
+    assert "NLST" not in commands
+
+
+@pytest.mark.asyncio
+async def test_listing_falls_back_to_nlst_without_mlsd(fake_ftp):
+    fake_ftp.supports_mlsd = False
+    client = DwarfFtpClient("192.0.2.1")
+
+    entry = await client.get_latest_photo_entry("TELE")
+    await client.get_latest_photo_entry("TELE")
+
+    commands = _all_commands(fake_ftp)
+    assert entry is not None
+    assert entry.name == "DWARF3_TELE_20240101_000005.jpg"
+    assert entry.timestamp == pytest.approx(1704067205.0)
+    assert commands.count("MLSD /DWARF_mini/Normal_Photos") == 1
+    assert any(command.startswith("MDTM /Normal_Photos/DWARF3_TELE") for command in commands)
+    assert not any(command == "PWD" or command.startswith("CWD") for command in commands)
+
+
+@pytest.mark.asyncio
+async def test_nlst_fallback_pipelines_mdtm_requests(fake_ftp):
+    fake_ftp.supports_mlsd = False
+    client = DwarfFtpClient("192.0.2.1", max_connections=1)
+    sent: list[str] = []
+
+    entry = await client.get_latest_photo_entry("TELE")
+
+    ftp = fake_ftp.instances[0]
+    original_putline = ftp.putline
+
+    def recording_putline(line):
+        sent.append(line)
+        original_putline(line)
+
+    ftp.putline = recording_putline
+    await client.get_latest_photo_entry("TELE")
+
+    assert entry is not None
+    assert entry.timestamp == pytest.approx(1704067205.0)
+    assert sent == [
+        "MDTM /Normal_Photos/DWARF3_TELE_20240101_000001.jpg",
+        "MDTM /Normal_Photos/DWARF3_TELE_20240101_000005.jpg",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_directory_reuses_cached_listing(fake_ftp, monkeypatch):
+    monkeypatch.setattr(ftp_client, "_LISTING_SETTLE_SECONDS", 0.0)
+    fake_ftp.dir_stamps = {"/Normal_Photos": "20240101000005"}
+    client = DwarfFtpClient("192.0.2.1")
+
+    first = await client.get_latest_photo_entry("TELE")
+    second = await client.get_latest_photo_entry("TELE")
+
+    commands = _all_commands(fake_ftp)
+    assert first == second
+    assert commands.count("MLSD /Normal_Photos") == 1
+
+    fake_ftp.files["/Normal_Photos"]["DWARF3_TELE_20240101_000008.jpg"] = (
+        "20240101000008",
+        b"fresh",
+    )
+    fake_ftp.dir_stamps["/Normal_Photos"] = "20240101000008"
+    third = await client.get_latest_photo_entry("TELE")
+
+    assert third is not None
+    assert third.name == "DWARF3_TELE_20240101_000008.jpg"
+
+
+@pytest.mark.asyncio
+async def test_recent_directory_stamp_is_not_trusted(fake_ftp):
+    fake_ftp.dir_stamps = {"/Normal_Photos": "20240101000005"}
+    client = DwarfFtpClient("192.0.2.1")
+
+    await client.get_latest_photo_entry("TELE")
+    fake_ftp.files["/Normal_Photos"]["DWARF3_TELE_20240101_000005b.jpg"] = (
+        "20240101000005",
+        b"same-second",
+    )
+    entries = await client.get_latest_photo_entry("TELE")
+
+    assert entries is not None
+    assert _all_commands(fake_ftp).count("MLSD /Normal_Photos") == 2
+
+
+@pytest.mark.asyncio
+async def test_astro_entries_are_collected_across_raw_directories(fake_ftp):
+    fake_ftp.files = {
+        "/Astronomy": {
+            "DWARF_RAW_M42_1": ("20240101000000", b""),
+            "DWARF_RAW_M31_2": ("20240101000000", b""),
+            "stacked": ("20240101000000", b""),
+        },
+        "/Astronomy/DWARF_RAW_M42_1": {
+            "frame_0001.fits": ("20240101000010", b"a"),
+            "preview.jpg": ("20240101000011", b"b"),
+        },
+        "/Astronomy/DWARF_RAW_M31_2": {
+            "frame_0002.FIT": ("20240101000020", b"c"),
+        },
+    }
+    client = DwarfFtpClient("192.0.2.1")
+
+    entry = await client.get_latest_photo_entry(capture_kind="astro")
+
+    assert entry is not None
+    assert entry.path == "/Astronomy/DWARF_RAW_M31_2/frame_0002.FIT"
+    assert len(fake_ftp.instances) <= client.max_connections
+
+
+@pytest.mark.asyncio
+async def test_astro_listing_fan_out_is_bounded_and_tolerates_failures(fake_ftp, monkeypatch):
+    names = [f"DWARF_RAW_M{index}_{index}" for index in range(10)]
+    fake_ftp.files = {"/Astronomy": {name: ("20240101000000", b"") for name in names}}
+    for index, name in enumerate(names):
+        stamp = f"202401010001{index:02d}"
+        fake_ftp.files[f"/Astronomy/{name}"] = {f"frame_{index}.fits": (stamp, b"x")}
+    original_mlsd = FakeFTP.mlsd
+
+    def flaky_mlsd(self, path="", facts=()):
+        if path == "/Astronomy/DWARF_RAW_M9_9":
+            raise EOFError("connection closed")
+        return original_mlsd(self, path, facts)
+
+    monkeypatch.setattr(FakeFTP, "mlsd", flaky_mlsd)
+    threads = 0
+    original_to_thread = ftp_client.asyncio.to_thread
+
+    async def counting_to_thread(func, *args, **kwargs):
+        nonlocal threads
+        threads += 1
+        return await original_to_thread(func, *args, **kwargs)
+
+    monkeypatch.setattr(ftp_client.asyncio, "to_thread", counting_to_thread)
+    client = DwarfFtpClient("192.0.2.1", max_connections=2)
+
+    entry = await client.get_latest_photo_entry(capture_kind="astro")
+
+    assert entry is not None
+    assert entry.path == "/Astronomy/DWARF_RAW_M8_8/frame_8.fits"
+    # Three root listings plus one worker per pooled connection.
+    assert threads == 3 + client.max_connections
+
+
+def test_data_connections_disable_nagle(monkeypatch):
+    options = []
+
+    class FakeSocket:
+        def setsockopt(self, level, name, value):
+            options.append((level, name, value))
+
+    monkeypatch.setattr(
+        ftp_client.FTP, "ntransfercmd", lambda self, cmd, rest=None: (FakeSocket(), None)
+    )
+
+    conn, _ = ftp_client._DataTunedFTP().ntransfercmd("RETR frame.fits")
+
+    assert isinstance(conn, FakeSocket)
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in options
+
+
+@pytest.mark.asyncio
+async def test_wait_for_new_photo_downloads_detected_entry_once(fake_ftp):
+    client = DwarfFtpClient("192.0.2.1", poll_interval=0.05)
+    baseline = await client.get_latest_photo_entry("TELE")
+    fake_ftp.files["/Normal_Photos"]["DWARF3_TELE_20240101_000007.jpg"] = (
+        "20240101000007",
+        b"fresh",
+    )
+
+    stale = await client.wait_for_new_photo(baseline, timeout=0.2, not_before=1704067300.0)
+    capture = await client.wait_for_new_photo(baseline, timeout=1.0)
+
+    assert stale is None
+    assert capture is not None
+    assert capture.content == b"fresh"
+    assert _all_commands(fake_ftp).count("RETR") == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_download_stops_its_worker_thread(fake_ftp, monkeypatch):
+    path = "/Normal_Photos/DWARF3_TELE_20240101_000009.jpg"
+    fake_ftp.files["/Normal_Photos"][path.rpartition("/")[2]] = ("20240101000009", b"x" * 300_000)
+    monkeypatch.setattr(ftp_client, "_DOWNLOAD_BLOCK_SIZE", 1024)
+    first_block = threading.Event()
+    release = threading.Event()
+    blocks = 0
+    original_retrbinary = FakeFTP.retrbinary
+
+    def slow_retrbinary(self, cmd, callback, blocksize=8192, rest=None):
+        def throttled(block):
+            nonlocal blocks
+            blocks += 1
+            callback(block)
+            first_block.set()
+            release.wait(1.0)
+
+        return original_retrbinary(self, cmd, throttled, blocksize, rest)
+
+    monkeypatch.setattr(FakeFTP, "retrbinary", slow_retrbinary)
+    client = DwarfFtpClient("192.0.2.1", max_connections=1)
+    download = asyncio.create_task(client._download_file(path))
+    await asyncio.to_thread(first_block.wait, 1.0)
+
+    download.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await download
+    release.set()
+    entry = await client.get_latest_photo_entry("TELE")
+
+    assert entry is not None
+    assert blocks <= 2
+    assert fake_ftp.instances[0].closed is True
@@ -31,3 +31,24 @@ async def test_list_astro_fits_parses_app_response(monkeypatch):
     assert result == [
         {"url": "/preview", "isFailed": False, "filePath": "/frame.fit"}
     ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "data",
+    [
+        [{"id": 1}, "junk", {"id": 2}],
+        {"records": [{"id": 1}, "junk", {"id": 2}]},
+        {"totalCount": 2, "mediaList": [{"id": 1}, {"id": 2}, None]},
+        {"a": {"id": 1}, "b": {"id": 2}},
+    ],
+)
+async def test_list_album_media_infos_accepts_firmware_shapes(monkeypatch, data):
+    client = DwarfHttpClient("192.0.2.1")
+
+    async def fake_post(self, path, payload, params=None):
+        return {"code": 0, "data": data}
+
+    monkeypatch.setattr(DwarfHttpClient, "post_json", fake_post)
+
+    assert await client.list_album_media_infos() == [{"id": 1}, {"id": 2}]
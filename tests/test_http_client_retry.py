@@ -0,0 +1,49 @@
+import httpx
+import pytest
+
+from dwarf_alpaca.dwarf import http_client
+from dwarf_alpaca.dwarf.http_client import DwarfHttpClient
+
+
+@pytest.mark.asyncio
+async def test_request_honours_retry_after_and_skips_final_sleep(monkeypatch):
+    sleeps: list[float] = []
+    replies = iter(
+        [
+            httpx.Response(503, headers={"Retry-After": "2"}),
+            httpx.Response(500),
+            httpx.Response(500),
+        ]
+    )
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(http_client.asyncio, "sleep", fake_sleep)
+    client = DwarfHttpClient("192.0.2.1")
+    client._client = httpx.AsyncClient(
+        base_url="http://192.0.2.1:8082",
+        transport=httpx.MockTransport(lambda request: next(replies)),
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get_json("/status")
+    await client.aclose()
+
+    assert len(sleeps) == 2
+    assert sleeps[0] == 2.0
+    assert 0.4 <= sleeps[1] <= 0.5
+
+
+@pytest.mark.parametrize("retry_after", ["3600", "inf", "nan", "-5"])
+def test_retry_after_is_clamped_to_max_delay(retry_after):
+    response = httpx.Response(
+        503,
+        headers={"Retry-After": retry_after},
+        request=httpx.Request("GET", "http://192.0.2.1:8082/status"),
+    )
+    exc = httpx.HTTPStatusError("unavailable", request=response.request, response=response)
+
+    delay = http_client._retry_delay(0, exc)
+
+    assert 0.0 <= delay <= http_client._RETRY_MAX_DELAY
@@ -1,3 +1,8 @@
+import json
+
+import structlog
+
+from dwarf_alpaca.dwarf import session as session_module
 from dwarf_alpaca.proto.dwarf_messages import ReqsetMasterLock
 
 
@@ -11,3 +16,19 @@ def test_master_lock_round_trip():
     decoded.ParseFromString(encoded)
 
     assert decoded.lock is True
+
+
+def test_lazy_log_payload_renders_message_only_on_demand(monkeypatch):
+    calls = []
+
+    def fake_message_to_log(message):
+        calls.append(message)
+        return {"lock": message.lock}
+
+    monkeypatch.setattr(session_module, "_message_to_log", fake_message_to_log)
+    payload = session_module._LazyMsg(ReqsetMasterLock(lock=True))
+
+    assert calls == []
+    rendered = structlog.processors.JSONRenderer()(None, "info", {"payload": payload})
+    assert json.loads(rendered) == {"payload": {"lock": True}}
+    assert len(calls) == 1
@@ -5,6 +5,13 @@ from dwarf_alpaca.provisioning.cli import provision_guide_command
 from dwarf_alpaca.provisioning.workflow import create_state_store, provision_sta
 
 
+@pytest.fixture(autouse=True)
+def _isolated_scan_cache(monkeypatch):
+    from dwarf_alpaca.dwarf.ble_provisioner import DwarfBleProvisioner
+
+    monkeypatch.setattr(DwarfBleProvisioner, "_scan_cache", {})
+
+
 @pytest.mark.asyncio
 async def test_provision_sta_saves_wifi_password(tmp_path, monkeypatch):
     settings = Settings(state_directory=tmp_path, ble_password="blepass")
@@ -92,6 +99,9 @@ async def test_guide_reuses_saved_wifi_password(tmp_path, monkeypatch):
     async def fake_discover_devices(*, adapter=None, timeout=10.0):
         return [FakeDevice()]
 
+    async def fake_connect(self, device=None, *, adapter=None):
+        return True
+
     fetch_called = False
 
     async def fake_fetch_wifi_list(self, *, device, adapter, ble_password, timeout=None):
@@ -114,7 +124,7 @@ async def test_guide_reuses_saved_wifi_password(tmp_path, monkeypatch):
     recorded = {}
 
     async def fake_provision_sta(
-        *, settings, ssid, password, adapter, ble_password, device_address
+        *, settings, ssid, password, adapter, ble_password, device_address, provisioner
     ):
         recorded.update(
             ssid=ssid,
@@ -129,6 +139,11 @@ async def test_guide_reuses_saved_wifi_password(tmp_path, monkeypatch):
         staticmethod(fake_discover_devices),
         raising=True,
     )
+    monkeypatch.setattr(
+        "dwarf_alpaca.provisioning.cli.DwarfBleProvisioner.connect",
+        fake_connect,
+        raising=True,
+    )
     monkeypatch.setattr(
         "dwarf_alpaca.provisioning.cli.DwarfBleProvisioner.fetch_wifi_list",
         fake_fetch_wifi_list,
@@ -169,11 +184,16 @@ async def test_guide_saved_wifi_fallbacks_to_scan(tmp_path, monkeypatch):
     async def fake_discover_devices(*, adapter=None, timeout=10.0):
         return [FakeDevice()]
 
+    async def fake_connect(self, device=None, *, adapter=None):
+        return True
+
     fetch_calls = 0
+    provisioners: list[object] = []
 
     async def fake_fetch_wifi_list(self, *, device, adapter, ble_password, timeout=None):
         nonlocal fetch_calls
         fetch_calls += 1
+        provisioners.append(self)
         return ["MyHome", "Other"]
 
     responses = iter(["1", "", "2", "fallbackpass"])
@@ -189,7 +209,7 @@ async def test_guide_saved_wifi_fallbacks_to_scan(tmp_path, monkeypatch):
     calls: list[dict[str, str | None]] = []
 
     async def fake_provision_sta(
-        *, settings, ssid, password, adapter, ble_password, device_address
+        *, settings, ssid, password, adapter, ble_password, device_address, provisioner
     ):
         calls.append(
             dict(
@@ -200,6 +220,7 @@ async def test_guide_saved_wifi_fallbacks_to_scan(tmp_path, monkeypatch):
                 device_address=device_address,
             )
         )
+        provisioners.append(provisioner)
         if len(calls) == 1:
             raise RuntimeError("network unreachable")
 
@@ -208,6 +229,11 @@ async def test_guide_saved_wifi_fallbacks_to_scan(tmp_path, monkeypatch):
         staticmethod(fake_discover_devices),
         raising=True,
     )
+    monkeypatch.setattr(
+        "dwarf_alpaca.provisioning.cli.DwarfBleProvisioner.connect",
+        fake_connect,
+        raising=True,
+    )
     monkeypatch.setattr(
         "dwarf_alpaca.provisioning.cli.DwarfBleProvisioner.fetch_wifi_list",
         fake_fetch_wifi_list,
@@ -231,6 +257,8 @@ async def test_guide_saved_wifi_fallbacks_to_scan(tmp_path, monkeypatch):
     assert calls[1]["ssid"] == "Other"
     assert calls[1]["password"] == "fallbackpass"
     assert fetch_calls == 1
+    assert len(provisioners) == 3
+    assert len({id(provisioner) for provisioner in provisioners}) == 1
     assert any(msg.startswith("Select Wi-Fi network") for msg in prompts)
 
 
@@ -245,6 +273,9 @@ async def test_guide_reprompts_on_empty_password(tmp_path, monkeypatch):
     async def fake_discover_devices(*, adapter=None, timeout=10.0):
         return [FakeDevice()]
 
+    async def fake_connect(self, device=None, *, adapter=None):
+        return True
+
     async def fake_fetch_wifi_list(self, *, device, adapter, ble_password, timeout=None):
         return ["MyHome"]
 
@@ -261,7 +292,7 @@ async def test_guide_reprompts_on_empty_password(tmp_path, monkeypatch):
     recorded = {}
 
     async def fake_provision_sta(
-        *, settings, ssid, password, adapter, ble_password, device_address
+        *, settings, ssid, password, adapter, ble_password, device_address, provisioner
     ):
         recorded.update(
             ssid=ssid,
@@ -276,6 +307,11 @@ async def test_guide_reprompts_on_empty_password(tmp_path, monkeypatch):
         staticmethod(fake_discover_devices),
         raising=True,
     )
+    monkeypatch.setattr(
+        "dwarf_alpaca.provisioning.cli.DwarfBleProvisioner.connect",
+        fake_connect,
+        raising=True,
+    )
     monkeypatch.setattr(
         "dwarf_alpaca.provisioning.cli.DwarfBleProvisioner.fetch_wifi_list",
         fake_fetch_wifi_list,
@@ -297,3 +333,170 @@ async def test_guide_reprompts_on_empty_password(tmp_path, monkeypatch):
     assert recorded["ssid"] == "MyHome"
     assert recorded["password"] == "newpass"
     assert prompts.count("Enter Wi-Fi password") == 2
+
+
+@pytest.mark.asyncio
+async def test_provisioner_reuses_recent_scan(monkeypatch):
+    from dwarf_alpaca.dwarf.ble_provisioner import DwarfBleProvisioner
+
+    class FakeDevice:
+        name = "DWARF3"
+        address = "AA:BB"
+
+    scans = 0
+
+    async def fake_discover_devices(*, adapter=None, timeout=10.0):
+        nonlocal scans
+        scans += 1
+        return [FakeDevice()]
+
+    monkeypatch.setattr(
+        "dwarf_alpaca.dwarf.ble_provisioner.DwarfBleProvisioner.discover_devices",
+        staticmethod(fake_discover_devices),
+        raising=True,
+    )
+
+    provisioner = DwarfBleProvisioner()
+    first = await provisioner._ensure_device("aa:bb", adapter=None)
+    second = await provisioner._ensure_device(None, adapter=None)
+
+    assert first is second
+    assert scans == 1
+
+    # A provisioner built for a later step reuses the same scan.
+    third = await DwarfBleProvisioner()._ensure_device("AA:BB", adapter=None)
+    assert third is first
+    assert scans == 1
+
+    await provisioner._ensure_device(None, adapter="hci1")
+    assert scans == 2
+
+    await DwarfBleProvisioner().scan_devices(adapter=None, refresh=True)
+    assert scans == 3
+
+
+@pytest.mark.asyncio
+async def test_provisioner_shares_connection_between_operations(monkeypatch):
+    from dwarf_alpaca.dwarf import ble_packets
+    from dwarf_alpaca.dwarf.ble_provisioner import DwarfBleProvisioner
+    from dwarf_alpaca.proto import ble_pb2
+
+    class FakeDevice:
+        name = "DWARF3"
+        address = "AA:BB"
+
+    connects = 0
+
+    class FakeClient:
+        def __init__(self, device, adapter=None):
+            self._handler = None
+
+        async def connect(self):
+            nonlocal connects
+            connects += 1
+
+        async def disconnect(self):
+            return None
+
+        async def start_notify(self, uuid, handler):
+            self._handler = handler
+
+        async def stop_notify(self, uuid):
+            self._handler = None
+
+        async def write_gatt_char(self, uuid, data, response=True):
+            cmd = data[2]
+            if cmd == 1:
+                reply = ble_pb2.ResGetconfig(
+                    cmd=1, code=0, state=2, wifi_mode=2, ssid="Home", ip="10.0.0.7"
+                )
+            else:
+                reply = ble_pb2.ResWifilist(cmd=6, code=0, ssid=["Home", "Other"])
+            self._handler(0, bytearray(ble_packets._build_frame(cmd, reply.SerializeToString())))
+
+    async def fake_discover_devices(*, adapter=None, timeout=10.0):
+        return [FakeDevice()]
+
+    monkeypatch.setattr("dwarf_alpaca.dwarf.ble_provisioner.BleakClient", FakeClient)
+    monkeypatch.setattr(
+        "dwarf_alpaca.dwarf.ble_provisioner.DwarfBleProvisioner.discover_devices",
+        staticmethod(fake_discover_devices),
+        raising=True,
+    )
+
+    async with DwarfBleProvisioner(device="AA:BB") as provisioner:
+        networks = await provisioner.fetch_wifi_list(
+            device=None, adapter=None, ble_password="blepass"
+        )
+        result = await provisioner.provision("Home", "secret", ble_password="blepass")
+
+    assert networks == ["Home", "Other"]
+    assert result.success is True
+    assert result.sta_ip == "10.0.0.7"
+    assert connects == 1
+
+
+class _FakeCharacteristic:
+    def __init__(self, properties):
+        self.properties = properties
+
+
+class _FakeServices:
+    def __init__(self, properties):
+        self._characteristic = _FakeCharacteristic(properties)
+
+    def get_characteristic(self, uuid):
+        return self._characteristic
+
+
+class _RecordingWriteClient:
+    def __init__(self, properties, *, reject_unacknowledged=False):
+        self.services = _FakeServices(properties)
+        self.writes = []
+        self._reject_unacknowledged = reject_unacknowledged
+
+    async def write_gatt_char(self, uuid, data, response=True):
+        if not response and self._reject_unacknowledged:
+            from dwarf_alpaca.dwarf.ble_provisioner import BleakError
+
+            raise BleakError("write without response not permitted")
+        self.writes.append(response)
+
+
+@pytest.mark.asyncio
+async def test_query_writes_skip_ack_when_characteristic_allows_it():
+    from dwarf_alpaca.dwarf.ble_provisioner import DwarfBleProvisioner
+
+    provisioner = DwarfBleProvisioner()
+    client = _RecordingWriteClient(["write", "write-without-response", "notify"])
+
+    await provisioner._write_cmd(client, b"query", require_ack=False)
+    await provisioner._write_cmd(client, b"sta", require_ack=True)
+
+    assert client.writes == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_query_writes_need_ack_without_write_without_response_property():
+    from dwarf_alpaca.dwarf.ble_provisioner import DwarfBleProvisioner
+
+    provisioner = DwarfBleProvisioner()
+    client = _RecordingWriteClient(["write", "notify"])
+
+    await provisioner._write_cmd(client, b"query", require_ack=False)
+
+    assert client.writes == [True]
+
+
+@pytest.mark.asyncio
+async def test_rejected_unacknowledged_write_falls_back_and_sticks():
+    from dwarf_alpaca.dwarf.ble_provisioner import DwarfBleProvisioner
+
+    provisioner = DwarfBleProvisioner()
+    client = _RecordingWriteClient(["write", "write-without-response"], reject_unacknowledged=True)
+
+    await provisioner._write_cmd(client, b"query", require_ack=False)
+    await provisioner._write_cmd(client, b"query", require_ack=False)
+
+    assert client.writes == [True, True]
+    assert provisioner._write_without_response is False
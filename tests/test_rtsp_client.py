@@ -0,0 +1,138 @@
+import asyncio
+
+import av
+import numpy as np
+import pytest
+
+from dwarf_alpaca.dwarf import rtsp_client
+from dwarf_alpaca.dwarf.rtsp_client import DwarfRtspClient, to_bgr
+
+
+def _frame(seed: int, *, height: int = 37, width: int = 50) -> av.VideoFrame:
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    return av.VideoFrame.from_ndarray(pixels, format="bgr24")
+
+
+def test_convert_frame_matches_to_ndarray_and_reuses_buffers():
+    client = DwarfRtspClient(
+        "rtsp://example.invalid/stream", buffer_size=1, preferred_format="bgr24"
+    )
+    frames = [_frame(seed) for seed in range(4)]
+
+    converted = [client._convert_frame(frame).copy() for frame in frames[:3]]
+    reused = client._convert_frame(frames[3])
+
+    for frame, image in zip(frames, converted):
+        assert np.array_equal(image, frame.to_ndarray(format="bgr24"))
+    assert len(client._buffers) == 3
+    assert reused is client._buffers[0]
+
+
+def test_convert_frame_reallocates_when_stream_size_changes():
+    client = DwarfRtspClient(
+        "rtsp://example.invalid/stream", buffer_size=1, preferred_format="bgr24"
+    )
+
+    client._convert_frame(_frame(0))
+    image = client._convert_frame(_frame(1, height=20, width=30))
+
+    assert image.shape == (20, 30, 3)
+    assert all(buffer.shape == (20, 30, 3) for buffer in client._buffers)
+
+
+def test_yuv420p_frames_are_kept_planar_until_requested():
+    client = DwarfRtspClient("rtsp://example.invalid/stream", buffer_size=1)
+    frame = _frame(2, height=36, width=50).reformat(format="yuv420p")
+
+    image = client._convert_frame(frame)
+
+    assert image.shape == (54, 50)
+    assert np.array_equal(image, frame.to_ndarray())
+    assert to_bgr(image).shape == (36, 50, 3)
+
+
+class _FakeStream:
+    thread_type = None
+
+
+class _FakePacket:
+    def __init__(self, frame, is_keyframe=True):
+        self.frame = frame
+        self.is_keyframe = is_keyframe
+        self.size = 1
+        self.decoded = False
+
+    def decode(self):
+        self.decoded = True
+        return [self.frame]
+
+
+class _FakeContainer:
+    def __init__(self, frames, keyframes=None):
+        self.packets = [
+            _FakePacket(frame, keyframes is None or index in keyframes)
+            for index, frame in enumerate(frames)
+        ]
+        self.streams = type("Streams", (), {"video": [_FakeStream()]})()
+        self.closed = False
+
+    def demux(self, stream):
+        yield from self.packets
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_read_frame_serves_latest_decoded_frame(monkeypatch):
+    frames = [_frame(seed, height=36) for seed in range(3)]
+    container = _FakeContainer(frames)
+    monkeypatch.setattr(rtsp_client.av, "open", lambda url, format=None: container)
+    client = DwarfRtspClient(
+        "rtsp://example.invalid/stream", buffer_size=1, preferred_format="bgr24"
+    )
+
+    await client.start()
+    await asyncio.sleep(0.05)
+    image = await client.read_frame()
+    await client.stop()
+
+    assert np.array_equal(image, frames[-1].to_ndarray(format="bgr24"))
+    assert container.closed is True
+
+
+@pytest.mark.asyncio
+async def test_concurrent_readers_share_the_same_frame(monkeypatch):
+    container = _FakeContainer([_frame(0, height=36)])
+    monkeypatch.setattr(rtsp_client.av, "open", lambda url, format=None: container)
+    client = DwarfRtspClient("rtsp://example.invalid/stream", preferred_format="bgr24")
+    client._frame_cond = asyncio.Condition()
+    client._stop_event = asyncio.Event()
+
+    readers = [asyncio.create_task(client.read_frame(timeout=1.0)) for _ in range(2)]
+    await asyncio.sleep(0)
+    await client._reader()
+    first, second = await asyncio.gather(*readers)
+
+    assert first is second
+    assert first.flags.writeable is False
+    with pytest.raises(asyncio.TimeoutError):
+        await client.read_frame(timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_reader_skips_non_key_packets_while_frames_go_unread(monkeypatch):
+    frames = [_frame(seed, height=36) for seed in range(5)]
+    container = _FakeContainer(frames, keyframes={0, 3})
+    monkeypatch.setattr(rtsp_client.av, "open", lambda url, format=None: container)
+    monkeypatch.setattr(rtsp_client, "_BACKLOG_SECONDS", -1.0)
+    client = DwarfRtspClient("rtsp://example.invalid/stream", preferred_format="bgr24")
+    client._frame_cond = asyncio.Condition()
+    client._stop_event = asyncio.Event()
+
+    await client._reader()
+
+    assert [packet.decoded for packet in container.packets] == [True, False, False, True, False]
+    image = await client.read_frame(timeout=0.1)
+    assert np.array_equal(image, frames[3].to_ndarray(format="bgr24"))
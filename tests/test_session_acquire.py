@@ -1,7 +1,11 @@
+import asyncio
+
 import pytest
 
 from dwarf_alpaca.config.settings import Settings
+from dwarf_alpaca.dwarf import session as session_module
 from dwarf_alpaca.dwarf.session import DwarfSession
+from dwarf_alpaca.proto.dwarf_messages import ResNotifyHostSlaveMode
 
 
 @pytest.mark.asyncio
@@ -18,6 +22,7 @@ async def test_acquire_rolls_back_on_failure(monkeypatch):
         await session.acquire("camera")
 
     assert session._refs["camera"] == 0
+    assert sum(session._refs.values()) == 0
 
 
 @pytest.mark.asyncio
@@ -28,3 +33,157 @@ async def test_has_master_lock_property_reflects_state():
     assert session.has_master_lock is False
     session._master_lock_acquired = True
     assert session.has_master_lock is True
+
+
+class _DroppingWsClient:
+    """Fake websocket client whose connection can be dropped on demand."""
+
+    def __init__(self) -> None:
+        self.connected = False
+        self.connects = 0
+        self._dropped = asyncio.Event()
+
+    async def connect(self) -> None:
+        self.connected = True
+        self.connects += 1
+        self._dropped = asyncio.Event()
+
+    async def wait_disconnected(self) -> None:
+        await self._dropped.wait()
+
+    def drop(self) -> None:
+        self.connected = False
+        self._dropped.set()
+
+    async def close(self) -> None:
+        self.connected = False
+
+
+@pytest.mark.asyncio
+async def test_dropped_websocket_is_reconnected_in_background(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=False))
+    client = _DroppingWsClient()
+    session._ws_client = client
+
+    async def fake_master_lock():
+        session._master_lock_acquired = client.connected
+
+    monkeypatch.setattr(session, "_ensure_master_lock", fake_master_lock)
+
+    await session._ensure_ws()
+    client.drop()
+    session._master_lock_acquired = False
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+    assert client.connects == 2
+    assert session._master_lock_acquired is True
+    await session._stop_ws_keepalive_task()
+
+
+@pytest.mark.asyncio
+async def test_device_clock_sync_sends_quarter_hour_offset(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=False))
+    sent = []
+
+    async def fake_send_and_check(module_id, command_id, request, **kwargs):
+        sent.append(request)
+
+    monkeypatch.setattr(session, "_send_and_check", fake_send_and_check)
+    monkeypatch.setattr(session, "_system_timezone_details", lambda: (None, 5.55))
+
+    await session._sync_device_clock()
+    await session._sync_device_clock()
+
+    assert len(sent) == 1
+    assert sent[0].timezone_offset == pytest.approx(5.5)
+    assert sent[0].timestamp > 0
+
+
+@pytest.mark.asyncio
+async def test_v2_bootstrap_frames_accept_host_slave_notification(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=False, bootstrap_gap_seconds=0.0))
+    session._ws_client = _DroppingWsClient()
+    session._ws_client.connected = True
+    monkeypatch.setattr(session, "_uses_v3_protocol", lambda: False)
+    sent = []
+
+    async def fake_send_raw_command(module_id, command, payload, **kwargs):
+        sent.append((command, kwargs["expected_responses"]))
+        return ResNotifyHostSlaveMode(mode=0, lock=True)
+
+    monkeypatch.setattr(session, "_send_raw_command", fake_send_raw_command)
+
+    await session._bootstrap_ws()
+
+    assert [command for command, _ in sent] == [
+        frame[1] for frame in session_module._BOOTSTRAP_FRAMES
+    ]
+    assert all(expected == session_module._HOST_SLAVE_EXPECTED for _, expected in sent)
+    assert session._ws_bootstrapped is True
+    assert Settings().bootstrap_gap_seconds == pytest.approx(0.2)
+
+
+@pytest.mark.asyncio
+async def test_release_keeps_http_and_ftp_pools_open(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=False))
+    session._ws_client = _DroppingWsClient()
+    session._refs["camera"] = 1
+    closed = []
+
+    async def fake_http_close(_self):
+        closed.append("http")
+
+    async def fake_ftp_close(_self):
+        closed.append("ftp")
+
+    monkeypatch.setattr(type(session._http_client), "aclose", fake_http_close)
+    monkeypatch.setattr(type(session._ftp_client), "close", fake_ftp_close)
+
+    await session.release("camera")
+    assert closed == []
+
+    await session.shutdown()
+    assert closed == ["http", "ftp"]
+
+
+@pytest.mark.asyncio
+async def test_release_tears_down_only_after_last_reference(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=False))
+    session._ws_client = _DroppingWsClient()
+
+    async def fake_ensure_ws():
+        session._ws_client.connected = True
+
+    monkeypatch.setattr(session, "_ensure_ws", fake_ensure_ws)
+
+    await session.acquire("camera")
+    await session.acquire("focuser")
+    await session.release("camera")
+    await session.release("camera")
+    assert sum(session._refs.values()) == 1
+    assert session._ws_client.connected is True
+
+    await session.release("focuser")
+    assert sum(session._refs.values()) == 0
+    assert session._ws_client.connected is False
+
+
+@pytest.mark.asyncio
+async def test_concurrent_master_lock_callers_share_one_handshake(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=False))
+    handshakes = 0
+
+    async def fake_acquire_master_lock():
+        nonlocal handshakes
+        handshakes += 1
+        await asyncio.sleep(0)
+        session._master_lock_acquired = True
+
+    monkeypatch.setattr(session, "_acquire_master_lock", fake_acquire_master_lock)
+
+    await asyncio.gather(*(session._ensure_master_lock() for _ in range(4)))
+
+    assert handshakes == 1
+    assert session._master_lock_acquired is True
+    assert session._master_lock_future is None
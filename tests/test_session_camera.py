@@ -20,6 +20,7 @@ from dwarf_alpaca.proto import astro_pb2, protocol_pb2
 from dwarf_alpaca.proto.dwarf_messages import (
     TYPE_NOTIFICATION,
     ComResponse,
+    ReqSetGainMode,
     ResNotifyTemperature,
     V3ResModeSwitch,
     V3ResNotifyDeviceState,
@@ -175,6 +176,75 @@ async def test_mini_v3_astro_preset_is_discovered_and_confirmed(monkeypatch):
     ]
 
 
+@pytest.mark.asyncio
+async def test_v2_astro_capture_resolves_params_before_sending(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=True))
+    session.simulation = False
+    monkeypatch.setattr(session, "_uses_v3_protocol", lambda: False)
+    features = [
+        {"id": 1, "name": "Astro display source"},
+        {"id": 2, "name": "Astro binning", "params": [{"index": 0, "name": "1x1"}]},
+        {"id": 4, "name": "Astro img_to_take"},
+    ]
+    session._params_config = {"data": {"featureParams": features}}
+    sent: list[tuple[int, float]] = []
+
+    async def fake_set_feature_param(feature, *, mode_index, continue_value=0.0, **_kwargs):
+        sent.append((feature["id"], continue_value))
+
+    monkeypatch.setattr(session, "_set_feature_param", fake_set_feature_param)
+
+    with pytest.raises(CaptureConfigurationError, match="Astro format"):
+        await session._configure_astro_capture(frames=3, binning=(1, 1))
+    assert sent == []
+
+    features.insert(2, {"id": 3, "name": "Astro format", "params": [{"index": 1, "name": "FITS"}]})
+    session._params_config = {"data": {"featureParams": features}}
+
+    await session._configure_astro_capture(frames=3, binning=(1, 1))
+
+    assert sent == [(1, 0.0), (2, 0.0), (3, 0.0), (4, 3.0)]
+    assert session.camera_state.applied_frame_count == 3
+
+
+@pytest.mark.asyncio
+async def test_v2_astro_capture_skips_unchanged_feature_params(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=True))
+    session.simulation = False
+    monkeypatch.setattr(session, "_uses_v3_protocol", lambda: False)
+    session._params_config = {
+        "data": {
+            "featureParams": [
+                {"id": 1, "name": "Astro display source"},
+                {"id": 2, "name": "Astro binning", "params": [{"index": 0, "name": "1x1"}]},
+                {"id": 3, "name": "Astro format", "params": [{"index": 1, "name": "FITS"}]},
+                {"id": 4, "name": "Astro img_to_take"},
+            ]
+        }
+    }
+    sent: list[tuple[int, float]] = []
+    failing: set[int] = {1}
+
+    async def fake_set_feature_param(feature, *, mode_index, continue_value=0.0, **_kwargs):
+        if feature["id"] in failing:
+            raise RuntimeError("rejected")
+        sent.append((feature["id"], continue_value))
+
+    monkeypatch.setattr(session, "_set_feature_param", fake_set_feature_param)
+
+    await session._configure_astro_capture(frames=3, binning=(1, 1))
+    failing.clear()
+    await session._configure_astro_capture(frames=3, binning=(1, 1))
+    await session._configure_astro_capture(frames=5, binning=(1, 1))
+
+    # The display source failed the first time, so it is retried once and then cached.
+    assert sent == [(2, 0.0), (3, 0.0), (4, 3.0), (1, 0.0), (4, 5.0)]
+
+    session._applied_feature_state.clear()
+    await session._configure_astro_capture(frames=5, binning=(1, 1))
+    assert sent[5:] == [(1, 0.0), (2, 0.0), (3, 0.0), (4, 5.0)]
+
+
 @pytest.mark.asyncio
 async def test_dwarf3_v3_astro_frame_count_uses_dedicated_adjust_param(monkeypatch):
     session = DwarfSession(Settings(force_simulation=True, dwarf_device_model="dwarf3"))
@@ -377,6 +447,36 @@ async def test_astro_baseline_does_not_scan_ftp(monkeypatch):
     assert session.camera_state.pending_ftp_baseline is None
 
 
+@pytest.mark.asyncio
+async def test_photo_baseline_queries_ftp_and_album_concurrently(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=True, dwarf_device_model="dwarfmini"))
+    session.simulation = False
+    both_started = asyncio.Event()
+    started: list[str] = []
+
+    async def wait_for_peer(name: str) -> None:
+        started.append(name)
+        if len(started) == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), timeout=0.5)
+
+    async def fake_ftp(*_args, **_kwargs):
+        await wait_for_peer("ftp")
+        return None
+
+    async def fake_album(*, media_type: int = 1):
+        await wait_for_peer("album")
+        return 1234, None
+
+    monkeypatch.setattr(type(session._ftp_client), "get_latest_photo_entry", fake_ftp)
+    monkeypatch.setattr(session, "_get_latest_album_entry", fake_album)
+
+    await session._refresh_capture_baseline(capture_kind="photo")
+
+    assert sorted(started) == ["album", "ftp"]
+    assert session.camera_state.pending_album_baseline == 1234
+
+
 @pytest.mark.asyncio
 async def test_abort_during_configuration_prevents_late_capture_start(monkeypatch):
     session = DwarfSession(Settings(force_simulation=True, dwarf_device_model="dwarfmini"))
@@ -440,6 +540,26 @@ def test_jpeg_decode_returns_nina_compatible_two_dimensional_frame():
     assert decoded.shape == (2, 3)
 
 
+def test_jpeg_decode_ignores_exif_orientation():
+    cv2 = pytest.importorskip("cv2")
+    import numpy as np
+
+    source = np.arange(2 * 3, dtype=np.uint8).reshape(2, 3) * 40
+    ok, encoded = cv2.imencode(".jpg", source)
+    assert ok
+    # Minimal big-endian EXIF block with a single Orientation=6 (rotate 90) tag.
+    tiff = b"MM\x00\x2a\x00\x00\x00\x08" + b"\x00\x01"
+    tiff += b"\x01\x12\x00\x03\x00\x00\x00\x01\x00\x06\x00\x00" + b"\x00\x00\x00\x00"
+    exif = b"Exif\x00\x00" + tiff
+    segment = b"\xff\xe1" + (len(exif) + 2).to_bytes(2, "big") + exif
+    content = encoded.tobytes()
+    oriented = content[:2] + segment + content[2:]
+
+    decoded = DwarfSession._decode_jpeg(oriented)
+
+    assert decoded.shape == (2, 3)
+
+
 def test_album_entry_recency_rejects_old_capture_path():
     started = time.mktime(datetime.strptime("20260802-234815", "%Y%m%d-%H%M%S").timetuple())
 
@@ -487,6 +607,87 @@ async def test_temperature_notification_updates_state():
     assert session.camera_state.last_temperature_code == protocol_pb2.OK
 
 
+@pytest.mark.asyncio
+async def test_temperature_notification_does_not_leak_previous_fields():
+    session = DwarfSession(Settings(force_simulation=True))
+    codes = []
+
+    for code, temperature in ((-1, 5), (protocol_pb2.OK, 7)):
+        message = ResNotifyTemperature()
+        message.code = code
+        message.temperature = temperature
+        packet = WsPacket()
+        packet.data = message.SerializeToString()
+        session._handle_temperature_notification(packet)
+        codes.append(session.camera_state.last_temperature_code)
+
+    assert codes == [-1, protocol_pb2.OK]
+    assert session.camera_state.temperature_c == pytest.approx(7.0)
+
+
+@pytest.mark.asyncio
+async def test_stale_temperature_reads_return_cached_value_and_refresh_once(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=False))
+    session.camera_state.connected = True
+    requests = 0
+    release = asyncio.Event()
+
+    async def fake_request_update():
+        nonlocal requests
+        requests += 1
+        await release.wait()
+        message = ResNotifyTemperature()
+        message.code = protocol_pb2.OK
+        message.temperature = 17
+        packet = WsPacket()
+        packet.data = message.SerializeToString()
+        session._handle_temperature_notification(packet)
+
+    monkeypatch.setattr(session, "_uses_v3_protocol", lambda: False)
+    monkeypatch.setattr(session, "_request_temperature_update", fake_request_update)
+
+    # Reads never wait for the device, even while the refresh is outstanding.
+    readings = await asyncio.wait_for(
+        asyncio.gather(*(session.get_temperature() for _ in range(3))), timeout=0.5
+    )
+    release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    cached = await session.get_temperature()
+
+    assert readings == [None] * 3
+    assert cached == pytest.approx(17.0)
+    assert requests == 1
+
+
+@pytest.mark.asyncio
+async def test_unanswered_temperature_refresh_is_retried_after_interval(monkeypatch):
+    settings = Settings(force_simulation=False, temperature_refresh_interval_seconds=0.05)
+    session = DwarfSession(settings)
+    session.camera_state.connected = True
+    requests = 0
+
+    async def fake_request_update():
+        nonlocal requests
+        requests += 1
+
+    monkeypatch.setattr(session, "_uses_v3_protocol", lambda: False)
+    monkeypatch.setattr(session, "_request_temperature_update", fake_request_update)
+
+    assert await session.get_temperature() is None
+    await asyncio.sleep(0)
+    assert await session.get_temperature() is None
+    assert requests == 1
+
+    await asyncio.sleep(0.1)
+    assert await session.get_temperature() is None
+    await asyncio.sleep(0)
+
+    assert requests == 2
+    await session.shutdown()
+    assert session._temp_refresh_task is None
+
+
 @pytest.mark.asyncio
 async def test_v3_temperature2_notification_updates_state() -> None:
     session = DwarfSession(Settings(force_simulation=True))
@@ -658,6 +859,29 @@ async def test_selected_filter_respected_and_defaulted():
     assert state.filter_name
 
 
+@pytest.mark.asyncio
+async def test_unchanged_selected_filter_skips_option_lookup(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=True, dwarf_device_model="dwarfmini"))
+    await session.set_filter_position(0)
+    await session._ensure_selected_filter()
+    lookups: list[None] = []
+    original = session._get_filter_options
+
+    async def counting_options():
+        lookups.append(None)
+        return await original()
+
+    monkeypatch.setattr(session, "_get_filter_options", counting_options)
+
+    await session._ensure_selected_filter()
+    assert lookups == []
+    assert session.camera_state.applied_filter_name == session.camera_state.filter_name
+
+    await session.set_filter_position(1)
+    await session._ensure_selected_filter()
+    assert len(lookups) == 2
+
+
 class _DummyHttpClient:
     def __init__(self) -> None:
         self.calls: list[tuple[int, int]] = []
@@ -900,6 +1124,28 @@ async def test_start_photo_capture_uses_mini_fallback_on_timeout(monkeypatch):
     ]
 
 
+@pytest.mark.asyncio
+async def test_static_camera_requests_are_sent_pre_serialized(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=True))
+    session.simulation = False
+    sent: list[tuple[int, object]] = []
+
+    async def fake_send_and_check(module_id, command_id, request, **_kwargs):
+        sent.append((command_id, request))
+
+    monkeypatch.setattr(session, "_send_and_check", fake_send_and_check)
+
+    await session._set_gain_mode_manual()
+    await session._set_gain_mode_manual()
+    await session._set_gain_index(3)
+
+    (first_cmd, first), (_, second), (_, gain) = sent
+    assert first_cmd == protocol_pb2.DwarfCMD.CMD_CAMERA_TELE_SET_GAIN_MODE
+    assert isinstance(first, bytes) and first is second
+    assert ReqSetGainMode.FromString(first).mode == 1
+    assert gain.index == 3
+
+
 @pytest.mark.asyncio
 async def test_start_photo_capture_raises_timeout_for_non_mini(monkeypatch):
     session = DwarfSession(Settings(force_simulation=True, dwarf_device_model="dwarf3"))
@@ -1331,17 +1577,18 @@ async def test_gain_commands_applied_successfully(monkeypatch):
     monkeypatch.setattr(session, "_uses_v3_protocol", lambda: False)
 
     calls = {"mode": 0, "index": 0}
+    command_indices = {17: 5, 30: 9}
 
     async def successful_mode(*, timeout):
         calls["mode"] += 1
 
     async def successful_index(index: int, *, timeout=None):
         calls["index"] += 1
-        assert index == 5
+        assert index == command_indices[session.camera_state.requested_gain]
         assert timeout is not None
 
     async def resolve_gain(value: int) -> tuple[int, int]:
-        return 17, 5
+        return value, command_indices[value]
 
     async def manual_supported() -> bool:
         return True
@@ -1361,6 +1608,40 @@ async def test_gain_commands_applied_successfully(monkeypatch):
 
     assert calls == {"mode": 1, "index": 1}
 
+    session.camera_state.requested_gain = 30
+    await session._ensure_gain_settings()
+
+    assert calls == {"mode": 1, "index": 2}
+    assert session.camera_state.applied_gain_index == 30
+
+
+@pytest.mark.asyncio
+async def test_concurrent_gain_settings_apply_once(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=True))
+    session.simulation = False
+    session.camera_state.requested_gain = 17
+    monkeypatch.setattr(session, "_uses_v3_protocol", lambda: False)
+    sent: list[int] = []
+
+    async def slow_index(index: int, *, timeout=None):
+        await asyncio.sleep(0.01)
+        sent.append(index)
+
+    async def resolve_gain(value: int) -> tuple[int, int]:
+        return value, 5
+
+    async def manual_supported() -> bool:
+        return False
+
+    monkeypatch.setattr(session, "_set_gain_index", slow_index)
+    monkeypatch.setattr(session, "_resolve_gain_command", resolve_gain)
+    monkeypatch.setattr(session, "_gain_manual_mode_enabled", manual_supported)
+
+    await asyncio.gather(session._ensure_gain_settings(), session._ensure_gain_settings())
+
+    assert sent == [5]
+    assert session.camera_state.applied_gain_index == 17
+
 
 @pytest.mark.asyncio
 async def test_session_shutdown_unlocks_master_lock():
@@ -1467,3 +1748,66 @@ async def test_resolve_gain_command_uses_params_config():
 
     manual_supported = await session._gain_manual_mode_enabled()
     assert manual_supported is False
+
+
+@pytest.mark.asyncio
+async def test_album_capture_polls_with_backoff(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=True))
+    session.simulation = False
+    state = session.camera_state
+    state.duration = 1.0
+    state.pending_album_baseline = 100
+    results = [None, None, None, 200]
+    sleeps: list[float] = []
+
+    async def fake_latest(*, media_type=1):
+        mod_time = results.pop(0)
+        if mod_time is None:
+            return None, None
+        return mod_time, {"filePath": "/album/frame.jpg", "modificationTime": mod_time}
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    async def failing_fetch(self, path):
+        raise OSError("offline")
+
+    monkeypatch.setattr(session, "_get_latest_album_entry", fake_latest)
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(type(session._http_client), "fetch_media_file", failing_fetch)
+
+    await session._attempt_album_capture(state)
+
+    assert sleeps == pytest.approx([0.25, 0.375, 0.5625])
+    assert state.last_album_mod_time == 200
+    assert state.last_error == "album_download_failed"
+
+
+@pytest.mark.asyncio
+async def test_dark_library_ok_is_reused_until_ttl_expires(monkeypatch):
+    session = DwarfSession(Settings(force_simulation=True))
+    session.simulation = False
+    codes = [protocol_pb2.OK, protocol_pb2.OK, protocol_pb2.CODE_ASTRO_DARK_NOT_FOUND]
+    checks: list[int] = []
+
+    async def fake_check():
+        code = codes[len(checks)]
+        checks.append(code)
+        return code, 0
+
+    monkeypatch.setattr(session, "_check_dark_library", fake_check)
+
+    assert await session._ensure_dark_library(continue_without_darks=False) is True
+    session.camera_state.last_dark_check_code = None
+    assert await session._ensure_dark_library(continue_without_darks=False) is True
+    assert len(checks) == 1
+    assert session.camera_state.last_dark_check_code == protocol_pb2.OK
+
+    session._dark_check_ok_until = 0.0
+    assert await session._ensure_dark_library(continue_without_darks=False) is True
+    assert len(checks) == 2
+
+    session._dark_check_ok_until = 0.0
+    assert await session._ensure_dark_library(continue_without_darks=True) is False
+    assert session._dark_check_ok_until == 0.0
+    assert len(checks) == 3
@@ -13,6 +13,7 @@ from dwarf_alpaca.dwarf.session import (
     CaptureConfigurationError,
     DwarfSession,
     FilterOption,
+    _is_ir_cut_parameter,
 )
 from dwarf_alpaca.proto import protocol_pb2
 from dwarf_alpaca.proto.dwarf_messages import ComResponse, V3ResGetDeviceConfig, V3ResModeQuery
@@ -372,3 +373,117 @@ async def test_ensure_master_lock_triggers_v3_bootstrap() -> None:
 
     assert session._master_lock_acquired is True
     assert called["bootstrap"] is True
+
+
+def test_feature_param_index_tracks_config_replacement() -> None:
+    session = DwarfSession(Settings())
+    session._params_config = {
+        "data": {
+            "featureParams": [{"name": " Gain ", "id": 1}],
+            "cameras": [{"name": "Tele", "supportParams": [{"name": "Exposure", "id": 2}]}],
+        }
+    }
+
+    assert session._find_feature_param("gain") == {"name": " Gain ", "id": 1}
+    assert session._find_support_param_contains("expo", camera_name="tele")["id"] == 2
+    assert session._find_support_param_contains("expo", camera_name="wide") is None
+    index = session._feature_param_index
+    assert session._find_feature_param_contains("ai") is not None
+    assert session._feature_param_index is index
+
+    session._params_config = {"data": {"featureParams": [{"name": "IR Cut", "id": 3}]}}
+    session._ws_feature_params = [{"name": "Gain", "id": 4}]
+
+    assert session._find_feature_param("gain") == {"name": "Gain", "id": 4}
+    assert session._find_feature_param("ir cut")["id"] == 3
+    assert session._camera_support_params() == ()
+
+
+def test_feature_options_carry_lowered_labels() -> None:
+    feature = {"name": "Filter", "modeIndex": 1, "params": [{"index": 2, "name": " Astro Filter "}]}
+
+    options = DwarfSession._extract_feature_options(feature)
+
+    assert options == [(1, 2, " Astro Filter ", "astro filter", None)]
+    assert options[0].label_lower == "astro filter"
+
+
+@pytest.mark.asyncio
+async def test_filter_options_are_cached_per_params_config(monkeypatch) -> None:
+    session = DwarfSession(Settings(force_simulation=True))
+    calls: list[object] = []
+
+    async def fake_resolve() -> list[FilterOption]:
+        calls.append(session._params_config)
+        session._filter_options = [FilterOption(parameter={}, mode_index=0, index=0, label="VIS")]
+        return session._filter_options
+
+    monkeypatch.setattr(session, "_resolve_filter_options", fake_resolve)
+    session._params_config = {"data": {}}
+
+    first = await session._get_filter_options()
+    second = await session._get_filter_options()
+    assert first is second
+    assert len(calls) == 1
+
+    session._params_config = {"data": {"featureParams": []}}
+    await session._get_filter_options()
+    assert len(calls) == 2
+
+
+def test_feature_options_are_extracted_once_per_config(monkeypatch) -> None:
+    session = DwarfSession(Settings())
+    feature = {"name": "Filter", "values": [[{"index": 0, "name": "VIS"}]]}
+    session._params_config = {"data": {"featureParams": [feature]}}
+    calls: list[dict[str, object]] = []
+    extract = DwarfSession._extract_feature_options
+
+    def counting_extract(entry):
+        calls.append(entry)
+        return extract(entry)
+
+    monkeypatch.setattr(DwarfSession, "_extract_feature_options", staticmethod(counting_extract))
+
+    assert session._feature_options(feature) == ((None, 0, "VIS", "vis", None),)
+    assert session._find_feature_option_by_label("vis") == (feature, (None, 0, "VIS", "vis", None))
+    assert len(calls) == 1
+
+    session._params_config = {"data": {"featureParams": [feature]}}
+    session._feature_options(feature)
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    ("parameter", "expected"),
+    [
+        ({"id": 8, "name": "Filter"}, True),
+        ({"id": "8"}, True),
+        ({"id": 3, "name": " IR Cut "}, True),
+        ({"id": "x", "name": "Astro Filter"}, False),
+        ({}, False),
+    ],
+)
+def test_ir_cut_parameter_detection(parameter: dict[str, object], expected: bool) -> None:
+    assert _is_ir_cut_parameter(parameter) is expected
+
+
+@pytest.mark.asyncio
+async def test_default_filter_uses_label_positions() -> None:
+    session = DwarfSession(Settings(force_simulation=True))
+    session._filter_options = [
+        FilterOption(parameter={}, mode_index=0, index=0, label="Astro"),
+        FilterOption(parameter={}, mode_index=0, index=1, label="VIS"),
+        FilterOption(parameter={}, mode_index=0, index=2, label="Duo-Band"),
+    ]
+
+    await session._ensure_default_filter("vis")
+    assert session.camera_state.filter_index == 1
+
+    session.camera_state.filter_name = ""
+    await session._ensure_default_filter("duo")
+    assert session.camera_state.filter_index == 2
+    assert session._filter_positions_by_label(session._filter_options) == {
+        "astro": 0,
+        "vis": 1,
+        "duo-band": 2,
+    }
@@ -4,6 +4,7 @@ import types
 import pytest
 
 from dwarf_alpaca.config.settings import Settings
+from dwarf_alpaca.dwarf import session as session_module
 from dwarf_alpaca.dwarf.session import DwarfSession, FilterOption
 from dwarf_alpaca.proto import protocol_pb2
 from dwarf_alpaca.proto.dwarf_messages import (
@@ -35,6 +36,25 @@ async def test_focus_notification_updates_state():
     assert session._focus_update_event.is_set()
 
 
+@pytest.mark.asyncio
+async def test_focus_notifications_clamp_position_with_reused_message():
+    session = DwarfSession(Settings(force_simulation=True))
+    positions = []
+
+    for focus in (30000, -5, 1234):
+        message = ResNotifyFocus()
+        message.focus = focus
+        packet = WsPacket()
+        packet.module_id = protocol_pb2.ModuleId.MODULE_NOTIFY
+        packet.cmd = protocol_pb2.DwarfCMD.CMD_NOTIFY_FOCUS
+        packet.type = TYPE_NOTIFICATION
+        packet.data = message.SerializeToString()
+        await session._handle_notification(packet)
+        positions.append(session.focuser_state.position)
+
+    assert positions == [20000, 0, 1234]
+
+
 @pytest.mark.asyncio
 async def test_focuser_move_fallback_without_notifications(monkeypatch):
     session = DwarfSession(Settings())
@@ -58,6 +78,24 @@ async def test_focuser_move_fallback_without_notifications(monkeypatch):
     assert session.focuser_state.is_moving is False
 
 
+@pytest.mark.asyncio
+async def test_simulated_focus_move_advances_in_batches(monkeypatch):
+    monkeypatch.setattr(session_module, "_SIM_FOCUS_STEP_SECONDS", 0.0)
+    session = DwarfSession(Settings(force_simulation=True))
+    session.focuser_state.position = 100
+    positions = []
+
+    class _RecordingEvent:
+        def set(self):
+            positions.append(session.focuser_state.position)
+
+    session._focus_update_event = _RecordingEvent()
+
+    await session._simulate_focus_move(-25)
+
+    assert positions == [90, 80, 75]
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("model", ["dwarf2", "dwarf3", "dwarfmini"])
 async def test_focuser_connect_initializes_position_from_v3_for_all_models(model) -> None:
@@ -114,3 +152,15 @@ async def test_v3_camera_param_notification_is_not_treated_as_filter_readback()
 
     assert session.camera_state.filter_index is None
     assert session.camera_state.filter_name == ""
+
+
+@pytest.mark.parametrize(
+    ("raw_label", "index", "expected"),
+    [
+        ("  Duo-Band \t Filter ", 2, "Duo-Band Filter"),
+        ("", 1, "Filter 1"),
+        (None, 20, "Filter 20"),
+    ],
+)
+def test_canonical_filter_label_normalizes_whitespace(raw_label, index, expected):
+    assert session_module._canonical_filter_label(raw_label, index) == expected
@@ -2,6 +2,7 @@ import asyncio
 import math
 import time
 import types
+from array import array
 from typing import Any, Dict
 
 import pytest
@@ -13,6 +14,7 @@ from dwarf_alpaca.dwarf.ws_client import DwarfCommandError
 from dwarf_alpaca.proto import astro_pb2, protocol_pb2
 from dwarf_alpaca.proto.dwarf_messages import (
     TYPE_NOTIFICATION,
+    ReqGotoDSO,
     V3ResModeSwitch,
     WsPacket,
 )
@@ -434,14 +436,14 @@ async def test_telescope_slew_retries_after_busy(monkeypatch):
 
     session._ensure_ws = types.MethodType(noop, session)
 
-    stop_calls: list[tuple[int, bool]] = []
-    original_stop_axis = session.telescope_stop_axis
+    halt_calls: list[bool] = []
+    original_halt = session._halt_manual_motion
 
-    async def recording_stop_axis(self, axis: int, *, ensure_ws: bool = True):
-        stop_calls.append((axis, ensure_ws))
-        return await original_stop_axis(axis, ensure_ws=ensure_ws)
+    async def recording_halt(self, *, ensure_ws: bool = True):
+        halt_calls.append(ensure_ws)
+        return await original_halt(ensure_ws=ensure_ws)
 
-    session.telescope_stop_axis = types.MethodType(recording_stop_axis, session)
+    session._halt_manual_motion = types.MethodType(recording_halt, session)
 
     busy_state = {"value": True}
     actions: list[tuple[int, int]] = []
@@ -492,8 +494,7 @@ async def test_telescope_slew_retries_after_busy(monkeypatch):
     ]
     assert calibration_calls == []
 
-    assert len(stop_calls) >= 4
-    assert {axis for axis, _ in stop_calls} == {0, 1}
+    assert len(halt_calls) >= 2
 
 
 @pytest.mark.asyncio
@@ -653,6 +654,49 @@ async def test_telescope_slew_uses_configured_timeout(monkeypatch):
     assert captured_timeout["value"] == pytest.approx(settings.goto_command_timeout_seconds)
 
 
+@pytest.mark.asyncio
+async def test_telescope_slew_retry_resends_serialized_goto(monkeypatch):
+    settings = _settings()
+    session = DwarfSession(settings)
+    session.simulation = False
+    session._last_calibration_time = time.time()
+    session._last_calibration_ip = settings.dwarf_ap_ip
+
+    async def noop(self, *args, **kwargs):
+        return None
+
+    session._ensure_ws = types.MethodType(noop, session)
+
+    goto_requests: list[object] = []
+
+    async def fake_send_and_check(
+        self, module_id, command_id, request, *, timeout=10.0, expected_responses=None
+    ):
+        if command_id == protocol_pb2.DwarfCMD.CMD_ASTRO_START_GOTO_DSO:
+            goto_requests.append(request)
+            if len(goto_requests) == 1:
+                busy = protocol_pb2.CODE_ASTRO_FUNCTION_BUSY
+                raise DwarfCommandError(module_id, command_id, busy)
+        return None
+
+    session._send_and_check = types.MethodType(fake_send_and_check, session)
+
+    async def instant_sleep(duration):
+        return None
+
+    monkeypatch.setattr(session_module.asyncio, "sleep", instant_sleep)
+
+    await session.telescope_slew_to_coordinates(1.5, -20.0, target_name="M42")
+
+    assert len(goto_requests) == 2
+    assert goto_requests[0] is goto_requests[1]
+    decoded = ReqGotoDSO()
+    decoded.ParseFromString(goto_requests[0])
+    assert decoded.ra == pytest.approx(22.5)
+    assert decoded.dec == pytest.approx(-20.0)
+    assert decoded.target_name == "M42"
+
+
 @pytest.mark.asyncio
 async def test_acquire_telescope_does_not_schedule_calibration(monkeypatch):
     session = DwarfSession(_settings())
@@ -912,8 +956,10 @@ async def test_telescope_stop_axis_sends_stop_when_idle(monkeypatch):
 async def test_telescope_stop_axis_noop_when_not_active(monkeypatch):
     session = DwarfSession(_settings())
     session.simulation = False
+    ensure_calls: list[bool] = []
 
     async def noop(self, *args, **kwargs):
+        ensure_calls.append(True)
         return None
 
     session._ensure_ws = types.MethodType(noop, session)
@@ -929,8 +975,83 @@ async def test_telescope_stop_axis_noop_when_not_active(monkeypatch):
     session._send_and_check = types.MethodType(fake_send_and_check, session)
 
     session._joystick_active = False
-    session._manual_axis_rates = {0: 0.0, 1: 0.0}
+    session._manual_axis_rates = array("d", (0.0, 0.0))
 
     await session.telescope_stop_axis(0)
 
     assert captured == []
+    assert ensure_calls == []
+
+
+@pytest.mark.asyncio
+async def test_halt_manual_motion_sends_single_joystick_stop():
+    session = DwarfSession(_settings())
+    session.simulation = False
+
+    async def noop(self, *args, **kwargs):
+        return None
+
+    session._ensure_ws = types.MethodType(noop, session)
+
+    captured: list[int] = []
+
+    async def fake_send_and_check(
+        self, module_id, command_id, request, *, timeout=10.0, expected_responses=None
+    ):
+        captured.append(command_id)
+        return None
+
+    session._send_and_check = types.MethodType(fake_send_and_check, session)
+
+    session._joystick_active = True
+    session._manual_axis_rates = array("d", (1.0, -0.5))
+
+    await session._halt_manual_motion()
+
+    assert captured == [protocol_pb2.DwarfCMD.CMD_STEP_MOTOR_SERVICE_JOYSTICK_STOP]
+    assert session._manual_axis_rates.tolist() == [0.0, 0.0]
+    assert session._joystick_active is False
+
+
+@pytest.mark.asyncio
+async def test_move_axis_skips_ensure_ws_when_ready(monkeypatch):
+    session = DwarfSession(_settings())
+    session.simulation = False
+    session._master_lock_acquired = True
+    monkeypatch.setattr(type(session._ws_client), "connected", property(lambda self: True))
+
+    async def unexpected_ensure_ws(self, *args, **kwargs):
+        raise AssertionError("_ensure_ws should not run on a ready connection")
+
+    session._ensure_ws = types.MethodType(unexpected_ensure_ws, session)
+
+    async def fake_send_and_check(
+        self, module_id, command_id, request, *, timeout=10.0, expected_responses=None
+    ):
+        return None
+
+    session._send_and_check = types.MethodType(fake_send_and_check, session)
+
+    await session.telescope_move_axis(0, 1.0)
+    await session.telescope_stop_axis(0)
+
+    assert session._manual_axis_rates.tolist() == [0.0, 0.0]
+
+
+@pytest.mark.parametrize(
+    ("rate_x", "rate_y", "expected"),
+    [
+        (0.0, 0.0, None),
+        (1.0, 0.0, (0.0, 1.0, 1.0)),
+        (0.0, -2.0, (270.0, 1.0, 2.0)),
+        (0.05, 0.0, (0.0, 0.5, 0.1)),
+        (-40.0, 0.0, (180.0, 1.0, 30.0)),
+    ],
+)
+def test_joystick_vector_maps_rates_to_angle_length_and_speed(rate_x, rate_y, expected):
+    vector = session_module._joystick_vector(rate_x, rate_y)
+
+    if expected is None:
+        assert vector is None
+    else:
+        assert vector == pytest.approx(expected)
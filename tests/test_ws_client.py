@@ -4,6 +4,8 @@ import asyncio
 
 import pytest
 
+from dwarf_alpaca.config.settings import Settings
+from dwarf_alpaca.dwarf.session import DwarfSession
 from dwarf_alpaca.dwarf.ws_client import DwarfWsClient
 from dwarf_alpaca.proto import protocol_pb2
 from dwarf_alpaca.proto.dwarf_messages import (
@@ -11,6 +13,7 @@ from dwarf_alpaca.proto.dwarf_messages import (
     TYPE_REQUEST_RESPONSE,
     ComResponse,
     ReqCloseCamera,
+    ReqOpenCamera,
     ReqsetMasterLock,
     ResNotifyHostSlaveMode,
     WsPacket,
@@ -150,3 +153,85 @@ async def test_unexpected_same_command_notification_does_not_consume_response():
     response = await client.send_command(1, 42, ReqCloseCamera())
 
     assert response.code == 0
+
+
+@pytest.mark.asyncio
+async def test_ws_client_sends_pre_serialized_request_verbatim():
+    client = DwarfWsClient("127.0.0.1")
+    dummy = DummyConnection(client)
+    client._conn = dummy  # type: ignore[attr-defined]
+    client._connected_event.set()
+    payload = ReqOpenCamera(binning=False, rtsp_encode_type=1).SerializeToString()
+
+    response = await client.send_raw_request(1, 42, payload, ComResponse)
+
+    assert response.code == 0
+    assert dummy.sent_packets[0].data == payload
+
+
+@pytest.mark.asyncio
+async def test_ws_client_pipelines_distinct_commands_and_serializes_same_command():
+    client = DwarfWsClient("127.0.0.1")
+    dummy = DummyConnection(client, response_builder=lambda packet: [])
+    client._conn = dummy  # type: ignore[attr-defined]
+    client._connected_event.set()
+
+    first = asyncio.create_task(client.send_command(1, 42, ReqCloseCamera()))
+    second = asyncio.create_task(client.send_command(2, 42, ReqCloseCamera()))
+    repeat = asyncio.create_task(client.send_command(1, 42, ReqCloseCamera()))
+    await asyncio.sleep(0.01)
+
+    assert [(p.module_id, p.cmd) for p in dummy.sent_packets] == [(1, 42), (2, 42)]
+
+    for module_id in (2, 1):
+        await client._dispatch_packet(
+            WsPacket(module_id=module_id, cmd=42, type=TYPE_REQUEST_RESPONSE)
+        )
+    await asyncio.wait_for(asyncio.gather(first, second), timeout=1.0)
+    await asyncio.sleep(0.01)
+
+    assert [(p.module_id, p.cmd) for p in dummy.sent_packets][2:] == [(1, 42)]
+    await client._dispatch_packet(WsPacket(module_id=1, cmd=42, type=TYPE_REQUEST_RESPONSE))
+    assert (await asyncio.wait_for(repeat, timeout=1.0)).code == 0
+
+
+@pytest.mark.asyncio
+async def test_begin_request_queues_behind_same_key_instead_of_failing():
+    client = DwarfWsClient("127.0.0.1")
+    dummy = DummyConnection(client, response_builder=lambda packet: [])
+    client._conn = dummy  # type: ignore[attr-defined]
+    client._connected_event.set()
+
+    first = await client.begin_request(1, 42, ReqCloseCamera(), ComResponse)
+    second = asyncio.create_task(client.begin_request(1, 42, ReqCloseCamera(), ComResponse))
+    await asyncio.sleep(0.01)
+
+    assert len(dummy.sent_packets) == 1
+    await client._dispatch_packet(WsPacket(module_id=1, cmd=42, type=TYPE_REQUEST_RESPONSE))
+    assert (await first).code == 0
+    second_future = await asyncio.wait_for(second, timeout=1.0)
+    assert len(dummy.sent_packets) == 2
+    await client._dispatch_packet(WsPacket(module_id=1, cmd=42, type=TYPE_REQUEST_RESPONSE))
+    assert (await second_future).code == 0
+
+
+@pytest.mark.asyncio
+async def test_session_timeout_keeps_socket_for_other_inflight_commands():
+    session = DwarfSession(Settings(force_simulation=False))
+    client = session._ws_client
+    dummy = DummyConnection(client, response_builder=lambda packet: [])
+    client._conn = dummy  # type: ignore[attr-defined]
+    client._connected_event.set()
+
+    other = asyncio.create_task(session._send_request(2, 42, ReqCloseCamera(), ComResponse))
+    await asyncio.sleep(0)
+    with pytest.raises(asyncio.TimeoutError):
+        await session._send_request(1, 42, ReqCloseCamera(), ComResponse, timeout=0.01)
+
+    assert dummy.closed is False
+    await client._dispatch_packet(WsPacket(module_id=2, cmd=42, type=TYPE_REQUEST_RESPONSE))
+    assert (await asyncio.wait_for(other, timeout=1.0)).code == 0
+
+    with pytest.raises(asyncio.TimeoutError):
+        await session._send_request(1, 42, ReqCloseCamera(), ComResponse, timeout=0.01)
+    assert dummy.closed is True